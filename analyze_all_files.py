@@ -5,6 +5,11 @@
 import pandas as pd
 import re
 import os
+from hopyo_grammar import match_hopyo
+from workbook_reader import probe_workbook, read_head
+
+# 호표 패턴은 처음 100행만 검사 (데이터 샘플/컬럼 추정용으로 10행 더 읽음)
+ANALYZE_ROWS = 100
 
 def analyze_file_structure(file_path, sheet_name):
     """파일의 일위대가 시트 구조 분석"""
@@ -14,45 +19,46 @@ def analyze_file_structure(file_path, sheet_name):
     print('='*70)
     
     try:
-        # 파일 읽기
-        if file_path.endswith('.xls'):
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine='xlrd')
-        else:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+        # 시트 앞부분만 읽기 (시트 크기는 워크북 메타데이터의 선언 범위)
+        df = read_head(file_path, sheet_name, ANALYZE_ROWS + 10)
+        shape = next((s['dimension'] for s in probe_workbook(file_path)['sheets']
+                      if s['name'] == sheet_name), None) or df.shape
         
-        print(f"시트 크기: {df.shape[0]}행 x {df.shape[1]}열")
+        print(f"시트 크기: {shape[0]}행 x {shape[1]}열")
         
         # 1. 호표 패턴 찾기
         print("\n[호표 패턴 분석]")
-        hopyo_patterns = [
-            (r'제\s*(\d+)\s*호표', '제N호표'),
-            (r'^#(\d+)\s+(.+)', '#N 작업명'),
-            (r'^No\.(\d+)\s+(.+)', 'No.N 작업명'),
-            (r'(\d+)\.\s*(.+)', 'N. 작업명'),
-            (r'산근\s*(\d+)\s*호표', '산근N호표'),
-            (r'\(\s*산근\s*(\d+)\s*\)', '(산근N)')
-        ]
+        style_names = {
+            'sanggun': '산근N호표',
+            'je': '제N호표',
+            'hash': '#N 작업명',
+            'no': 'No.N 작업명',
+            'paren': '(산근N)',
+            'paren_hopyo': '(호표N)',
+            'code': 'M-NNN',
+            'dot': 'N. 작업명'
+        }
         
         found_patterns = []
         hopyo_list = []
         
-        for i in range(min(100, len(df))):  # 처음 100행만 검사
+        for i in range(min(ANALYZE_ROWS, len(df))):  # 처음 100행만 검사
             for j in range(min(5, len(df.columns))):
                 cell = df.iloc[i, j]
                 if pd.notna(cell):
                     cell_str = str(cell).strip()
-                    for pattern, pattern_name in hopyo_patterns:
-                        match = re.match(pattern, cell_str)
-                        if match:
-                            if pattern_name not in found_patterns:
-                                found_patterns.append(pattern_name)
-                            hopyo_list.append({
-                                'row': i,
-                                'col': j,
-                                'pattern': pattern_name,
-                                'text': cell_str[:50]
-                            })
-                            break
+                    # 모든 호표 형식을 한 번에 매칭
+                    match = match_hopyo(cell_str)
+                    if match:
+                        pattern_name = style_names[match.style]
+                        if pattern_name not in found_patterns:
+                            found_patterns.append(pattern_name)
+                        hopyo_list.append({
+                            'row': i,
+                            'col': j,
+                            'pattern': pattern_name,
+                            'text': cell_str[:50]
+                        })
         
         print(f"발견된 패턴: {found_patterns}")
         print(f"호표 개수: {len(hopyo_list)}개")
@@ -154,7 +160,7 @@ def analyze_file_structure(file_path, sheet_name):
         return {
             'file': file_path,
             'sheet': sheet_name,
-            'shape': df.shape,
+            'shape': shape,
             'patterns': found_patterns,
             'hopyo_count': len(hopyo_list),
             'hopyo_list': hopyo_list[:10]  # 처음 10개만
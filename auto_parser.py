@@ -6,11 +6,16 @@ import io
 import re
 import os
 from typing import Dict, Any, Tuple
+from format_detector import detect_format, find_target_sheet
+from workbook_reader import probe_workbook
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 warnings.filterwarnings('ignore')
 
+# 세부 항목에서 제외하는 품명 (부분 문자열 기준)
+SKIP_NAMES = ('합계', '소계', '재료비', '노무비', '경비')
+
 class AutoParser:
     """파일 구조를 자동으로 판별하고 적절한 파서를 실행하는 클래스"""
     
@@ -48,113 +53,44 @@ class AutoParser:
         print(f"\n파일 구조 감지 중: {file_path}")
         print("-" * 60)
         
-        # 시트 목록 확인
-        if file_path.endswith('.xls'):
-            xls = pd.ExcelFile(file_path, engine='xlrd')
-        else:
-            xls = pd.ExcelFile(file_path)
-        
-        sheet_names = xls.sheet_names
+        # 시트 목록 확인 (워크북 메타데이터만 읽기)
+        sheet_names = probe_workbook(file_path)['sheet_names']
         print(f"시트 목록: {sheet_names}")
         
-        # 일위대가 관련 시트 찾기 (목록 제외)
-        target_sheet = None
-        for sheet in sheet_names:
-            if '일위대가' in sheet and '목록' not in sheet and '총괄' not in sheet:
-                target_sheet = sheet
-                break
-        
-        # 못 찾으면 산근 시트 찾기
-        if not target_sheet:
-            for sheet in sheet_names:
-                if '산근' in sheet:
-                    target_sheet = sheet
-                    break
-        
+        # 일위대가 관련 시트 찾기 (목록 제외, 못 찾으면 산근 시트)
+        target_sheet = find_target_sheet(sheet_names)
         if not target_sheet:
             print("일위대가 시트를 찾을 수 없습니다!")
             return None, None
         
         print(f"대상 시트: {target_sheet}")
         
-        # 시트 읽기
-        if file_path.endswith('.xls'):
-            df = pd.read_excel(file_path, sheet_name=target_sheet, header=None, engine='xlrd')
-        else:
-            df = pd.read_excel(file_path, sheet_name=target_sheet, header=None)
-        
-        # 구조 분석
+        # 구조 분석 (시트 앞부분만 읽고 호표/헤더가 확인되면 중단)
         print("\n구조 분석:")
+        detection = detect_format(file_path, target_sheet)
         
-        # 1. 호표 패턴 확인
-        hopyo_patterns = {
-            'separated': False,  # 호표가 별도 열에 있는지
-            'colon': False,      # 콜론 형식인지
-            'parenthesis': False # 괄호 형식인지
+        pattern_labels = {
+            'sgs': '콜론 형식 호표',
+            'construction': '괄호 형식 호표',
+            'est': '분리된 호표',
+            'test1': '분리된 호표'
         }
+        header_keywords = []
+        for evidence in detection['evidence']:
+            if evidence['kind'] == 'hopyo':
+                print(f"  - {pattern_labels[evidence['type']]} 발견: {evidence['text']}")
+            elif evidence['kind'] == 'header':
+                header_keywords = list(evidence['keywords'])
         
-        # 처음 30행 검사
-        for i in range(min(30, len(df))):
-            for j in range(min(10, len(df.columns))):
-                cell = df.iloc[i, j]
-                if pd.notna(cell):
-                    cell_str = str(cell)
-                    
-                    # 호표 패턴 확인
-                    if '호표' in cell_str:
-                        if '：' in cell_str or ':' in cell_str:
-                            hopyo_patterns['colon'] = True
-                            print(f"  - 콜론 형식 호표 발견: {cell_str[:50]}")
-                        elif '(' in cell_str and ')' in cell_str and '호표' in cell_str:
-                            hopyo_patterns['parenthesis'] = True
-                            print(f"  - 괄호 형식 호표 발견: {cell_str[:50]}")
-                        elif re.match(r'^제?\s*\d+\s*호표$', cell_str.strip()):
-                            hopyo_patterns['separated'] = True
-                            print(f"  - 분리된 호표 발견: {cell_str}")
-        
-        # 2. 헤더 확인
-        header_keywords = {
-            '호표': False,
-            '품명': False,
-            '공종': False,
-            '규격': False,
-            '단위': False,
-            '수량': False
-        }
+        print(f"\n헤더 키워드 발견: {header_keywords}")
+        print(f"확인한 행 수: {detection['rows_scanned']}")
         
-        for i in range(min(10, len(df))):
-            for j in range(min(10, len(df.columns))):
-                cell = df.iloc[i, j]
-                if pd.notna(cell):
-                    cell_str = str(cell).strip()
-                    for keyword in header_keywords:
-                        if keyword in cell_str:
-                            header_keywords[keyword] = True
-        
-        print(f"\n헤더 키워드 발견: {[k for k, v in header_keywords.items() if v]}")
-        
-        # 3. 파일 타입 결정
-        file_type = None
-        
-        # sgs 타입: 콜론 형식 + 공종 헤더
-        if hopyo_patterns['colon']:
-            file_type = 'sgs_type'
-        # construction 타입: 괄호 형식
-        elif hopyo_patterns['parenthesis']:
-            file_type = 'construction_type'
-        # test1, est 타입: 분리형
-        elif hopyo_patterns['separated']:
-            # est는 호표가 1열(인덱스 1)에, test1은 0열에
-            for i in range(3, min(20, len(df))):
-                if pd.notna(df.iloc[i, 1]) and '호표' in str(df.iloc[i, 1]):
-                    file_type = 'est_type'
-                    break
-                elif pd.notna(df.iloc[i, 0]) and '호표' in str(df.iloc[i, 0]):
-                    file_type = 'test1_type'
-                    break
+        # 파일 타입 결정
+        file_type = f"{detection['type']}_type" if detection['type'] else None
         
         if file_type:
-            print(f"\n감지된 파일 타입: {self.file_patterns[file_type]['description']}")
+            print(f"\n감지된 파일 타입: {self.file_patterns[file_type]['description']} "
+                  f"(신뢰도 {detection['confidence']:.2f})")
             return file_type, target_sheet
         else:
             print("\n파일 타입을 자동으로 감지할 수 없습니다.")
@@ -206,6 +142,12 @@ class AutoParser:
         hopyo_data = {}
         current_hopyo = None
         
+        # 세부 항목 행: 품명이 있고 SKIP_NAMES가 들어가지 않은 행 (시트당 한 번 판단)
+        # row_types 분류와 달리 구분선, 숫자, 헤더 단어, '호표' 참조 품명도 항목으로 둠
+        names = df.iloc[:, column_map['품명']]
+        names = names.where(names.notna(), '').astype(str).str.strip()
+        item_rows = ((names != '') & ~names.str.contains('|'.join(SKIP_NAMES))).to_numpy()
+        
         for row_idx in range(header_row + 1, len(df)):
             row = df.iloc[row_idx]
             
@@ -231,20 +173,10 @@ class AutoParser:
                         }
                         continue
             
-            # 세부 항목 추출
+            # 세부 항목 추출 (빈 품명, 합계/소계/재료비/노무비/경비 행 제외)
             if current_hopyo and '품명' in column_map:
-                품명_cell = row[column_map['품명']]
-                
-                if pd.notna(품명_cell):
-                    품명 = str(품명_cell).strip()
-                    
-                    if any(skip in 품명 for skip in ['합계', '소계', '재료비', '노무비', '경비']):
-                        continue
-                    
-                    if not 품명:
-                        continue
-                    
-                    item = {"품명": 품명}
+                if item_rows[row_idx]:
+                    item = {"품명": str(row[column_map['품명']]).strip()}
                     item['규격'] = str(row[column_map['규격']]).strip() if pd.notna(row[column_map['규격']]) else ""
                     item['단위'] = str(row[column_map['단위']]).strip() if pd.notna(row[column_map['단위']]) else ""
                     
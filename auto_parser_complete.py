@@ -6,6 +6,7 @@ import io
 import re
 import os
 from typing import Dict, Any, Tuple
+from format_detector import detect_format
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -19,53 +20,11 @@ class CompleteAutoParser:
         
         print(f"\n파일 구조 감지 중...")
         
-        # 시트 목록 확인
-        if file_path.endswith('.xls'):
-            xls = pd.ExcelFile(file_path, engine='xlrd')
-        else:
-            xls = pd.ExcelFile(file_path)
-        
-        # 일위대가 시트 찾기 (목록/총괄 제외)
-        target_sheet = None
-        for sheet in xls.sheet_names:
-            if '일위대가' in sheet and '목록' not in sheet and '총괄' not in sheet:
-                target_sheet = sheet
-                break
-        
-        # 못 찾으면 산근 시트
-        if not target_sheet:
-            for sheet in xls.sheet_names:
-                if '산근' in sheet:
-                    target_sheet = sheet
-                    break
-        
-        if not target_sheet:
+        # 대상 시트 앞부분만 읽어 감지 (호표와 헤더가 확인되면 즉시 중단)
+        detection = detect_format(file_path)
+        if not detection['type']:
             return None, None
-        
-        # 시트 읽기
-        if file_path.endswith('.xls'):
-            df = pd.read_excel(file_path, sheet_name=target_sheet, header=None, engine='xlrd')
-        else:
-            df = pd.read_excel(file_path, sheet_name=target_sheet, header=None)
-        
-        # 호표 패턴 확인
-        for i in range(min(30, len(df))):
-            for j in range(min(5, len(df.columns))):
-                cell = df.iloc[i, j]
-                if pd.notna(cell) and '호표' in str(cell):
-                    cell_str = str(cell)
-                    
-                    # 패턴 분류
-                    if '：' in cell_str or ':' in cell_str:
-                        return 'sgs', target_sheet
-                    elif '(' in cell_str and ')' in cell_str:
-                        return 'construction', target_sheet
-                    elif j == 1 and '제' in cell_str:
-                        return 'est', target_sheet
-                    elif j == 0 and '제' in cell_str:
-                        return 'test1', target_sheet
-        
-        return None, None
+        return detection['type'], detection['sheet']
     
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """파일을 자동으로 파싱"""
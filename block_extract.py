@@ -0,0 +1,78 @@
+"""
+호표 블록 산출근거 일괄 추출
+블록 구간 x 매핑 컬럼을 정규화 그리드(SheetGrid.text)에서 2차원 배열 하나로 잘라
+항목 레코드를 만듦 (필드마다 iloc / notna / str().strip() 반복 호출 대체)
+수량은 숫자 그리드(SheetGrid.numbers)로 숫자 셀을 골라 숫자 값으로 저장 (numeric_fields)
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from numeric_fields import DISPLAY_SUFFIX, NUMERIC_FIELDS, parse_number
+from records import SangulItem
+from workbook_reader import SheetGrid
+
+# 산출근거 항목 필드 (SangulItem 필드, 값이 없으면 '')
+ITEM_FIELDS = ('품명', '규격', '단위', '수량', '비고')
+
+
+def block_text(df: SheetGrid, start_row: int, end_row: int, cols: Iterable[int]) -> np.ndarray:
+    """[start_row, end_row) x cols 셀 -> 정규화 문자열 배열 (빈 셀은 '')"""
+    cols = list(cols)
+    if not cols:
+        return np.empty((max(end_row - start_row, 0), 0), dtype=object)
+    block = df.text[start_row:end_row, cols]
+    text = np.full(block.shape, '', dtype=object)
+    present = pd.notna(block)
+    text[present] = block[present]
+    return text
+
+
+def column_text(df: SheetGrid, col: Optional[int]) -> pd.Series:
+    """시트 전체 한 컬럼의 정규화 문자열 (빈 셀은 '', 컬럼이 없거나 시트 폭 밖이면 전부 '')
+
+    항목 레코드를 만들기 전에 품명 조건으로 row_mask를 만들 때 사용
+    """
+    if col is None or not 0 <= col < df.width:
+        return pd.Series([''] * len(df), dtype=object)
+    return pd.Series(block_text(df, 0, len(df), [col])[:, 0], dtype=object)
+
+
+def extract_items(df: SheetGrid, start_row: int, end_row: int, column_info: Dict,
+                  row_mask: Optional[np.ndarray] = None, keep_text: bool = False) -> List[SangulItem]:
+    """블록의 산출근거 항목 레코드 (SangulItem: row_number, 품명, 규격, 단위, 수량, 비고)
+
+    column_info: 필드 -> 컬럼 (음수/None/시트 폭 밖이면 '')
+    row_mask: 시트 전체 행 기준 bool 배열 (True인 행만 항목, None이면 전체)
+    수량 등 숫자 필드는 숫자 셀이면 int/float/Decimal, 아니면 표시 문자열 그대로
+    keep_text=True면 숫자 필드의 표시 문자열을 '수량_text' 키로 함께 저장
+    """
+    end_row = min(end_row, len(df))
+    if end_row <= start_row:
+        return []
+    fields = [(field, col) for field, col in column_info.items()
+              if field in ITEM_FIELDS and col is not None and 0 <= col < df.width]
+    text = block_text(df, start_row, end_row, [col for _, col in fields])
+    names = [field for field, _ in fields]
+
+    # 숫자 필드: 숫자 셀만 원본 값(숫자 문자열은 Decimal)으로 교체
+    numeric = [i for i, name in enumerate(names) if name in NUMERIC_FIELDS]
+    display = {names[i]: text[:, i].copy() for i in numeric} if keep_text else {}
+    for i in numeric:
+        col = fields[i][1]
+        hit = np.isfinite(df.numbers[start_row:end_row, col])
+        if hit.any():
+            text[hit, i] = [parse_number(value) for value in df.to_array()[start_row:end_row, col][hit]]
+
+    rows = np.arange(end_row - start_row)
+    if row_mask is not None:
+        rows = rows[row_mask[start_row:end_row]]
+
+    items = []
+    for offset, values in zip(rows.tolist(), text[rows].tolist()):
+        item = SangulItem(start_row + offset, **dict(zip(names, values)))
+        for name, shown in display.items():
+            item[name + DISPLAY_SUFFIX] = shown[offset]
+        items.append(item)
+    return items
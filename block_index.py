@@ -0,0 +1,97 @@
+"""
+호표 블록 경계 인덱스
+정렬된 블록 시작 행으로 한 번 만들어 각 블록의 정확한 (시작, 끝) 구간과
+임의의 행이 속한 블록을 이진 탐색(bisect)으로 찾음 (항목마다 전체 목록을 다시 훑지 않음)
+마지막 블록은 리더가 알려준 마지막 내용 행(+ 행 유형 배열의 끝쪽 빈 행 제외)에서 끝남
+"""
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from row_types import BLANK
+
+# 블록 하나의 안전 상한 (다음 호표를 못 찾아 시트 끝까지 이어지는 경우 대비, 넘으면 잘라서 보고)
+MAX_BLOCK_ROWS = 1000
+
+
+class BlockIndex:
+    """블록 시작 행 -> [시작, 끝) 구간 인덱스
+
+    블록의 끝은 다음 블록 시작 행, 마지막 블록은 sheet_end (리더의 마지막 내용 행 + 1)
+    row_types가 주어지면 마지막 블록 끝쪽의 빈 행(BLANK)은 블록에서 제외
+    max_rows가 주어지면 모든 블록을 시작 행 + max_rows에서 자르고 truncated()로 보고
+    """
+
+    def __init__(self, start_rows: Iterable[int], sheet_end: Optional[int] = None,
+                 max_rows: Optional[int] = None, row_types: Optional[np.ndarray] = None):
+        self.starts: List[int] = sorted(set(start_rows))
+        self.sheet_end = sheet_end
+        self.max_rows = max_rows
+        self.row_types = row_types
+        if self.starts and sheet_end is None and max_rows is None:
+            raise ValueError("마지막 블록의 끝을 알 수 없음 (sheet_end 또는 max_rows 필요)")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for i in range(len(self.starts)):
+            yield self.span(i)
+
+    def natural_span(self, index: int) -> Tuple[int, int]:
+        """상한 적용 전 (시작 행, 끝 행)"""
+        start = self.starts[index]
+        if index + 1 < len(self.starts):
+            return start, self.starts[index + 1]
+        if self.sheet_end is None:
+            return start, start + self.max_rows
+        end = self.sheet_end
+        if self.row_types is not None:
+            # 마지막 블록 끝쪽 빈 행 제외
+            end = min(end, len(self.row_types))
+            content = np.nonzero(self.row_types[start + 1:end] != BLANK)[0]
+            end = start + 1 + (int(content[-1]) + 1 if len(content) else 0)
+        return start, end
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """index번째 블록의 (시작 행, 끝 행)"""
+        start, end = self.natural_span(index)
+        if self.max_rows is not None:
+            end = min(end, start + self.max_rows)
+        return start, end
+
+    def truncated(self) -> List[Dict]:
+        """max_rows에서 잘린 블록 [{'start_row', 'end_row': 원래 끝 행, 'cut_at': 자른 끝 행}]"""
+        cut = []
+        for index in range(len(self.starts)):
+            start, natural_end = self.natural_span(index)
+            end = self.span(index)[1]
+            if end < natural_end:
+                cut.append({'start_row': start, 'end_row': natural_end, 'cut_at': end})
+        return cut
+
+    def report_truncation(self, result: Dict):
+        """잘린 블록이 있으면 result['truncated_blocks']에 기록하고 경고 출력"""
+        truncated = self.truncated()
+        if not truncated:
+            return
+        result['truncated_blocks'] = truncated
+        for block in truncated:
+            print(f"⚠️ 블록 잘림: 행 {block['start_row']} ~ {block['end_row'] - 1} 중 "
+                  f"{block['cut_at'] - 1}행까지만 사용 (상한 {self.max_rows}행)")
+
+    def end_of(self, start_row: int) -> int:
+        """start_row에서 시작하는 블록의 끝 행"""
+        index = bisect_right(self.starts, start_row) - 1
+        if index < 0 or self.starts[index] != start_row:
+            raise KeyError(f"블록 시작 행 아님: {start_row}")
+        return self.span(index)[1]
+
+    def block_of(self, row: int) -> Optional[int]:
+        """row가 속한 블록 번호 (첫 블록 이전이거나 블록 끝 이후면 None)"""
+        index = bisect_right(self.starts, row) - 1
+        if index < 0:
+            return None
+        start, end = self.span(index)
+        return index if start <= row < end else None
@@ -0,0 +1,52 @@
+"""
+시트 내용 밀도 프로파일
+행 구간(BAND_ROWS행)별 x 열별 비어 있지 않은 셀 수를 시트당 한 번 세어 두고
+헤더 감지, raw 추출이 고정 열 상한(min(15/20, ...)) 대신 이 프로파일로 탐색 폭을 정함
+좁은 시트는 내용이 있는 열까지만, 넓은 시트는 내용이 있는 마지막 열까지 탐색
+(호표 탐색은 비고 열의 호표 참조를 피하려고 앞쪽 5/10열 상한 유지 - hopyo_scan)
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+BAND_ROWS = 50
+
+
+class DensityProfile:
+    """(행 구간 x 열) 셀 수 배열"""
+
+    def __init__(self, nonempty: np.ndarray, n_rows: int):
+        self.nonempty = nonempty
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_block(cls, block: np.ndarray) -> 'DensityProfile':
+        """(행 x 열) object 배열에서 한 번에 계산"""
+        n_rows, width = block.shape
+        n_bands = max((n_rows + BAND_ROWS - 1) // BAND_ROWS, 1)
+        present = pd.notna(block)
+        pad = n_bands * BAND_ROWS - n_rows
+        if pad:
+            present = np.vstack([present, np.zeros((pad, width), dtype=bool)])
+        nonempty = present.reshape(n_bands, BAND_ROWS, width).sum(axis=1, dtype=np.int32)
+        return cls(nonempty, n_rows)
+
+    def _bands(self, start_row: int, end_row: Optional[int]) -> slice:
+        end_row = self.n_rows if end_row is None else min(end_row, self.n_rows)
+        if end_row <= start_row:
+            return slice(0, 0)
+        return slice(max(start_row, 0) // BAND_ROWS, (end_row - 1) // BAND_ROWS + 1)
+
+    @staticmethod
+    def _last(counts: np.ndarray) -> int:
+        cols = np.nonzero(counts)[0]
+        return int(cols[-1]) + 1 if len(cols) else 0
+
+    def column_counts(self, start_row: int = 0, end_row: Optional[int] = None) -> np.ndarray:
+        """구간(행 구간 단위로 올림)의 열별 비어 있지 않은 셀 수"""
+        return self.nonempty[self._bands(start_row, end_row)].sum(axis=0)
+
+    def width(self, start_row: int = 0, end_row: Optional[int] = None) -> int:
+        """구간에서 내용이 있는 마지막 열 + 1 (raw 추출, 헤더 감지 폭)"""
+        return self._last(self.column_counts(start_row, end_row))
@@ -7,6 +7,16 @@ import json
 import os
 import re
 from typing import Dict, List, Optional, Tuple
+from block_extract import block_text, column_text, extract_items
+from block_index import MAX_BLOCK_ROWS, BlockIndex
+from hopyo_grammar import match_hopyo
+from hopyo_scan import scan_hopyo_cells
+from list_reconciler import FUZZY, TitleMatcher, strip_unit_suffix
+from numeric_fields import is_filled, json_default, typed_value
+from records import OMIT, Hopyo, IlwidaeTitle, SangulItem
+from row_types import ITEM, classify_rows
+from string_table import get_table
+from workbook_reader import SheetGrid, close_session, needed_columns, read_sheet
 
 class FinalUnifiedParser:
     """최종 통합 파서"""
@@ -20,50 +30,48 @@ class FinalUnifiedParser:
         print("test1.xlsx 파싱")
         print("="*70)
         
-        df = pd.read_excel('test1.xlsx', sheet_name='일위대가_산근', header=None)
+        # 컬럼 정보
+        column_info = {'품명': 1, '규격': 2, '단위': 3, '수량': 4, '비고': 13}
+        
+        # 호표 탐색(0~8열) + 컬럼 매핑에 필요한 열만 읽기
+        df = read_sheet('test1.xlsx', '일위대가_산근', usecols=needed_columns(column_info, range(9)))
         print(f"시트 크기: {df.shape}")
         
         # 호표 찾기
-        hopyo_pattern = r'제\s*(\d+)\s*호표'
         hopyo_list = []
         seen_nums = set()
         
-        for i in range(len(df)):
-            for j in range(min(5, len(df.columns))):
-                cell = df.iloc[i, j]
-                if pd.notna(cell):
-                    cell_str = str(cell).strip()
-                    match = re.match(hopyo_pattern, cell_str)
-                    if match:
-                        hopyo_num = match.group(1)
-                        
-                        if hopyo_num in seen_nums:
-                            break
-                        
-                        # 작업명 찾기
-                        work_name = ''
-                        for k in range(j+1, min(j+5, len(df.columns))):
-                            next_cell = df.iloc[i, k]
-                            if pd.notna(next_cell):
-                                next_str = str(next_cell).strip()
-                                if next_str and not next_str.replace('.', '').isdigit():
-                                    work_name = next_str
-                                    break
-                        
-                        if work_name:
-                            seen_nums.add(hopyo_num)
-                            hopyo_list.append({
-                                'row': i,
-                                'num': hopyo_num,
-                                'work': work_name
-                            })
+        # 앞 5열을 한 번에 탐색, 행마다 첫 번째 호표 셀만 사용
+        last_row = -1
+        for hit in scan_hopyo_cells(df, ('je',), max_cols=5):
+            i, j, hopyo_num = int(hit['row']), int(hit['col']), hit['num']
+            if i == last_row:
+                continue
+            last_row = i
+            
+            if hopyo_num in seen_nums:
+                continue
+            
+            # 작업명 찾기
+            work_name = ''
+            for k in range(j+1, min(j+5, len(df.columns))):
+                next_cell = df.iloc[i, k]
+                if pd.notna(next_cell):
+                    next_str = str(next_cell).strip()
+                    if next_str and not next_str.replace('.', '').isdigit():
+                        work_name = next_str
                         break
+            
+            if work_name:
+                seen_nums.add(hopyo_num)
+                hopyo_list.append(Hopyo(
+                    row=i,
+                    num=hopyo_num,
+                    work=work_name
+                ))
         
         print(f"호표 발견: {len(hopyo_list)}개")
         
-        # 컬럼 정보
-        column_info = {'품명': 1, '규격': 2, '단위': 3, '수량': 4, '비고': 13}
-        
         # 결과 생성
         result = self._create_result('test1.xlsx', '일위대가_산근', hopyo_list, df, column_info)
         
@@ -78,11 +86,14 @@ class FinalUnifiedParser:
         print("est.xlsx 파싱")
         print("="*70)
         
-        df = pd.read_excel('est.xlsx', sheet_name='일위대가', header=None)
+        # 컬럼 정보 (est 특화)
+        column_info = {'품명': 2, '규격': 3, '수량': 4, '단위': 5, '비고': 14}
+        
+        # 호표(1열)/작업명/규격/단위 + 컬럼 매핑에 필요한 열만 읽기
+        df = read_sheet('est.xlsx', '일위대가', usecols=needed_columns(column_info, range(1, 6)))
         print(f"시트 크기: {df.shape}")
         
         # 호표 찾기 (컬럼 1에서만)
-        hopyo_pattern = r'제\s*(\d+)\s*호표'
         hopyo_list = []
         
         for i in range(len(df)):
@@ -90,9 +101,9 @@ class FinalUnifiedParser:
                 cell = df.iloc[i, 1]
                 if pd.notna(cell):
                     cell_str = str(cell).strip()
-                    match = re.match(hopyo_pattern, cell_str)
+                    match = match_hopyo(cell_str, ('je',))
                     if match:
-                        hopyo_num = match.group(1)
+                        hopyo_num = match.num
                         
                         # 작업명은 컬럼 2에서
                         work_name = ''
@@ -115,19 +126,16 @@ class FinalUnifiedParser:
                             if pd.notna(unit_cell):
                                 unit = str(unit_cell).strip()
                         
-                        hopyo_list.append({
-                            'row': i,
-                            'num': hopyo_num,
-                            'work': work_name,
-                            'spec': spec,
-                            'unit': unit
-                        })
+                        hopyo_list.append(Hopyo(
+                            row=i,
+                            num=hopyo_num,
+                            work=work_name,
+                            spec=spec,
+                            unit=unit
+                        ))
         
         print(f"호표 발견: {len(hopyo_list)}개")
         
-        # 컬럼 정보 (est 특화)
-        column_info = {'품명': 2, '규격': 3, '수량': 4, '단위': 5, '비고': 14}
-        
         # 결과 생성 (est 전용)
         result = self._create_est_result('est.xlsx', '일위대가', hopyo_list, df, column_info)
         
@@ -142,11 +150,14 @@ class FinalUnifiedParser:
         print("sgs.xls 파싱")
         print("="*70)
         
-        df = pd.read_excel('sgs.xls', sheet_name='일위대가', header=None, engine='xlrd')
+        # 컬럼 정보 (sgs 특화 - 헤더 행 3 기준)
+        column_info = {'품명': 0, '규격': 1, '수량': 2, '단위': 3, '비고': -1}  # sgs는 비고 없음
+        
+        df = read_sheet('sgs.xls', '일위대가', usecols=needed_columns(column_info, range(3)))
         print(f"시트 크기: {df.shape}")
         
-        # 일위대가 목록표에서 품명/규격/단위 정보 가져오기
-        df_list = pd.read_excel('sgs.xls', sheet_name='일위대가 목록', header=None, engine='xlrd')
+        # 일위대가 목록표에서 품명/규격/단위 정보 가져오기 (공종, 규격, 단위 컬럼만)
+        df_list = read_sheet('sgs.xls', '일위대가 목록', usecols=[0, 1, 3])
         print(f"일위대가 목록 시트 크기: {df_list.shape}")
         
         # 목록표에서 정보 추출 (행 4부터 시작)
@@ -168,8 +179,15 @@ class FinalUnifiedParser:
         
         print(f"목록표에서 추출한 일위대가 정보: {len(title_info)}개")
         
+        # 목록표 작업명 bigram 색인 (정확히 같은 작업명이 없을 때 유사 작업명 조회)
+        # 유사 매칭은 다른 호표가 아직 쓰지 않은 목록 작업명만 (목록 항목 하나 = 호표 하나)
+        title_names = list(title_info)
+        title_pos = {name: pos for pos, name in enumerate(title_names)}
+        title_matcher = TitleMatcher(title_names)
+        used_pos = set()
+        fuzzy_count = 0
+        
         # 호표 찾기
-        hopyo_pattern = r'제\s*(\d+)\s*호표'
         hopyo_list = []
         
         for i in range(len(df)):
@@ -179,9 +197,9 @@ class FinalUnifiedParser:
                     cell_str = str(cell).strip()
                     
                     # 호표 패턴 매칭
-                    match = re.search(hopyo_pattern, cell_str)
+                    match = match_hopyo(cell_str, ('je',), search=True)
                     if match:
-                        hopyo_num = match.group(1)
+                        hopyo_num = match.num
                         
                         # 작업명 추출 (：또는 : 뒤)
                         work_name = ''
@@ -196,7 +214,7 @@ class FinalUnifiedParser:
                         
                         if work_name:
                             # 작업명에서 단위 정보 제거 (예: "탄성포장 철거 ㎡ 당" -> "탄성포장 철거")
-                            clean_work_name = work_name.replace(' ㎡ 당', '').replace(' M 당', '').replace(' EA 당', '').replace(' 개소 당', '').replace(' 기 당', '').replace(' 본 당', '').strip()
+                            clean_work_name = strip_unit_suffix(work_name)
                             
                             # 괄호 안의 규격 정보 분리
                             spec_from_name = ''
@@ -210,25 +228,36 @@ class FinalUnifiedParser:
                                     base_work_name = clean_work_name.split('(')[0].strip()
                             
                             # 목록표에서 정보 찾기
-                            info = title_info.get(base_work_name, title_info.get(clean_work_name, {}))
+                            list_match = OMIT
+                            list_name = base_work_name if base_work_name in title_info else clean_work_name
+                            info = title_info.get(list_name)
+                            if info is not None:
+                                used_pos.add(title_pos[list_name])
+                            else:
+                                info = {}
+                                best = title_matcher.best(clean_work_name, used=used_pos)
+                                if best:
+                                    pos, score = best
+                                    used_pos.add(pos)
+                                    info = title_info[title_names[pos]]
+                                    list_match = {'status': FUZZY, 'title': title_names[pos], 'score': score}
+                                    fuzzy_count += 1
                             
                             # 규격 정보 우선순위: 1) 목록표 규격, 2) 품명에서 추출한 규격
                             final_spec = info.get('규격', '') or spec_from_name
                             
-                            hopyo_list.append({
-                                'row': i,
-                                'num': hopyo_num,
-                                'work': work_name,
-                                'clean_work': base_work_name,
-                                'spec': final_spec,
-                                'unit': info.get('단위', '')
-                            })
+                            hopyo_list.append(Hopyo(
+                                row=i,
+                                num=hopyo_num,
+                                work=work_name,
+                                clean_work=base_work_name,
+                                spec=final_spec,
+                                unit=info.get('단위', ''),
+                                list_match=list_match
+                            ))
                         break
         
-        print(f"호표 발견: {len(hopyo_list)}개")
-        
-        # 컬럼 정보 (sgs 특화 - 헤더 행 3 기준)
-        column_info = {'품명': 0, '규격': 1, '수량': 2, '단위': 3, '비고': -1}  # sgs는 비고 없음
+        print(f"호표 발견: {len(hopyo_list)}개 (유사 작업명으로 목록 매칭: {fuzzy_count}개)")
         
         # 결과 생성 (목록표 정보 포함)
         result = self._create_sgs_result('sgs.xls', '일위대가', hopyo_list, df, column_info)
@@ -244,7 +273,10 @@ class FinalUnifiedParser:
         print("건축구조내역.xlsx 파싱")
         print("="*70)
         
-        df = pd.read_excel('건축구조내역.xlsx', sheet_name='일위대가', header=None)
+        # 컬럼 정보 (헤더 행 1 기준)
+        column_info = {'품명': 0, '규격': 1, '단위': 2, '수량': 3, '비고': 12}
+        
+        df = read_sheet('건축구조내역.xlsx', '일위대가', usecols=needed_columns(column_info))
         print(f"시트 크기: {df.shape}")
         
         # 호표 찾기 - ( 호표 N ) 패턴
@@ -257,9 +289,9 @@ class FinalUnifiedParser:
                 cell_str = str(cell).strip()
                 
                 # ( 호표 N ) 패턴 찾기
-                match = re.search(r'\( 호표 (\d+) \)', cell_str)
+                match = match_hopyo(cell_str, ('paren_hopyo',))
                 if match:
-                    hopyo_num = match.group(1)
+                    hopyo_num = match.num
                     
                     if hopyo_num in seen_nums:
                         continue
@@ -269,18 +301,15 @@ class FinalUnifiedParser:
                     
                     if work_name:
                         seen_nums.add(hopyo_num)
-                        hopyo_list.append({
-                            'row': i,
-                            'num': hopyo_num,
-                            'work': work_name
-                        })
+                        hopyo_list.append(Hopyo(
+                            row=i,
+                            num=hopyo_num,
+                            work=work_name
+                        ))
                         print(f"  발견: 호표 {hopyo_num} - {work_name}")
         
         print(f"호표 발견: {len(hopyo_list)}개")
         
-        # 컬럼 정보 (헤더 행 1 기준)
-        column_info = {'품명': 0, '규격': 1, '단위': 2, '수량': 3, '비고': 12}
-        
         # 결과 생성
         result = self._create_result('건축구조내역.xlsx', '일위대가', hopyo_list, df, column_info)
         
@@ -295,63 +324,57 @@ class FinalUnifiedParser:
         print("건축구조내역2.xlsx 파싱")
         print("="*70)
         
-        df = pd.read_excel('건축구조내역2.xlsx', sheet_name='일위대가', header=None)
+        # 컬럼 정보
+        column_info = {'품명': 0, '규격': 1, '단위': 2, '수량': 3, '비고': 12}
+        
+        # 호표 탐색(0~8열) + 컬럼 매핑에 필요한 열만 읽기
+        df = read_sheet('건축구조내역2.xlsx', '일위대가', usecols=needed_columns(column_info, range(9)))
         print(f"시트 크기: {df.shape}")
         
         # 호표 찾기 (M-NNN 패턴)
         hopyo_list = []
         seen_codes = set()
         
-        for i in range(len(df)):
-            for j in range(min(5, len(df.columns))):
-                cell = df.iloc[i, j]
-                if pd.notna(cell):
-                    cell_str = str(cell).strip()
-                    
-                    # M-101 형식 찾기
-                    match = re.match(r'([A-Z])-(\d+)', cell_str)
-                    if match:
-                        code = f"{match.group(1)}-{match.group(2)}"
-                        
-                        if code in seen_codes:
-                            continue
-                        
-                        # 작업명 찾기
-                        work_name = ''
-                        
-                        # 같은 행 다음 셀들
-                        for k in range(j+1, min(j+5, len(df.columns))):
-                            next_cell = df.iloc[i, k]
-                            if pd.notna(next_cell):
-                                next_str = str(next_cell).strip()
-                                if next_str and not re.match(r'^[A-Z]-\d+$', next_str):
-                                    work_name = next_str
-                                    break
-                        
-                        # 다음 행에서 찾기
-                        if not work_name and i+1 < len(df):
-                            for k in range(min(5, len(df.columns))):
-                                next_cell = df.iloc[i+1, k]
-                                if pd.notna(next_cell):
-                                    next_str = str(next_cell).strip()
-                                    if next_str and not re.match(r'^[\d.,]+$', next_str) and '합계' not in next_str:
-                                        work_name = next_str
-                                        break
-                        
-                        if work_name:
-                            seen_codes.add(code)
-                            hopyo_list.append({
-                                'row': i,
-                                'num': match.group(2),
-                                'work': f"{code} {work_name}"
-                            })
+        # M-101 형식을 앞 5열에서 한 번에 탐색 (이미 나온 코드는 같은 행 다음 셀로 넘어감)
+        done_row = -1
+        for hit in scan_hopyo_cells(df, ('code',), max_cols=5):
+            i, j, code = int(hit['row']), int(hit['col']), hit['num']
+            if i == done_row or code in seen_codes:
+                continue
+            done_row = i
+            
+            # 작업명 찾기
+            work_name = ''
+            
+            # 같은 행 다음 셀들
+            for k in range(j+1, min(j+5, len(df.columns))):
+                next_cell = df.iloc[i, k]
+                if pd.notna(next_cell):
+                    next_str = str(next_cell).strip()
+                    if next_str and not re.match(r'^[A-Z]-\d+$', next_str):
+                        work_name = next_str
                         break
+            
+            # 다음 행에서 찾기
+            if not work_name and i+1 < len(df):
+                for k in range(min(5, len(df.columns))):
+                    next_cell = df.iloc[i+1, k]
+                    if pd.notna(next_cell):
+                        next_str = str(next_cell).strip()
+                        if next_str and not re.match(r'^[\d.,]+$', next_str) and '합계' not in next_str:
+                            work_name = next_str
+                            break
+            
+            if work_name:
+                seen_codes.add(code)
+                hopyo_list.append(Hopyo(
+                    row=i,
+                    num=code.split('-')[1],
+                    work=f"{code} {work_name}"
+                ))
         
         print(f"호표 발견: {len(hopyo_list)}개")
         
-        # 컬럼 정보
-        column_info = {'품명': 0, '규격': 1, '단위': 2, '수량': 3, '비고': 12}
-        
         # 결과 생성
         result = self._create_result('건축구조내역2.xlsx', '일위대가', hopyo_list, df, column_info)
         
@@ -366,8 +389,11 @@ class FinalUnifiedParser:
         print("stmate.xlsx 파싱 (일위대가_호표 시트)")
         print("="*70)
         
-        # repaired 파일에서 일위대가_호표 시트 사용
-        df = pd.read_excel('stmate_repaired.xlsx', sheet_name='일위대가_호표', header=None)
+        # 원본 파일 직접 사용 (openpyxl이 거부하면 시트 XML 리더로 대체)
+        # 컬럼 정보 (stmate 호표 시트 특화)
+        column_info = {'품명': 0, '규격': 1, '수량': 2, '단위': 3, '비고': -1}  # 비고 없음
+        
+        df = read_sheet('stmate.xlsx', '일위대가_호표', usecols=needed_columns(column_info))
         print(f"시트 크기: {df.shape}")
         
         # 호표 찾기 - No.N 패턴으로 시작하는 행 (진짜 일위대가)
@@ -380,15 +406,15 @@ class FinalUnifiedParser:
                 cell_str = str(cell).strip()
                 
                 # No.N 패턴 찾기 (예: "No.1  파고라(철거)")
-                match = re.match(r'^No\.(\d+)\s+(.+)$', cell_str)
+                match = match_hopyo(cell_str, ('no',))
                 if match:
-                    hopyo_num = match.group(1)
+                    hopyo_num = match.num
                     
                     if hopyo_num in seen_nums:
                         continue
                     
                     # 작업명 추출
-                    work_name = match.group(2).strip()
+                    work_name = match.title
                     
                     # 규격은 컬럼 1에서
                     spec = ''
@@ -409,25 +435,22 @@ class FinalUnifiedParser:
                     if len(df.columns) > 2:
                         qty_cell = df.iloc[i, 2]
                         if pd.notna(qty_cell):
-                            quantity = str(qty_cell).strip()
+                            quantity = typed_value(qty_cell)
                     
                     if work_name:
                         seen_nums.add(hopyo_num)
-                        hopyo_list.append({
-                            'row': i,
-                            'num': hopyo_num,
-                            'work': work_name,
-                            'spec': spec,
-                            'unit': unit,
-                            'quantity': quantity
-                        })
+                        hopyo_list.append(Hopyo(
+                            row=i,
+                            num=hopyo_num,
+                            work=work_name,
+                            spec=spec,
+                            unit=unit,
+                            quantity=quantity
+                        ))
                         print(f"  발견: No.{hopyo_num} - {work_name} | {spec} | {unit}")
         
         print(f"일위대가 발견: {len(hopyo_list)}개")
         
-        # 컬럼 정보 (stmate 호표 시트 특화)
-        column_info = {'품명': 0, '규격': 1, '수량': 2, '단위': 3, '비고': -1}  # 비고 없음
-        
         # 결과 생성 (stmate 호표 전용)
         result = self._create_stmate_hopyo_result('stmate.xlsx', '일위대가_호표', hopyo_list, df, column_info)
         
@@ -437,7 +460,7 @@ class FinalUnifiedParser:
         return result
     
     def _create_result(self, file_name: str, sheet_name: str, hopyo_list: List, 
-                      df: pd.DataFrame, column_info: Dict) -> Dict:
+                      df: SheetGrid, column_info: Dict) -> Dict:
         """결과 JSON 생성"""
         result = {
             'file': file_name,
@@ -446,57 +469,32 @@ class FinalUnifiedParser:
             'ilwidae_data': []
         }
         
-        for idx, hopyo in enumerate(hopyo_list):
-            start_row = hopyo['row']
-            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else min(start_row + 50, len(df))
+        # 행 유형 분류 (시트당 한 번)
+        row_types = classify_rows(df, column_info['품명'], column_info.values(),
+                                  [hopyo.row for hopyo in hopyo_list])
+        
+        # 호표 블록 구간 (마지막 호표는 마지막 내용 행까지, 끝쪽 빈 행 제외)
+        blocks = BlockIndex((hopyo.row for hopyo in hopyo_list), sheet_end=df.last_row + 1,
+                            max_rows=MAX_BLOCK_ROWS, row_types=row_types)
+        blocks.report_truncation(result)
+        item_rows = row_types == ITEM
+        
+        for hopyo in hopyo_list:
+            start_row = hopyo.row
+            end_row = blocks.end_of(start_row)
             
-            # 산출근거 추출
-            sangul_items = []
-            
-            for row_idx in range(start_row + 1, end_row):
-                # 빈 행 체크
-                row_empty = True
-                for col in column_info.values():
-                    if col < len(df.columns) and pd.notna(df.iloc[row_idx, col]):
-                        row_empty = False
-                        break
-                
-                if row_empty:
-                    continue
-                
-                row_data = {
-                    'row_number': row_idx,
-                    '품명': '',
-                    '규격': '',
-                    '단위': '',
-                    '수량': '',
-                    '비고': ''
-                }
-                
-                # 각 필드 추출
-                for field, col_idx in column_info.items():
-                    if col_idx >= 0 and col_idx < len(df.columns):
-                        cell = df.iloc[row_idx, col_idx]
-                        if pd.notna(cell):
-                            value = str(cell).strip()
-                            # 합계, 호표 등 제외
-                            if field == '품명' and ('합계' in value or '호표' in value or re.match(r'^[\d.,]+$', value)):
-                                break
-                            row_data[field] = value
-                
-                # 품명이 있는 경우만 추가
-                if row_data['품명']:
-                    sangul_items.append(row_data)
+            # 산출근거 추출 (항목 행만 - 빈 행, 합계/소계, 호표, 헤더, 구분선, 숫자뿐인 품명 제외)
+            sangul_items = extract_items(df, start_row + 1, end_row, column_info, item_rows)
             
             ilwidae_item = {
-                'ilwidae_no': hopyo['num'],
-                'ilwidae_title': {
-                    '품명': hopyo['work'],
-                    '규격': '',
-                    '단위': '',
-                    '수량': '',
-                    '비고': ''
-                },
+                'ilwidae_no': hopyo.num,
+                'ilwidae_title': IlwidaeTitle(
+                    품명=hopyo.work,
+                    규격='',
+                    단위='',
+                    수량='',
+                    비고=''
+                ),
                 'position': {
                     'start_row': start_row,
                     'end_row': end_row,
@@ -510,7 +508,7 @@ class FinalUnifiedParser:
         return result
     
     def _create_est_result(self, file_name: str, sheet_name: str, hopyo_list: List, 
-                           df: pd.DataFrame, column_info: Dict) -> Dict:
+                           df: SheetGrid, column_info: Dict) -> Dict:
         """est 전용 결과 JSON 생성 (호표 행의 규격/단위 활용)"""
         result = {
             'file': file_name,
@@ -519,58 +517,33 @@ class FinalUnifiedParser:
             'ilwidae_data': []
         }
         
-        for idx, hopyo in enumerate(hopyo_list):
-            start_row = hopyo['row']
-            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else min(start_row + 50, len(df))
+        # 행 유형 분류 (시트당 한 번)
+        row_types = classify_rows(df, column_info['품명'], column_info.values(),
+                                  [hopyo.row for hopyo in hopyo_list])
+        
+        # 호표 블록 구간 (마지막 호표는 마지막 내용 행까지, 끝쪽 빈 행 제외)
+        blocks = BlockIndex((hopyo.row for hopyo in hopyo_list), sheet_end=df.last_row + 1,
+                            max_rows=MAX_BLOCK_ROWS, row_types=row_types)
+        blocks.report_truncation(result)
+        item_rows = row_types == ITEM
+        
+        for hopyo in hopyo_list:
+            start_row = hopyo.row
+            end_row = blocks.end_of(start_row)
             
-            # 산출근거 추출
-            sangul_items = []
-            
-            for row_idx in range(start_row + 1, end_row):
-                # 빈 행 체크
-                row_empty = True
-                for col in column_info.values():
-                    if col >= 0 and col < len(df.columns) and pd.notna(df.iloc[row_idx, col]):
-                        row_empty = False
-                        break
-                
-                if row_empty:
-                    continue
-                
-                row_data = {
-                    'row_number': row_idx,
-                    '품명': '',
-                    '규격': '',
-                    '단위': '',
-                    '수량': '',
-                    '비고': ''
-                }
-                
-                # 각 필드 추출
-                for field, col_idx in column_info.items():
-                    if col_idx >= 0 and col_idx < len(df.columns):
-                        cell = df.iloc[row_idx, col_idx]
-                        if pd.notna(cell):
-                            value = str(cell).strip()
-                            # 합계, 호표 등 제외
-                            if field == '품명' and ('합계' in value or '호표' in value or re.match(r'^[\d.,]+$', value)):
-                                break
-                            row_data[field] = value
-                
-                # 품명이 있는 경우만 추가
-                if row_data['품명']:
-                    sangul_items.append(row_data)
+            # 산출근거 추출 (항목 행만 - 빈 행, 합계/소계, 호표, 헤더, 구분선, 숫자뿐인 품명 제외)
+            sangul_items = extract_items(df, start_row + 1, end_row, column_info, item_rows)
             
             # 일위대가 타이틀에 호표 행의 정보 사용
             ilwidae_item = {
-                'ilwidae_no': hopyo['num'],
-                'ilwidae_title': {
-                    '품명': hopyo['work'],
-                    '규격': hopyo.get('spec', ''),
-                    '단위': hopyo.get('unit', ''),
-                    '수량': '1',  # 기본값
-                    '비고': ''
-                },
+                'ilwidae_no': hopyo.num,
+                'ilwidae_title': IlwidaeTitle(
+                    품명=hopyo.work,
+                    규격=hopyo.spec,
+                    단위=hopyo.unit,
+                    수량=1,  # 기본값
+                    비고=''
+                ),
                 'position': {
                     'start_row': start_row,
                     'end_row': end_row,
@@ -584,7 +557,7 @@ class FinalUnifiedParser:
         return result
     
     def _create_sgs_result(self, file_name: str, sheet_name: str, hopyo_list: List, 
-                           df: pd.DataFrame, column_info: Dict) -> Dict:
+                           df: SheetGrid, column_info: Dict) -> Dict:
         """sgs 전용 결과 JSON 생성 (목록표 정보 활용)"""
         result = {
             'file': file_name,
@@ -593,58 +566,33 @@ class FinalUnifiedParser:
             'ilwidae_data': []
         }
         
-        for idx, hopyo in enumerate(hopyo_list):
-            start_row = hopyo['row']
-            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else min(start_row + 50, len(df))
-            
-            # 산출근거 추출
-            sangul_items = []
+        # 행 유형 분류 (시트당 한 번)
+        row_types = classify_rows(df, column_info['품명'], column_info.values(),
+                                  [hopyo.row for hopyo in hopyo_list])
+        
+        # 호표 블록 구간 (마지막 호표는 마지막 내용 행까지, 끝쪽 빈 행 제외)
+        blocks = BlockIndex((hopyo.row for hopyo in hopyo_list), sheet_end=df.last_row + 1,
+                            max_rows=MAX_BLOCK_ROWS, row_types=row_types)
+        blocks.report_truncation(result)
+        item_rows = row_types == ITEM
+        
+        for hopyo in hopyo_list:
+            start_row = hopyo.row
+            end_row = blocks.end_of(start_row)
             
-            for row_idx in range(start_row + 1, end_row):
-                # 빈 행 체크
-                row_empty = True
-                for col in column_info.values():
-                    if col >= 0 and col < len(df.columns) and pd.notna(df.iloc[row_idx, col]):
-                        row_empty = False
-                        break
-                
-                if row_empty:
-                    continue
-                
-                row_data = {
-                    'row_number': row_idx,
-                    '품명': '',
-                    '규격': '',
-                    '단위': '',
-                    '수량': '',
-                    '비고': ''
-                }
-                
-                # 각 필드 추출
-                for field, col_idx in column_info.items():
-                    if col_idx >= 0 and col_idx < len(df.columns):
-                        cell = df.iloc[row_idx, col_idx]
-                        if pd.notna(cell):
-                            value = str(cell).strip()
-                            # 합계, 호표 등 제외
-                            if field == '품명' and ('합계' in value or '호표' in value or re.match(r'^[\d.,]+$', value)):
-                                break
-                            row_data[field] = value
-                
-                # 품명이 있는 경우만 추가
-                if row_data['품명']:
-                    sangul_items.append(row_data)
+            # 산출근거 추출 (항목 행만 - 빈 행, 합계/소계, 호표, 헤더, 구분선, 숫자뿐인 품명 제외)
+            sangul_items = extract_items(df, start_row + 1, end_row, column_info, item_rows)
             
             # 일위대가 타이틀에 목록표 정보 사용
             ilwidae_item = {
-                'ilwidae_no': hopyo['num'],
-                'ilwidae_title': {
-                    '품명': hopyo['clean_work'],  # 깨끗한 작업명 사용
-                    '규격': hopyo['spec'],  # 목록표의 규격
-                    '단위': hopyo['unit'],  # 목록표의 단위
-                    '수량': '1',  # 기본값
-                    '비고': ''
-                },
+                'ilwidae_no': hopyo.num,
+                'ilwidae_title': IlwidaeTitle(
+                    품명=hopyo.clean_work,  # 깨끗한 작업명 사용
+                    규격=hopyo.spec,  # 목록표의 규격
+                    단위=hopyo.unit,  # 목록표의 단위
+                    수량=1,  # 기본값
+                    비고=''
+                ),
                 'position': {
                     'start_row': start_row,
                     'end_row': end_row,
@@ -653,12 +601,16 @@ class FinalUnifiedParser:
                 '산출근거': sangul_items
             }
             
+            # 목록표 작업명과 유사 매칭한 호표는 매칭 정보 표시 (정확히 일치하면 생략)
+            if 'list_match' in hopyo:
+                ilwidae_item['list_match'] = hopyo.list_match
+            
             result['ilwidae_data'].append(ilwidae_item)
         
         return result
     
     def _create_stmate_result(self, file_name: str, sheet_name: str, hopyo_list: List, 
-                             df: pd.DataFrame, column_info: Dict) -> Dict:
+                             df: SheetGrid, column_info: Dict) -> Dict:
         """stmate 전용 결과 JSON 생성"""
         result = {
             'file': file_name,
@@ -667,9 +619,14 @@ class FinalUnifiedParser:
             'ilwidae_data': []
         }
         
-        for idx, hopyo in enumerate(hopyo_list):
-            start_row = hopyo['row']
-            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else min(start_row + 100, len(df))
+        # 호표 블록 구간 (마지막 호표는 마지막 내용 행까지)
+        blocks = BlockIndex((hopyo.row for hopyo in hopyo_list), sheet_end=df.last_row + 1,
+                            max_rows=MAX_BLOCK_ROWS)
+        blocks.report_truncation(result)
+        
+        for hopyo in hopyo_list:
+            start_row = hopyo.row
+            end_row = blocks.end_of(start_row)
             
             # 산출근거 추출
             sangul_items = []
@@ -685,14 +642,7 @@ class FinalUnifiedParser:
                             break
                 
                 # 산출근거 추출 - stmate는 특별한 구조
-                row_data = {
-                    'row_number': row_idx,
-                    '품명': '',
-                    '규격': '',
-                    '단위': '',
-                    '수량': '',
-                    '비고': ''
-                }
+                row_data = SangulItem(row_idx)
                 
                 # 품명은 행의 첫 번째 컬럼에서 (설명 라인들)
                 if row_idx < len(df) and len(df.columns) > 0:
@@ -706,44 +656,44 @@ class FinalUnifiedParser:
                                 if '재 료 비' in desc_str or '노 무 비' in desc_str or '경    비' in desc_str:
                                     parts = desc_str.split(':')
                                     if len(parts) >= 2:
-                                        row_data['품명'] = parts[0].strip()
+                                        row_data.품명 = parts[0].strip()
                                         # 수량 정보 추출
                                         amount_part = parts[1].strip()
                                         if '=' in amount_part:
                                             amount_value = amount_part.split('=')[-1].replace('원', '').strip()
                                             if amount_value:
-                                                row_data['수량'] = amount_value
+                                                row_data.수량 = typed_value(amount_value)
                                 elif desc_str.strip() and not desc_str.startswith('Q '):
-                                    row_data['품명'] = desc_str.strip()
+                                    row_data.품명 = desc_str.strip()
                 
                 # 합계 행 처리
                 total_cell = df.iloc[row_idx, 1] if row_idx < len(df) and len(df.columns) > 1 else None
                 if pd.notna(total_cell):
                     total_str = str(total_cell).strip()
                     if total_str and total_str.replace(',', '').replace('.', '').isdigit():
-                        if not row_data['품명']:
+                        if not row_data.품명:
                             # 첫 컬럼에서 품명 확인
                             first_cell = df.iloc[row_idx, 0] if len(df.columns) > 0 else None
                             if pd.notna(first_cell):
                                 first_str = str(first_cell).strip()
                                 if '소    계' in first_str or '전체 합계' in first_str:
-                                    row_data['품명'] = first_str.strip()
-                                    row_data['수량'] = total_str
+                                    row_data.품명 = first_str.strip()
+                                    row_data.수량 = typed_value(total_cell, total_str)
                 
                 # 품명이 있는 경우만 추가
-                if row_data['품명']:
+                if row_data.품명:
                     sangul_items.append(row_data)
             
             # 일위대가 타이틀 생성
             ilwidae_item = {
-                'ilwidae_no': hopyo['num'],
-                'ilwidae_title': {
-                    '품명': hopyo['work'],
-                    '규격': hopyo['spec'],
-                    '단위': hopyo['unit'],
-                    '수량': '1',  # 기본값
-                    '비고': ''
-                },
+                'ilwidae_no': hopyo.num,
+                'ilwidae_title': IlwidaeTitle(
+                    품명=hopyo.work,
+                    규격=hopyo.spec,
+                    단위=hopyo.unit,
+                    수량=1,  # 기본값
+                    비고=''
+                ),
                 'position': {
                     'start_row': start_row,
                     'end_row': end_row,
@@ -757,7 +707,7 @@ class FinalUnifiedParser:
         return result
     
     def _create_stmate_hopyo_result(self, file_name: str, sheet_name: str, hopyo_list: List, 
-                                   df: pd.DataFrame, column_info: Dict) -> Dict:
+                                   df: SheetGrid, column_info: Dict) -> Dict:
         """stmate 일위대가_호표 전용 결과 JSON 생성"""
         result = {
             'file': file_name,
@@ -766,63 +716,39 @@ class FinalUnifiedParser:
             'ilwidae_data': []
         }
         
-        for idx, hopyo in enumerate(hopyo_list):
-            start_row = hopyo['row']
-            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else min(start_row + 50, len(df))
+        # 호표 블록 구간 (마지막 호표는 마지막 내용 행까지)
+        blocks = BlockIndex((hopyo.row for hopyo in hopyo_list), sheet_end=df.last_row + 1,
+                            max_rows=MAX_BLOCK_ROWS)
+        blocks.report_truncation(result)
+        
+        # 품명이 있고 유효한 산출근거 행 (No.로 시작하는 공종명 제외, 레코드 만들기 전에 시트당 한 번)
+        names = column_text(df, column_info.get('품명'))
+        item_rows = ((names != '') & ~names.str.startswith('No.')).to_numpy()
+        
+        for hopyo in hopyo_list:
+            start_row = hopyo.row
+            end_row = blocks.end_of(start_row)
             
-            # 산출근거 추출 - 들여쓰기된 항목들
-            sangul_items = []
+            # 산출근거 추출 - 들여쓰기된 항목들 (예: "   깨기(30cm미만)"), 다음 No. 시작 행에서 중단
+            first_col = block_text(df, start_row + 1, end_row, [0] if df.width else [])
+            stop_row = end_row
+            for offset, row in enumerate(first_col.tolist()):
+                if row and re.match(r'^No\.\d+', row[0]):
+                    stop_row = start_row + 1 + offset
+                    break
             
-            for row_idx in range(start_row + 1, end_row):
-                # 다음 No. 시작이면 중단
-                if row_idx < len(df):
-                    first_cell = df.iloc[row_idx, 0] if len(df.columns) > 0 else None
-                    if pd.notna(first_cell):
-                        first_str = str(first_cell).strip()
-                        if re.match(r'^No\.\d+', first_str):
-                            break
-                
-                # 들여쓰기된 항목들 추출 (예: "   깨기(30cm미만)")
-                row_data = {
-                    'row_number': row_idx,
-                    '품명': '',
-                    '규격': '',
-                    '단위': '',
-                    '수량': '',
-                    '비고': ''
-                }
-                
-                # 각 필드 추출
-                for field, col_idx in column_info.items():
-                    if col_idx >= 0 and col_idx < len(df.columns):
-                        cell = df.iloc[row_idx, col_idx]
-                        if pd.notna(cell):
-                            value = str(cell).strip()
-                            # 빈 행이나 헤더 제외
-                            if field == '품명' and value:
-                                # 들여쓰기된 항목만 산출근거로 처리
-                                if value.startswith('   ') or value.startswith('\t'):
-                                    row_data[field] = value.strip()
-                                elif not re.match(r'^No\.\d+', value):
-                                    # 공종명이 아닌 경우만
-                                    row_data[field] = value
-                            elif field != '품명':
-                                row_data[field] = value
-                
-                # 품명이 있고 유효한 산출근거인 경우만 추가
-                if row_data['품명'] and not row_data['품명'].startswith('No.'):
-                    sangul_items.append(row_data)
+            sangul_items = extract_items(df, start_row + 1, stop_row, column_info, item_rows)
             
             # 일위대가 타이틀 생성
             ilwidae_item = {
-                'ilwidae_no': hopyo['num'],
-                'ilwidae_title': {
-                    '품명': hopyo['work'],
-                    '규격': hopyo['spec'],
-                    '단위': hopyo['unit'],
-                    '수량': hopyo['quantity'],
-                    '비고': ''
-                },
+                'ilwidae_no': hopyo.num,
+                'ilwidae_title': IlwidaeTitle(
+                    품명=hopyo.work,
+                    규격=hopyo.spec,
+                    단위=hopyo.unit,
+                    수량=hopyo.quantity,
+                    비고=''
+                ),
                 'position': {
                     'start_row': start_row,
                     'end_row': end_row,
@@ -838,7 +764,7 @@ class FinalUnifiedParser:
     def _save_result(self, result: Dict, output_file: str):
         """결과 저장"""
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+            json.dump(result, f, ensure_ascii=False, indent=2, default=json_default)
         
         # 통계 출력
         total_sangul = sum(len(item['산출근거']) for item in result['ilwidae_data'])
@@ -849,30 +775,37 @@ class FinalUnifiedParser:
     def run_all(self):
         """모든 파일 파싱"""
         results = []
+        get_table().reset_stats()
         
         # test1.xlsx
         if os.path.exists('test1.xlsx'):
             results.append(self.parse_test1())
+            close_session('test1.xlsx')
         
         # est.xlsx
         if os.path.exists('est.xlsx'):
             results.append(self.parse_est())
+            close_session('est.xlsx')
         
         # sgs.xls
         if os.path.exists('sgs.xls'):
             results.append(self.parse_sgs())
+            close_session('sgs.xls')
         
         # 건축구조내역.xlsx
         if os.path.exists('건축구조내역.xlsx'):
             results.append(self.parse_construction1())
+            close_session('건축구조내역.xlsx')
         
         # 건축구조내역2.xlsx
         if os.path.exists('건축구조내역2.xlsx'):
             results.append(self.parse_construction2())
+            close_session('건축구조내역2.xlsx')
         
-        # stmate.xlsx (repaired version 필요)
-        if os.path.exists('stmate_repaired.xlsx'):
+        # stmate.xlsx
+        if os.path.exists('stmate.xlsx'):
             results.append(self.parse_stmate())
+            close_session('stmate.xlsx')
         
         return results
 
@@ -912,7 +845,7 @@ def validate_final_results():
                 for sangul in item['산출근거']:
                     total_sangul += 1
                     for field in filled_counts.keys():
-                        if sangul.get(field, ''):
+                        if is_filled(sangul.get(field)):
                             filled_counts[field] += 1
             
             print(f"  산출근거: {total_sangul}개")
@@ -948,6 +881,9 @@ if __name__ == "__main__":
     parser = FinalUnifiedParser()
     results = parser.run_all()
     
+    # 단위/규격/품명 카디널리티
+    get_table().print_stats()
+    
     # 검증
     success_rate = validate_final_results()
     
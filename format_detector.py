@@ -0,0 +1,131 @@
+"""
+일위대가 시트 형식 감지 (앞부분만 스트리밍)
+시트 전체를 읽지 않고 앞쪽 N행만 읽으며, 호표 패턴과 헤더 행이 확인되는 즉시 중단
+감지 결과에 신뢰도와 근거 셀을 함께 반환
+"""
+import re
+from typing import Dict, List, Optional
+
+from workbook_reader import get_session, probe_workbook
+
+# 감지 범위 (기존 detect_file_type과 동일: 호표는 30행 x 5열, 헤더는 10행 x 10열)
+DETECT_MAX_ROWS = 30
+HOPYO_MAX_COLS = 5
+HEADER_MAX_ROWS = 10
+HEADER_MAX_COLS = 10
+
+HEADER_KEYWORDS = ['호표', '품명', '공종', '규격', '단위', '수량']
+
+# 형식별로 헤더에 있어야 할 키워드
+EXPECTED_HEADER = {
+    'sgs': '공종',
+    'construction': '품명',
+    'est': '호표',
+    'test1': '호표'
+}
+
+_SEPARATED_HOPYO = re.compile(r'^제?\s*\d+\s*호표$')
+
+
+def find_target_sheet(sheet_names: List[str]) -> Optional[str]:
+    """일위대가 시트 선택 (목록/총괄 제외, 없으면 산근 시트)"""
+    for sheet in sheet_names:
+        if '일위대가' in sheet and '목록' not in sheet and '총괄' not in sheet:
+            return sheet
+    for sheet in sheet_names:
+        if '산근' in sheet:
+            return sheet
+    return None
+
+
+def classify_hopyo(cell_str: str, col_idx: int) -> Optional[str]:
+    """'호표'가 들어간 셀의 형식 분류 (분류 불가면 None)"""
+    if '：' in cell_str or ':' in cell_str:
+        return 'sgs'
+    if '(' in cell_str and ')' in cell_str:
+        return 'construction'
+    if '제' in cell_str or _SEPARATED_HOPYO.match(cell_str.strip()):
+        if col_idx == 1:
+            return 'est'
+        if col_idx == 0:
+            return 'test1'
+    return None
+
+
+def detect_format(file_path: str, sheet_name: Optional[str] = None,
+                  max_rows: int = DETECT_MAX_ROWS) -> Dict:
+    """앞쪽 max_rows행만 읽어 형식 감지
+
+    반환: {'file', 'sheet', 'type', 'confidence', 'evidence', 'rows_scanned', 'stopped_early'}
+    type은 'sgs' / 'construction' / 'est' / 'test1' / None
+    신뢰도: 호표 패턴 0.6 + 헤더 행 확인 0.25 + 형식에 맞는 헤더 키워드 0.15
+    """
+    result = {
+        'file': file_path,
+        'sheet': sheet_name,
+        'type': None,
+        'confidence': 0.0,
+        'evidence': [],
+        'rows_scanned': 0,
+        'stopped_early': False
+    }
+    if sheet_name is None:
+        sheet_name = find_target_sheet(probe_workbook(file_path)['sheet_names'])
+        result['sheet'] = sheet_name
+        if sheet_name is None:
+            return result
+
+    header_row = None
+    header_keywords = set()
+    max_cols = max(HOPYO_MAX_COLS, HEADER_MAX_COLS)
+    rows = get_session(file_path).iter_head(sheet_name, max_rows, max_cols)
+    for row_idx, row in enumerate(rows):
+        result['rows_scanned'] = row_idx + 1
+
+        # 헤더 행: 키워드 2개 이상
+        if header_row is None and row_idx < HEADER_MAX_ROWS:
+            found = {}
+            for col_idx, cell in enumerate(row[:HEADER_MAX_COLS]):
+                if cell is None:
+                    continue
+                cell_str = str(cell).strip()
+                for keyword in HEADER_KEYWORDS:
+                    if keyword in cell_str and keyword not in found:
+                        found[keyword] = col_idx
+            if len(found) >= 2:
+                header_row = row_idx
+                header_keywords = set(found)
+                result['evidence'].append({
+                    'kind': 'header', 'row': row_idx,
+                    'keywords': found
+                })
+
+        # 호표 패턴: 처음 분류되는 호표 셀로 형식 결정
+        if result['type'] is None:
+            for col_idx, cell in enumerate(row[:HOPYO_MAX_COLS]):
+                if cell is None or '호표' not in str(cell):
+                    continue
+                cell_str = str(cell)
+                file_type = classify_hopyo(cell_str, col_idx)
+                if file_type:
+                    result['type'] = file_type
+                    result['evidence'].append({
+                        'kind': 'hopyo', 'row': row_idx, 'col': col_idx,
+                        'text': cell_str[:50], 'type': file_type
+                    })
+                    break
+
+        # 호표와 헤더가 모두 확인되면 (또는 헤더 범위를 지나면) 중단
+        if result['type'] and (header_row is not None or row_idx + 1 >= HEADER_MAX_ROWS):
+            result['stopped_early'] = row_idx + 1 < max_rows
+            break
+    rows.close()
+
+    if result['type']:
+        confidence = 0.6
+        if header_row is not None:
+            confidence += 0.25
+            if EXPECTED_HEADER[result['type']] in header_keywords:
+                confidence += 0.15
+        result['confidence'] = round(confidence, 2)
+    return result
@@ -0,0 +1,173 @@
+"""
+헤더 행 / 컬럼 역할(품명, 규격, 단위, 수량) 벡터화 감지
+헤더 탐색 구간을 공백 제거한 문자열 배열로 한 번 만들고, 키워드마다 np.char.find 한 번으로
+(행, 열, 역할) 점수 행렬을 채운 뒤 가장 점수가 높은 헤더 행과 컬럼 매핑을 고름
+'품 명'처럼 띄어 쓴 헤더와 두 행에 나뉜 헤더(위: '품', 아래: '명' / 역할이 두 행에 나뉨)도 처리
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from workbook_reader import SheetGrid
+
+# 감지 규칙(키워드, 점수)이 바뀌면 올려서 저장된 레이아웃 프로파일 무효화 (layout_profiles)
+DETECTOR_VERSION = 1
+
+ROLES = ('품명', '규격', '단위', '수량')
+
+# 역할별 키워드 (공백 제거, 대문자 기준)
+ROLE_KEYWORDS = {
+    '품명': ('품명', '자재명', '명칭', '공종', '품목'),
+    '규격': ('규격', '사양', 'SPEC'),
+    '단위': ('단위', 'UNIT'),
+    '수량': ('수량', '물량', 'QTY')
+}
+# 약한 키워드 (한 글자, 다른 헤더에도 들어갈 수 있음)
+WEAK_KEYWORDS = {
+    '품명': ('품',),
+    '규격': ('규', '격'),
+    '단위': ('단',),
+    '수량': ('량',)
+}
+
+# 점수: 셀 전체가 키워드 3, 키워드 포함 2, 약한 키워드 포함 1
+EXACT_SCORE = 3
+KEYWORD_SCORE = 2
+WEAK_SCORE = 1
+
+# 헤더로 인정할 최소 역할 수 (키워드 포함 이상)
+MIN_HEADER_ROLES = 2
+
+# 데이터 패턴 추정용 단위 값
+UNIT_VALUES = ['인', '%', 'M3', 'M2', 'M', 'KG', 'TON', '개', '대', 'HR', '조', 'm3', 'L', '식']
+
+
+def text_block(df, start_row: int, end_row: int, max_cols: int) -> pd.DataFrame:
+    """구간의 셀 -> 앞뒤 공백 제거한 문자열 DataFrame (빈 셀은 NaN, SheetGrid는 정규화 그리드 그대로)"""
+    if isinstance(df, SheetGrid):
+        return pd.DataFrame(df.text[start_row:end_row, :max_cols], dtype=object)
+    block = df.iloc[start_row:end_row, :max_cols].to_numpy(dtype=object)
+    frame = pd.DataFrame(block, dtype=object)
+    return frame.where(frame.isna(), frame.astype(str).apply(lambda col: col.str.strip()))
+
+
+def _content_width(df, start_row: int, end_row: int) -> int:
+    """구간에서 내용이 있는 열 폭 (SheetGrid는 밀도 프로파일, DataFrame은 전체 열)"""
+    if isinstance(df, SheetGrid):
+        return df.density.width(start_row, end_row)
+    return len(df.columns)
+
+
+def _score_grid(grid: np.ndarray) -> np.ndarray:
+    """문자열 배열 (행 x 열) -> 점수 배열 (행 x 열 x 역할)"""
+    scores = np.zeros(grid.shape + (len(ROLES),), dtype=np.int8)
+    for r, role in enumerate(ROLES):
+        role_scores = scores[..., r]
+        for keyword in WEAK_KEYWORDS[role]:
+            np.maximum(role_scores, np.where(np.char.find(grid, keyword) >= 0, WEAK_SCORE, 0),
+                       out=role_scores)
+        for keyword in ROLE_KEYWORDS[role]:
+            hit = np.char.find(grid, keyword) >= 0
+            np.maximum(role_scores, np.where(hit, np.where(grid == keyword, EXACT_SCORE, KEYWORD_SCORE), 0),
+                       out=role_scores)
+    return scores
+
+
+def detect_header(df, start_row: int = 0, end_row: int = 30, max_cols: Optional[int] = None) -> Dict:
+    """헤더 행과 컬럼 역할 감지 (max_cols None = 구간에서 내용이 있는 열까지, 밀도 프로파일 기준)
+
+    각 행을 (그 행, 다음 행, 두 행을 이어 붙인 텍스트) 묶음으로 보고 역할별 최고 점수의 합이 가장 큰 행 선택
+    (합이 같으면 그 행 단독 점수가 큰 행, 그래도 같으면 앞 행)
+    반환: {'header_row', 'header_rows', 'columns': {역할: 컬럼 또는 None},
+          'scores': {역할: 점수}, 'row_scores': {행: 점수}}
+    """
+    result = {
+        'header_row': None,
+        'header_rows': [],
+        'columns': {role: None for role in ROLES},
+        'scores': {role: 0 for role in ROLES},
+        'row_scores': {}
+    }
+    end_row = min(end_row, len(df))
+    if start_row >= end_row:
+        return result
+
+    if max_cols is None:
+        max_cols = _content_width(df, start_row, end_row)
+    text = text_block(df, start_row, end_row, max_cols)
+    if text.empty:
+        return result
+    grid = text.fillna('').replace(r'\s+', '', regex=True).to_numpy().astype(str)
+    grid = np.char.upper(grid)
+
+    single = _score_grid(grid)
+    band = single.copy()
+    if len(grid) > 1:
+        # 두 행 헤더: 아래 행의 키워드와 위/아래를 이어 붙인 텍스트의 키워드를 위 행에 합산
+        np.maximum(band[:-1], single[1:], out=band[:-1])
+        np.maximum(band[:-1], _score_grid(np.char.add(grid[:-1], grid[1:])), out=band[:-1])
+
+    band_best = band.max(axis=1)            # (행, 역할)
+    band_total = band_best.sum(axis=1)
+    single_total = single.max(axis=1).sum(axis=1)
+    result['row_scores'] = {start_row + i: int(total) for i, total in enumerate(band_total)
+                            if total > 0}
+
+    order = np.lexsort((np.arange(len(grid)), -single_total, -band_total))
+    best = int(order[0])
+    if (band_best[best] >= KEYWORD_SCORE).sum() < MIN_HEADER_ROLES:
+        return result
+
+    # 점수가 높은 (역할, 컬럼)부터 배정 (한 컬럼은 한 역할에만)
+    candidates = [(int(band[best, col, r]), -col, r)
+                  for col in range(band.shape[1]) for r in range(len(ROLES)) if band[best, col, r] > 0]
+    used_cols = set()
+    header_rows = {start_row + best}
+    for score, neg_col, r in sorted(candidates, reverse=True):
+        role, col = ROLES[r], -neg_col
+        if result['columns'][role] is not None or col in used_cols:
+            continue
+        result['columns'][role] = col
+        result['scores'][role] = score
+        used_cols.add(col)
+        if single[best, col, r] < score:
+            header_rows.add(start_row + best + 1)
+
+    result['header_row'] = start_row + best
+    result['header_rows'] = sorted(header_rows)
+    return result
+
+
+def infer_columns_from_data(df, start_row: int, column_info: Optional[Dict] = None,
+                            max_cols: Optional[int] = None) -> Dict:
+    """헤더가 없을 때 데이터 패턴으로 컬럼 추정 (헤더 아래 5~15행 표본)
+
+    한글로 시작하는 값이 있는 첫 컬럼 = 품명, 단위 값이 있는 컬럼 = 단위, 1000 미만 숫자만 있는 첫 컬럼 = 수량
+    """
+    column_info = dict(column_info or {role: None for role in ROLES})
+    end_row = min(start_row + 15, len(df))
+    if max_cols is None:
+        max_cols = _content_width(df, start_row + 5, end_row)
+    sample = text_block(df, start_row + 5, end_row, max_cols)
+    if sample.empty:
+        return column_info
+
+    present = sample.notna()
+    values = sample.fillna('')
+    hangul = (values.apply(lambda col: col.str.match(r'^[가-힣]+')) & present).any()
+    unit = values.isin(UNIT_VALUES).any()
+    numeric = values.apply(lambda col: col.str.fullmatch(r'\d+\.?\d*')) & present
+    numbers = values.where(numeric).apply(pd.to_numeric)
+    small_numbers = numeric.any() & (numbers.where(numeric) < 1000).eq(numeric).all()
+
+    for col_idx in sample.columns:
+        if not present[col_idx].any():
+            continue
+        if column_info['품명'] is None and hangul[col_idx]:
+            column_info['품명'] = col_idx
+        elif unit[col_idx]:
+            column_info['단위'] = col_idx
+        elif column_info['수량'] is None and small_numbers[col_idx]:
+            column_info['수량'] = col_idx
+    return column_info
@@ -0,0 +1,117 @@
+"""
+호표 헤더 문법 (모든 파서 공용)
+제N호표, #N, No.N, 산근 N 호표 :, (산근 N), (호표 N), M-101, N. 형식을 이름 붙은 대안 하나의
+정규식으로 컴파일하여 셀마다 한 번만 매칭 (패턴 수 x 셀 수 -> 셀 수)
+어느 형식인지, 번호, 작업명, 뒤따르는 규격/단위(#N 작업명 | 규격 | 단위)를 함께 반환
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+# 형식 이름 -> 정규식 (각 대안은 {style}_num, {style}_body 그룹을 가짐)
+# 순서 = 우선순위 (한 셀이 여러 형식에 맞으면 앞의 형식)
+_ALTERNATIVES = (
+    ('sanggun', r'산근\s*(?P<sanggun_num>\d+)\s*호표\s*[：:](?P<sanggun_body>.+)'),    # 산근 1 호표 : 작업명
+    ('je', r'제\s*(?P<je_num>\d+)\s*호표(?P<je_body>.*)'),                            # 제1호표 (：작업명)
+    ('hash', r'\#(?P<hash_num>\d+)\s+(?P<hash_body>.+)'),                             # #1 작업명 | 규격 | 단위
+    ('no', r'No\.(?P<no_num>\d+)\s+(?P<no_body>.+)'),                                 # No.1 작업명
+    ('paren', r'(?P<paren_body>.*?)\(\s*산근\s*(?P<paren_num>\d+)\s*\)'),             # 작업명 (산근 1)
+    ('paren_hopyo', r'(?P<paren_hopyo_body>.*?)\(\s*호표\s*(?P<paren_hopyo_num>\d+)\s*\)'),  # 작업명 ( 호표 1 )
+    ('code', r'(?P<code_num>[A-Z]-\d+)(?P<code_body>.*)'),                            # M-101 작업명
+    ('dot', r'(?P<dot_num>\d+)\.\s*(?P<dot_body>.+)'),                                # 1. 작업명
+)
+
+STYLES = tuple(style for style, _ in _ALTERNATIVES)
+
+# #N 작업명 | 규격 | 단위
+_TRAILING_SPEC_UNIT = re.compile(r'(.+?)(?:\s*\|\s*([^|]+)\s*\|\s*([^|]+))?$')
+_COLON_TITLE = re.compile(r'[：:]([^：:]*)')
+
+
+class HopyoMatch(NamedTuple):
+    """호표 매칭 결과
+
+    num: 호표 번호 (code 형식은 'M-101' 전체)
+    body: 번호 뒤의 원문 (기존 정규식의 작업명 그룹과 동일)
+    title/spec/unit: body에서 분리한 작업명, 규격, 단위 (없으면 '')
+    """
+    style: str
+    num: str
+    title: str
+    spec: str
+    unit: str
+    body: str
+
+
+@lru_cache(maxsize=None)
+def hopyo_regex(styles: Optional[Sequence[str]] = None) -> re.Pattern:
+    """지정한 형식만 대안으로 가진 컴파일된 문법 (None = 전체, 형식 조합별로 한 번만 컴파일)"""
+    selected = STYLES if styles is None else tuple(styles)
+    unknown = set(selected) - set(STYLES)
+    if unknown:
+        raise ValueError(f"알 수 없는 호표 형식: {sorted(unknown)}")
+    return re.compile('|'.join(f'(?P<{style}>{pattern})' for style, pattern in _ALTERNATIVES
+                               if style in selected))
+
+
+HOPYO_GRAMMAR = hopyo_regex()
+
+
+def _split_body(style: str, body: str):
+    """형식별로 body에서 (작업명, 규격, 단위) 분리"""
+    if style == 'hash':
+        match = _TRAILING_SPEC_UNIT.match(body.strip())
+        if match:
+            return (match.group(1).strip(), (match.group(2) or '').strip(),
+                    (match.group(3) or '').strip())
+        return body.strip(), '', ''
+    if style == 'je':
+        # 같은 셀의 콜론 뒤 작업명 (제1호표：작업명)
+        match = _COLON_TITLE.search(body)
+        return (match.group(1).strip() if match else ''), '', ''
+    return body.strip(), '', ''
+
+
+def _to_match(match: re.Match) -> HopyoMatch:
+    style = match.lastgroup
+    body = match.group(f'{style}_body') or ''
+    title, spec, unit = _split_body(style, body)
+    return HopyoMatch(style, match.group(f'{style}_num'), title, spec, unit, body)
+
+
+def match_hopyo(text: str, styles: Optional[Sequence[str]] = None,
+                search: bool = False) -> Optional[HopyoMatch]:
+    """셀 텍스트를 문법으로 한 번 매칭 (search=False면 셀 앞부분부터, True면 셀 어디서나)"""
+    regex = hopyo_regex(None if styles is None else tuple(styles))
+    match = regex.search(text) if search else regex.match(text)
+    return _to_match(match) if match else None
+
+
+def extract_hopyo(cells: pd.Series, styles: Optional[Sequence[str]] = None,
+                  search: bool = False) -> pd.DataFrame:
+    """문자열 Series 전체를 문법으로 한 번에 매칭 (벡터화)
+
+    반환: cells와 같은 인덱스의 DataFrame (style, num, title, spec, unit, body), 매칭 안 된 행은 style이 NaN
+    """
+    selected = STYLES if styles is None else tuple(styles)
+    regex = hopyo_regex(selected)
+    pattern = regex.pattern if search else f'^(?:{regex.pattern})'
+    extracted = cells.str.extract(pattern, expand=True)
+
+    result = pd.DataFrame(index=cells.index, columns=['style', 'num', 'title', 'spec', 'unit', 'body'],
+                          dtype=object)
+    for style in selected:
+        hit = extracted[f'{style}_num'].notna() & result['style'].isna()
+        if not hit.any():
+            continue
+        result.loc[hit, 'style'] = style
+        result.loc[hit, 'num'] = extracted.loc[hit, f'{style}_num']
+        bodies = extracted.loc[hit, f'{style}_body'].fillna('')
+        result.loc[hit, 'body'] = bodies
+        parts = [_split_body(style, body) for body in bodies]
+        result.loc[hit, 'title'] = [p[0] for p in parts]
+        result.loc[hit, 'spec'] = [p[1] for p in parts]
+        result.loc[hit, 'unit'] = [p[2] for p in parts]
+    return result
@@ -0,0 +1,43 @@
+"""
+호표 헤더 벡터화 탐색
+앞쪽 열들을 한 번에 쌓아 호표 문법(hopyo_grammar) 매칭을 pandas 문자열 연산 한 번으로 수행
+(셀마다 iloc / notna / str / re.match를 호출하던 중첩 루프 대체, 셀 문자열은 SheetGrid.text 정규화 그리드)
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from hopyo_grammar import extract_hopyo
+from workbook_reader import SheetGrid
+
+# 탐색 결과: 행, 열, 형식, 호표 번호, 작업명 (같은 셀에 없으면 '')
+HIT_DTYPE = np.dtype([('row', np.int64), ('col', np.int64), ('style', object),
+                      ('num', object), ('title', object)])
+
+
+def scan_hopyo_cells(df: SheetGrid, styles: Optional[Sequence[str]] = None, max_cols: int = 5,
+                     anchored: bool = True) -> np.ndarray:
+    """앞쪽 max_cols열에서 호표 문법에 맞는 셀 찾기
+
+    styles: 허용할 호표 형식 (None = 전체, hopyo_grammar.STYLES 참고)
+    max_cols: 호표 번호가 오는 앞쪽 열 상한 (뒤쪽 비고 열의 '제2호표 참조' 같은 참조는 호표가 아님)
+    anchored=True면 셀 앞부분부터 일치(re.match), False면 셀 어디서나(re.search)
+    반환: HIT_DTYPE 구조 배열 (행 -> 열 순서)
+    """
+    block = df.text[:, :max_cols]
+    rows, cols = np.nonzero(pd.notna(block))
+    if not len(rows):
+        return np.empty(0, dtype=HIT_DTYPE)
+
+    # 값이 있는 셀만 1차원으로 쌓아 문법 매칭을 한 번에 수행
+    cells = pd.Series(block[rows, cols], dtype=object)
+    extracted = extract_hopyo(cells, styles, search=not anchored)
+    matched = extracted['style'].notna().to_numpy()
+
+    hits = np.empty(int(matched.sum()), dtype=HIT_DTYPE)
+    hits['row'] = rows[matched]
+    hits['col'] = cols[matched]
+    for field in ('style', 'num', 'title'):
+        hits[field] = extracted[field].to_numpy()[matched]
+    return hits
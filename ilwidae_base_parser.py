@@ -10,6 +10,12 @@ import sys
 import io
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple
+from block_index import BlockIndex
+from header_detector import detect_header
+from layout_profiles import get_store, layout_fingerprint
+from numeric_fields import NUMERIC_FIELDS, json_default, typed_value
+from records import Hopyo, IlwidaeTitle, RawRow, SangulItem
+from string_table import get_table
 
 # UTF-8 인코딩 설정
 try:
@@ -20,53 +26,35 @@ except:
 class IlwidaeBaseParser(ABC):
     """일위대가 파서 베이스 클래스"""
     
+    # 헤더 감지/raw 데이터는 앞 20개 컬럼, 비고는 수량 다음 컬럼까지만 사용
+    SCAN_COLUMNS = range(21)
+    
+    # 레이아웃 프로파일 구분 (헤더 감지 구간별)
+    PROFILE_SCOPE = 'ilwidae_base'
+    
     def __init__(self, file_path: str, sheet_name: str):
         self.file_path = file_path
         self.sheet_name = sheet_name
         self.column_map = {}
+        self.header_detection = None
         self.df = None
         self.list_info = None
         
     def detect_columns(self, df: pd.DataFrame, start_row: int = 0, end_row: int = 30) -> Dict[str, int]:
-        """품명, 규격, 단위, 수량 컬럼 자동 감지"""
-        column_patterns = {
-            "품명": ["품명", "품 명", "자재명", "명칭", "공종", "품목"],
-            "규격": ["규격", "규 격", "사양", "규", "SPEC"],
-            "단위": ["단위", "단 위", "UNIT", "단"],
-            "수량": ["수량", "수 량", "물량", "QTY", "량"]
-        }
-        
-        column_map = {
-            "품명": None,
-            "규격": None,
-            "단위": None,
-            "수량": None
-        }
-        
-        # 헤더 후보 행들 검사
-        for row_idx in range(start_row, min(end_row, len(df))):
-            row_data = []
-            for col_idx in range(min(20, len(df.columns))):
-                cell = df.iloc[row_idx, col_idx]
-                if pd.notna(cell):
-                    row_data.append(str(cell).strip())
-                else:
-                    row_data.append("")
-            
-            # 각 컬럼 패턴 매칭
-            for col_name, patterns in column_patterns.items():
-                if column_map[col_name] is None:  # 아직 찾지 못한 컬럼만
-                    for col_idx, cell_value in enumerate(row_data):
-                        for pattern in patterns:
-                            if pattern in cell_value:
-                                column_map[col_name] = col_idx
-                                break
-                        if column_map[col_name] is not None:
-                            break
-            
-            # 모든 컬럼을 찾았으면 종료
-            if all(v is not None for v in column_map.values()):
-                break
+        """품명, 규격, 단위, 수량 컬럼 자동 감지 (헤더 구간 점수 행렬로 헤더 행과 컬럼을 함께 선택)"""
+        # 같은 양식(레이아웃 지문)의 같은 구간 감지 결과가 있으면 재사용
+        store = get_store()
+        fingerprint = layout_fingerprint(df, self.sheet_name)
+        scope = f"{self.PROFILE_SCOPE}:{start_row}-{end_row}"
+        profile = store.get(fingerprint, scope)
+        if profile is not None:
+            column_map = dict(profile['columns'])
+        else:
+            detection = detect_header(df, start_row, end_row)
+            self.header_detection = detection
+            column_map = dict(detection['columns'])
+            store.learn(fingerprint, self.sheet_name, detection['header_row'], column_map,
+                        source=self.file_path, scope=scope)
         
         # 기본값 설정 (찾지 못한 컬럼)
         if column_map["품명"] is None:
@@ -81,70 +69,65 @@ class IlwidaeBaseParser(ABC):
         self.column_map = column_map
         return column_map
     
-    def parse_ilwidae_title(self, row_idx: int, df: pd.DataFrame) -> Dict:
+    def parse_ilwidae_title(self, row_idx: int, df: pd.DataFrame) -> IlwidaeTitle:
         """일위대가 타이틀 파싱 (4개 컬럼)"""
-        title_data = {
-            "품명": "",
-            "규격": "",
-            "단위": "",
-            "수량": ""
-        }
+        title_data = IlwidaeTitle()
+        
+        text = df.text
         
         # 호표 행에서 작업명 추출
         if self.column_map["품명"] is not None:
-            cell = df.iloc[row_idx, self.column_map["품명"]]
-            if pd.notna(cell):
+            cell = text[row_idx, self.column_map["품명"]]
+            if cell is not None:
                 # 호표 패턴 제거하고 작업명만 추출
-                work_name = re.sub(r'^(#\d+|No\.\d+|제\d+호표)\s*', '', str(cell).strip())
-                title_data["품명"] = work_name
+                work_name = re.sub(r'^(#\d+|No\.\d+|제\d+호표)\s*', '', cell)
+                title_data.품명 = work_name
         
         # 규격, 단위, 수량 찾기 (같은 행 또는 다음 행에서)
         for col_name in ["규격", "단위", "수량"]:
             if self.column_map[col_name] is not None:
                 # 같은 행에서 찾기
-                cell = df.iloc[row_idx, self.column_map[col_name]]
-                if pd.notna(cell) and str(cell).strip():
-                    title_data[col_name] = str(cell).strip()
+                cell = text[row_idx, self.column_map[col_name]]
+                if cell:
+                    setattr(title_data, col_name, self._field_value(df, row_idx, col_name, cell))
                 # 다음 행에서 찾기
                 elif row_idx + 1 < len(df):
-                    cell = df.iloc[row_idx + 1, self.column_map[col_name]]
-                    if pd.notna(cell) and str(cell).strip():
-                        title_data[col_name] = str(cell).strip()
+                    cell = text[row_idx + 1, self.column_map[col_name]]
+                    if cell:
+                        setattr(title_data, col_name, self._field_value(df, row_idx + 1, col_name, cell))
         
         return title_data
     
-    def parse_sangul_items(self, df: pd.DataFrame, start_row: int, end_row: int) -> List[Dict]:
+    def _field_value(self, df, row_idx: int, col_name: str, text: str):
+        """필드 값 (수량은 숫자 셀이면 숫자, 나머지는 정규화 문자열)"""
+        if col_name in NUMERIC_FIELDS:
+            return typed_value(df.iloc[row_idx, self.column_map[col_name]], text)
+        return text
+    
+    def parse_sangul_items(self, df: pd.DataFrame, start_row: int, end_row: int) -> List[SangulItem]:
         """산출근거 항목들 파싱 (4개 컬럼)"""
         items = []
+        text = df.text
         
         for row_idx in range(start_row + 1, end_row):  # 타이틀 다음 행부터
-            item_data = {
-                "row_number": row_idx,
-                "품명": "",
-                "규격": "",
-                "단위": "",
-                "수량": "",
-                "비고": None
-            }
+            item_data = SangulItem(row_idx, 비고=None)
             
             # 각 컬럼 데이터 추출
             has_content = False
             for col_name in ["품명", "규격", "단위", "수량"]:
                 if self.column_map[col_name] is not None:
-                    cell = df.iloc[row_idx, self.column_map[col_name]]
-                    if pd.notna(cell):
-                        value = str(cell).strip()
-                        if value:
-                            item_data[col_name] = value
-                            has_content = True
+                    value = text[row_idx, self.column_map[col_name]]
+                    if value:
+                        setattr(item_data, col_name, self._field_value(df, row_idx, col_name, value))
+                        has_content = True
             
             # 비고 컬럼 확인 (수량 다음 컬럼)
             if self.column_map["수량"] is not None:
                 remark_col = self.column_map["수량"] + 1
                 if remark_col < len(df.columns):
-                    cell = df.iloc[row_idx, remark_col]
-                    if pd.notna(cell) and str(cell).strip():
-                        item_data["비고"] = str(cell).strip()
+                    value = text[row_idx, remark_col]
+                    if value:
+                        item_data.비고 = value
             
             # 내용이 있는 행만 추가
             if has_content:
@@ -152,27 +135,17 @@ class IlwidaeBaseParser(ABC):
         
         return items
     
-    def extract_raw_data(self, df: pd.DataFrame, start_row: int, end_row: int) -> List[Dict]:
+    def extract_raw_data(self, df: pd.DataFrame, start_row: int, end_row: int) -> List[RawRow]:
         """기존 형식 호환을 위한 raw 데이터 추출"""
         raw_data = []
+        width = df.density.width(start_row, end_row)
+        text = df.text
         
         for row_idx in range(start_row, end_row):
-            row_data = {
-                'row_number': row_idx,
-                'columns': {},
-                'has_content': False
-            }
-            
-            # 모든 컬럼 데이터 수집
-            for col_idx in range(min(20, len(df.columns))):
-                cell = df.iloc[row_idx, col_idx]
-                if pd.notna(cell):
-                    content = str(cell).strip()
-                    if content:
-                        row_data['columns'][f'col_{col_idx}'] = content
-                        row_data['has_content'] = True
-            
-            raw_data.append(row_data)
+            # 모든 컬럼 데이터 수집 (블록 구간에서 내용이 있는 열까지, 정규화 그리드, 값이 있는 셀만)
+            cells = [(col_idx, content) for col_idx, content in enumerate(text[row_idx, :width].tolist())
+                     if content]
+            raw_data.append(RawRow(row_idx, cells))
         
         return raw_data
     
@@ -182,7 +155,7 @@ class IlwidaeBaseParser(ABC):
         pass
     
     @abstractmethod
-    def find_ilwidae_hopos(self) -> List[Dict]:
+    def find_ilwidae_hopos(self) -> List[Hopyo]:
         """일위대가 호표 찾기 (파서별 구현 필요)"""
         pass
     
@@ -226,13 +199,14 @@ class IlwidaeBaseParser(ABC):
         }
         
         # 각 일위대가 데이터 구성
-        for idx, hopyo in enumerate(hopyo_list):
-            # 범위 설정
-            start_row = hopyo['row']
-            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else len(self.df)
+        blocks = BlockIndex((hopyo.row for hopyo in hopyo_list), sheet_end=self.df.last_row + 1)
+        for hopyo in hopyo_list:
+            # 범위 설정 (다음 호표 시작 행까지)
+            start_row = hopyo.row
+            end_row = blocks.end_of(start_row)
             
             # 타이틀 파싱
-            title_data = self.parse_ilwidae_title(hopyo['row'], self.df)
+            title_data = self.parse_ilwidae_title(hopyo.row, self.df)
             
             # 산출근거 파싱
             sangul_items = self.parse_sangul_items(self.df, start_row, end_row)
@@ -241,7 +215,7 @@ class IlwidaeBaseParser(ABC):
             raw_data = self.extract_raw_data(self.df, start_row, end_row)
             
             ilwidae_item = {
-                'ilwidae_no': hopyo['num'],
+                'ilwidae_no': hopyo.num,
                 'ilwidae_title': title_data,
                 'position': {
                     'start_row': start_row,
@@ -254,7 +228,7 @@ class IlwidaeBaseParser(ABC):
             
             result['ilwidae_data'].append(ilwidae_item)
             
-            print(f"\n일위대가 {hopyo['num']}: {title_data['품명']}")
+            print(f"\n일위대가 {hopyo.num}: {title_data.품명}")
             print(f"  - 위치: 행 {start_row} ~ {end_row-1}")
             print(f"  - 산출근거 항목: {len(sangul_items)}개")
         
@@ -262,6 +236,7 @@ class IlwidaeBaseParser(ABC):
     
     def save_to_json(self, output_file: str = None):
         """JSON 파일로 저장"""
+        get_table().reset_stats()
         result = self.to_unified_json()
         if result is None:
             return None
@@ -277,7 +252,8 @@ class IlwidaeBaseParser(ABC):
             output_file = f"result/{base_name}_{sheet_name}_unified.json"
         
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+            json.dump(result, f, ensure_ascii=False, indent=2, default=json_default)
         
         print(f"\n✅ 통합 구조로 저장 완료: {output_file}")
+        get_table().print_stats()
         return output_file
\ No newline at end of file
@@ -8,6 +8,11 @@ import re
 import sys
 import io
 import os
+from block_index import BlockIndex
+from hopyo_grammar import match_hopyo
+from list_reconciler import ListReconciler
+from row_types import BLANK, SEPARATOR, classify_rows, count_row_types
+from workbook_reader import get_session, close_sessions
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -18,19 +23,19 @@ class IntegratedSangculParser:
         self.file_name = os.path.basename(file_path)
         self.list_info = []
         self.sangcul_data = []
+    
+    @property
+    def session(self):
+        """공유 워크북 세션 (목록/산출근거 시트를 한 번씩만 디코딩)"""
+        return get_session(self.file_path)
         
     def find_list_sheet(self):
         """단가산출 목록 시트 찾기"""
         try:
-            if self.file_path.endswith('.xls'):
-                xls = pd.ExcelFile(self.file_path, engine='xlrd')
-            else:
-                xls = pd.ExcelFile(self.file_path)
-            
             list_sheets = []
             sangcul_sheets = []
             
-            for sheet in xls.sheet_names:
+            for sheet in self.session.sheet_names:
                 if '단가산출' in sheet:
                     if '목록' in sheet or '총괄' in sheet:
                         list_sheets.append(sheet)
@@ -55,10 +60,7 @@ class IntegratedSangculParser:
     def read_list_info(self, list_sheet):
         """목록 정보 읽기"""
         try:
-            if self.file_path.endswith('.xls'):
-                df = pd.read_excel(self.file_path, sheet_name=list_sheet, header=None, engine='xlrd')
-            else:
-                df = pd.read_excel(self.file_path, sheet_name=list_sheet, header=None)
+            df = self.session.get_sheet(list_sheet)
             
             items = []
             
@@ -68,9 +70,9 @@ class IntegratedSangculParser:
                 for i in range(len(df)):
                     cell = df.iloc[i, 0] if 0 < len(df.columns) else None
                     if pd.notna(cell):
-                        match = re.match(r'제(\d+)호표', str(cell))
+                        match = match_hopyo(str(cell), ('je',))
                         if match:
-                            num = match.group(1)
+                            num = match.num
                             work = df.iloc[i, 1] if 1 < len(df.columns) else ''
                             spec = df.iloc[i, 2] if 2 < len(df.columns) else ''
                             unit = df.iloc[i, 3] if 3 < len(df.columns) else ''
@@ -138,10 +140,10 @@ class IntegratedSangculParser:
                         cell = df.iloc[i, j]
                         if pd.notna(cell):
                             cell_str = str(cell).strip()
-                            match = re.match(r'^#(\d+)\s+(.+)', cell_str)
+                            match = match_hopyo(cell_str, ('hash',))
                             if match:
-                                num = match.group(1)
-                                work = match.group(2)
+                                num = match.num
+                                work = match.body
                                 spec = df.iloc[i, j+1] if j+1 < len(df.columns) else ''
                                 unit = df.iloc[i, j+2] if j+2 < len(df.columns) else ''
                                 
@@ -163,10 +165,7 @@ class IntegratedSangculParser:
     def parse_sangcul_data(self, sangcul_sheet):
         """산출근거 데이터 파싱"""
         try:
-            if self.file_path.endswith('.xls'):
-                df = pd.read_excel(self.file_path, sheet_name=sangcul_sheet, header=None, engine='xlrd')
-            else:
-                df = pd.read_excel(self.file_path, sheet_name=sangcul_sheet, header=None)
+            df = self.session.get_sheet(sangcul_sheet)
             
             # 헤더 찾기
             header_row = None
@@ -186,51 +185,42 @@ class IntegratedSangculParser:
                 if header_row is not None:
                     break
             
-            # 파일별 패턴 정의
-            patterns = []
+            # 파일별 호표 형식 (hopyo_grammar 형식 이름)
+            styles, search = (), False
             if 'test1' in self.file_name or 'est' in self.file_name:
-                patterns.append((r'^(\d+)\.\s*(.+)', 'dot_style'))
+                styles = ('dot',)
                 sangcul_col = 1 if 'est' in self.file_name else 0
             elif 'sgs' in self.file_name:
-                patterns.append((r'산근\s*(\d+)\s*호표\s*[：:](.+)', 'sanggun_style'))
+                styles, search = ('sanggun',), True
             elif 'ebs' in self.file_name:
-                patterns.append((r'^#(\d+)\s+(.+)', 'hash_style'))
+                styles = ('hash',)
             elif '건축구조' in self.file_name:
-                patterns.append((r'\(\s*산근\s*(\d+)\s*\)', 'paren_style'))
+                styles = ('paren',)
             
             # 호표 찾기
             hopyo_list = []
             for i in range(header_row + 1 if header_row else 0, len(df)):
+                if not styles:
+                    break
                 for j in range(len(df.columns)):
                     cell = df.iloc[i, j]
                     if pd.notna(cell):
                         cell_str = str(cell).strip()
                         
-                        for pattern, style in patterns:
-                            match = re.search(pattern, cell_str)
-                            if match:
-                                hopyo_num = match.group(1)
-                                
-                                # 작업명 추출
-                                if style == 'paren_style':
-                                    work_name = cell_str[:match.start()].strip()
-                                elif len(match.groups()) > 1:
-                                    work_name = match.group(2).strip()
-                                else:
-                                    work_name = ''
-                                
-                                hopyo_list.append({
-                                    'row': i,
-                                    'num': hopyo_num,
-                                    'work': work_name,
-                                    'style': style,
-                                    'full_text': cell_str,
-                                    'sangcul_col': sangcul_col,
-                                    'bigo_col': bigo_col
-                                })
-                                break
-                        
-                        if hopyo_list and hopyo_list[-1]['row'] == i:
+                        match = match_hopyo(cell_str, styles, search=search)
+                        if match:
+                            # 작업명 (#N은 뒤따르는 '| 규격 | 단위'까지 원문 유지)
+                            work_name = match.body.strip() if match.style == 'hash' else match.title
+                            
+                            hopyo_list.append({
+                                'row': i,
+                                'num': match.num,
+                                'work': work_name,
+                                'style': f"{match.style}_style",
+                                'full_text': cell_str,
+                                'sangcul_col': sangcul_col,
+                                'bigo_col': bigo_col
+                            })
                             break
             
             return hopyo_list
@@ -241,32 +231,31 @@ class IntegratedSangculParser:
             traceback.print_exc()
             return []
     
-    def extract_hopyo_content(self, df, hopyo, next_hopyo_row):
-        """호표 범위의 내용 추출"""
+    def extract_hopyo_content(self, df, hopyo, next_hopyo_row, row_types):
+        """호표 범위의 내용 추출 (row_types: 산출근거 컬럼 기준 행 유형 배열)"""
         content = []
         sangcul_col = hopyo['sangcul_col']
         bigo_col = hopyo['bigo_col']
         
         for i in range(hopyo['row'] + 1, next_hopyo_row):
-            # 산출근거 내용
-            cell = df.iloc[i, sangcul_col]
-            if pd.notna(cell):
-                cell_str = str(cell).strip()
-                if cell_str and not all(c in ['-', '=', ' '] for c in cell_str):
-                    item = {
-                        'row': i,
-                        'content': cell_str
-                    }
-                    
-                    # 비고 추가
-                    if bigo_col is not None and bigo_col < len(df.columns):
-                        bigo = df.iloc[i, bigo_col]
-                        if pd.notna(bigo):
-                            bigo_str = str(bigo).strip()
-                            if bigo_str and bigo_str != '0':
-                                item['bigo'] = bigo_str
-                    
-                    content.append(item)
+            # 산출근거 내용 (빈 행, 구분선 제외)
+            if row_types[i] in (BLANK, SEPARATOR):
+                continue
+            
+            item = {
+                'row': i,
+                'content': str(df.iloc[i, sangcul_col]).strip()
+            }
+            
+            # 비고 추가
+            if bigo_col is not None and bigo_col < len(df.columns):
+                bigo = df.iloc[i, bigo_col]
+                if pd.notna(bigo):
+                    bigo_str = str(bigo).strip()
+                    if bigo_str and bigo_str != '0':
+                        item['bigo'] = bigo_str
+            
+            content.append(item)
         
         return content
     
@@ -291,11 +280,8 @@ class IntegratedSangculParser:
         hopyo_data = self.parse_sangcul_data(sangcul_sheet)
         print(f"산출근거에서 {len(hopyo_data)}개 호표 발견")
         
-        # 전체 데이터 다시 읽기 (내용 추출용)
-        if self.file_path.endswith('.xls'):
-            df = pd.read_excel(self.file_path, sheet_name=sangcul_sheet, header=None, engine='xlrd')
-        else:
-            df = pd.read_excel(self.file_path, sheet_name=sangcul_sheet, header=None)
+        # 내용 추출용 데이터 (parse_sangcul_data에서 디코딩한 시트 재사용)
+        df = self.session.get_sheet(sangcul_sheet)
         
         # 결과 생성
         result = {
@@ -307,34 +293,38 @@ class IntegratedSangculParser:
             'data': []
         }
         
-        # 목록과 산출근거 매칭
-        for idx, hopyo in enumerate(hopyo_data):
+        # 행 유형 분류 (시트당 한 번, 산출근거 컬럼 기준)
+        sangcul_col = hopyo_data[0]['sangcul_col'] if hopyo_data else 0
+        row_types = classify_rows(df, sangcul_col, [sangcul_col], [h['row'] for h in hopyo_data])
+        print(f"행 분류: {count_row_types(row_types)}")
+        
+        # 목록과 산출근거 대사 (번호 / 정규화 작업명 / 유사 작업명 색인)
+        reconciliation = ListReconciler(self.list_info).reconcile(hopyo_data)
+        if self.list_info:
+            print(f"목록 대사: {reconciliation['counts']}")
+        
+        blocks = BlockIndex((h['row'] for h in hopyo_data), sheet_end=df.last_row + 1, row_types=row_types)
+        for hopyo, assignment in zip(hopyo_data, reconciliation['assignments']):
             # 다음 호표까지의 범위
-            next_row = hopyo_data[idx + 1]['row'] if idx + 1 < len(hopyo_data) else len(df)
+            next_row = blocks.end_of(hopyo['row'])
             
             # 내용 추출
-            content = self.extract_hopyo_content(df, hopyo, next_row)
+            content = self.extract_hopyo_content(df, hopyo, next_row, row_types)
             
-            # 목록에서 매칭되는 항목 찾기
-            matched_list = None
-            for list_item in self.list_info:
-                if list_item['num'] == hopyo['num']:
-                    matched_list = list_item
-                    break
-                # 작업명으로도 매칭 시도
-                elif (list_item['work'] in hopyo['work'] or 
-                      hopyo['work'] in list_item['work']):
-                    matched_list = list_item
-                    break
+            # 목록에서 매칭된 항목
+            list_index = assignment['list_index']
+            matched_list = self.list_info[list_index] if list_index is not None else None
             
             # 데이터 구성
             data_item = {
                 'hopyo_num': hopyo['num'],
                 'work_name': hopyo['work'],
                 'from_list': {
-                    'work': matched_list['work'] if matched_list else None,
-                    'spec': matched_list['spec'] if matched_list else None,
-                    'unit': matched_list['unit'] if matched_list else None,
+                    'work': matched_list['work'],
+                    'spec': matched_list['spec'],
+                    'unit': matched_list['unit'],
+                    'match': assignment['status'],
+                    'score': assignment['score']
                 } if matched_list else None,
                 'start_row': hopyo['row'],
                 'end_row': next_row,
@@ -350,7 +340,18 @@ class IntegratedSangculParser:
             result['validation'] = {
                 'matched': matched_count,
                 'unmatched': len(hopyo_data) - matched_count,
-                'match_rate': f"{matched_count/len(hopyo_data)*100:.1f}%" if hopyo_data else "0%"
+                'match_rate': f"{matched_count/len(hopyo_data)*100:.1f}%" if hopyo_data else "0%",
+                'report': reconciliation['counts'],
+                'missing': [
+                    {'num': self.list_info[pos]['num'], 'work': self.list_info[pos]['work'],
+                     'row': self.list_info[pos]['row']}
+                    for pos in reconciliation['missing']
+                ],
+                'extra': [
+                    {'num': hopyo_data[idx]['num'], 'work': hopyo_data[idx]['work'],
+                     'row': hopyo_data[idx]['row']}
+                    for idx in reconciliation['extra']
+                ]
             }
         
         return result
@@ -395,6 +396,8 @@ def main():
         else:
             print(f"\n파일 없음: {file_path}")
     
+    close_sessions()
+    
     # 전체 결과 저장
     output_file = 'integrated_sangcul_result.json'
     with open(output_file, 'w', encoding='utf-8') as f:
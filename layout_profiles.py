@@ -0,0 +1,155 @@
+"""
+시트 레이아웃 지문 / 프로파일 저장소
+같은 양식(템플릿)의 시트는 파일 이름이 달라도 헤더 행 구성이 같으므로
+시트 이름 + 헤더 셀(위치, 텍스트)로 지문을 만들고, 감지한 컬럼 매핑 / 호표 형식 / 헤더 행을 지문별로 저장
+이미 아는 지문이면 컬럼 감지를 건너뛰고, 처음 보는 지문이면 감지 결과를 자동으로 학습
+헤더 행은 지문의 첫 헤더 셀 행(top) 기준으로 저장하고 재사용할 때 현재 시트의 top을 더해 돌려줌
+저장 형식이나 감지 규칙(header_detector.DETECTOR_VERSION)이 바뀌면 키가 달라져 예전 프로파일은 버림
+"""
+import atexit
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+from header_detector import DETECTOR_VERSION, ROLE_KEYWORDS, text_block
+
+PROFILE_PATH = os.path.join('.parser_cache', 'layout_profiles.json')
+ENABLED = os.environ.get('LAYOUT_PROFILES', '1') != '0'
+
+# 프로파일 저장 형식 (2: 헤더 행을 top 기준 상대 위치로 저장)
+PROFILE_VERSION = 2
+VERSION_TAG = f"v{PROFILE_VERSION}.{DETECTOR_VERSION}"
+
+# 지문 구간 (앞쪽 20행 x 20열)
+FINGERPRINT_ROWS = 20
+FINGERPRINT_COLS = 20
+
+# 헤더 셀로 보는 어휘 (공백 제거 기준) - 데이터 값이 섞이지 않도록 짧은 셀만 사용
+HEADER_VOCABULARY = tuple(kw for keywords in ROLE_KEYWORDS.values() for kw in keywords) + (
+    '비고', '단가', '금액', '재료비', '노무비', '경비', '산출근거', '산출내역'
+)
+MAX_HEADER_CELL_LEN = 12
+
+
+class Fingerprint(NamedTuple):
+    """레이아웃 지문 (key: 해시, top: 이 시트에서 첫 헤더 셀 행)"""
+    key: str
+    top: int
+
+    def __str__(self) -> str:
+        return self.key
+
+
+def layout_fingerprint(df, sheet_name: str) -> Optional[Fingerprint]:
+    """시트 이름 + 헤더 셀 배치로 만든 지문 (헤더 셀이 없으면 None - 학습/재사용 안 함)
+
+    헤더 셀 행은 첫 헤더 셀 행 기준 상대 위치 (위쪽 제목 행 수가 달라도 같은 양식이면 같은 지문)
+    """
+    text = text_block(df, 0, min(FINGERPRINT_ROWS, len(df)), FINGERPRINT_COLS)
+    if text.empty:
+        return None
+    compact = text.fillna('').replace(r'\s+', '', regex=True)
+    cells = []
+    for col_idx in compact.columns:
+        for row_idx, value in compact[col_idx].items():
+            if value and len(value) <= MAX_HEADER_CELL_LEN and any(kw in value.upper() for kw in HEADER_VOCABULARY):
+                cells.append((row_idx, col_idx, value))
+    if not cells:
+        return None
+    top = min(row for row, _, _ in cells)
+    key = sheet_name + '\0' + ';'.join(f"{row - top},{col}:{value}" for row, col, value in sorted(cells))
+    return Fingerprint(hashlib.sha1(key.encode('utf-8')).hexdigest()[:16], int(top))
+
+
+class ProfileStore:
+    """지문 -> 레이아웃 프로파일 (JSON 파일 하나, 학습/재사용할 때마다 저장)
+
+    프로파일: {'sheet', 'header_row', 'columns', 'hopyo_styles', 'learned_from', 'learned_at', 'hits'}
+    (저장된 header_row는 지문 top 기준 상대 위치, get은 현재 시트 기준 절대 행으로 돌려줌)
+    scope: 감지 방식이 다른 파서끼리 프로파일을 섞지 않도록 구분 (키 = scope:버전:지문)
+    재사용 횟수(hits)는 읽을 때 저장하지 않고 표시만 해 두었다가 실행 끝에 한 번 저장 (flush)
+    """
+
+    def __init__(self, path: str = PROFILE_PATH):
+        self.path = path
+        self.profiles: Dict[str, Dict] = {}
+        self.dirty = False
+        if ENABLED:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    profiles = json.load(f)
+                # 다른 버전(저장 형식 / 감지 규칙)으로 학습한 프로파일은 버림
+                self.profiles = {key: profile for key, profile in profiles.items()
+                                 if profile.get('version') == VERSION_TAG}
+                self.dirty = len(self.profiles) != len(profiles)
+            except (OSError, ValueError, AttributeError):
+                self.profiles = {}
+
+    @staticmethod
+    def _key(fingerprint: Fingerprint, scope: str) -> str:
+        return f"{scope}:{VERSION_TAG}:{fingerprint.key}"
+
+    def get(self, fingerprint: Optional[Fingerprint], scope: str = 'default') -> Optional[Dict]:
+        """저장된 프로파일 (없으면 None, header_row는 현재 시트 기준 절대 행)"""
+        if not ENABLED or fingerprint is None:
+            return None
+        profile = self.profiles.get(self._key(fingerprint, scope))
+        if profile is None:
+            return None
+        profile['hits'] = profile.get('hits', 0) + 1
+        self.dirty = True
+        header_row = profile['header_row']
+        return dict(profile, header_row=header_row + fingerprint.top if header_row is not None else None)
+
+    def learn(self, fingerprint: Optional[Fingerprint], sheet: str, header_row: Optional[int],
+              columns: Dict, hopyo_styles=None, source: str = '',
+              scope: str = 'default') -> Optional[Dict]:
+        """감지 결과를 지문에 저장"""
+        if not ENABLED or fingerprint is None:
+            return None
+        profile = {
+            'version': VERSION_TAG,
+            'sheet': sheet,
+            'header_row': int(header_row) - fingerprint.top if header_row is not None else None,
+            'columns': {role: (int(col) if col is not None else None) for role, col in columns.items()},
+            'hopyo_styles': list(hopyo_styles) if hopyo_styles else None,
+            'learned_from': source,
+            'learned_at': datetime.now().isoformat(timespec='seconds'),
+            'hits': 0
+        }
+        self.profiles[self._key(fingerprint, scope)] = profile
+        self.save()
+        return profile
+
+    def flush(self):
+        """저장하지 않은 변경(재사용 횟수)이 있으면 저장"""
+        if self.dirty:
+            self.save()
+
+    def save(self):
+        """원자적 저장 (임시 파일 -> 교체)"""
+        if not ENABLED:
+            return
+        self.dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.profiles, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"레이아웃 프로파일 저장 실패: {e}")
+
+
+_store: Optional[ProfileStore] = None
+
+
+def get_store() -> ProfileStore:
+    """프로세스 공용 프로파일 저장소 (실행이 끝날 때 재사용 횟수를 한 번 저장)"""
+    global _store
+    if _store is None:
+        _store = ProfileStore()
+        atexit.register(_store.flush)
+    return _store
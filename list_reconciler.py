@@ -0,0 +1,190 @@
+"""
+목록 <-> 산출근거 호표 대사 (reconciliation)
+목록 항목을 호표 번호 dict와 정규화한 작업명 dict로 한 번 색인하여
+산출근거 호표마다 선형 탐색/부분 문자열 비교 없이 짝을 찾음 (비용 = 두 목록 길이의 합)
+번호도 작업명도 맞지 않으면 작업명 글자 bigram 역색인으로 유사 작업명 후보를 찾음
+
+매칭 결과 분류
+- matched: 번호와 작업명이 모두 일치
+- number_only: 번호만 일치 (작업명 다름)
+- title_only: 번호는 없거나 이미 사용됨, 작업명으로 일치
+- fuzzy: 유사 작업명으로 일치 (bigram Dice 유사도 >= FUZZY_MIN_SCORE)
+- missing: 목록에 있으나 산출근거에 없는 항목
+- extra: 산출근거에 있으나 목록에 없는 호표
+"""
+import re
+from collections import deque
+from typing import Container, Dict, Iterable, List, Optional, Tuple
+
+MATCHED = 'matched'
+NUMBER_ONLY = 'number_only'
+TITLE_ONLY = 'title_only'
+FUZZY = 'fuzzy'
+MISSING = 'missing'
+EXTRA = 'extra'
+
+# 유사 작업명으로 인정하는 최소 유사도
+FUZZY_MIN_SCORE = 0.7
+
+_SPACES = re.compile(r'\s+')
+# 작업명의 단위 표기 ' ㎡ 당' 등 (탄성포장 철거 ㎡ 당 -> 탄성포장 철거, 거푸집 설치 ㎡ 당 (합판) -> 거푸집 설치 (합판))
+# 정해진 단위만, 뒤에 글자가 이어지지 않는 '당'만 (할당, 1회당 등은 그대로)
+UNIT_WORDS = ('㎡', 'M', 'EA', '개소', '기', '본')
+_UNIT_PER = re.compile(r' (?:' + '|'.join(map(re.escape, UNIT_WORDS)) + r') 당(?![0-9A-Za-z가-힣])')
+
+
+def normalize_title(text) -> str:
+    """작업명 비교용 정규화 (공백 제거, 전각 콜론 통일)"""
+    if text is None:
+        return ''
+    return _SPACES.sub('', str(text)).replace('：', ':')
+
+
+def strip_unit_suffix(text: str) -> str:
+    """작업명의 ' ㎡ 당', ' M 당', ' 개소 당' 등 단위 표기 제거 (위치 무관, UNIT_WORDS 단위만)"""
+    return _UNIT_PER.sub('', text).strip()
+
+
+def bigrams(text) -> List[str]:
+    """정규화한 작업명의 글자 bigram (한 글자면 그 글자)"""
+    title = normalize_title(text)
+    if len(title) < 2:
+        return [title] if title else []
+    return [title[i:i + 2] for i in range(len(title) - 1)]
+
+
+class TitleMatcher:
+    """작업명 bigram 역색인 (유사 작업명 후보 검색)
+
+    질의의 bigram이 나오는 작업명만 살펴보므로 질의 비용은 전체 목록이 아닌 공유 bigram 수에 비례
+    유사도: Dice 계수 = 2 x 공유 bigram 수 / (질의 bigram 수 + 작업명 bigram 수)
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        self.titles = list(titles)
+        self._sizes = []
+        self._postings: Dict[str, List[int]] = {}
+        for pos, title in enumerate(self.titles):
+            grams = set(bigrams(title))
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(pos)
+
+    def candidates(self, query: str, limit: int = 5,
+                   min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """유사도 높은 순 (작업명 위치, 유사도) 최대 limit개"""
+        grams = set(bigrams(query))
+        if not grams:
+            return []
+        shared = {}
+        for gram in grams:
+            for pos in self._postings.get(gram, ()):
+                shared[pos] = shared.get(pos, 0) + 1
+        scored = []
+        for pos, count in shared.items():
+            score = 2 * count / (len(grams) + self._sizes[pos])
+            if score >= min_score:
+                scored.append((pos, round(score, 3)))
+        scored.sort(key=lambda hit: (-hit[1], hit[0]))
+        return scored[:limit]
+
+    def best(self, query: str, min_score: float = FUZZY_MIN_SCORE,
+             used: Container[int] = ()) -> Optional[Tuple[int, float]]:
+        """가장 유사한 작업명 (used 위치는 건너뜀, min_score 미만이면 None)"""
+        for pos, score in self.candidates(query, limit=len(self.titles), min_score=min_score):
+            if pos not in used:
+                return pos, score
+        return None
+
+
+def _index(items: List[Dict], key_func) -> Dict[str, deque]:
+    """키 -> 목록 위치 큐 (같은 키는 목록 순서대로 하나씩 사용)"""
+    index = {}
+    for pos, item in enumerate(items):
+        key = key_func(item)
+        if key:
+            index.setdefault(key, deque()).append(pos)
+    return index
+
+
+class ListReconciler:
+    """목록 항목 색인 (번호, 정규화 작업명)"""
+
+    def __init__(self, list_items: List[Dict], num_key: str = 'num', title_key: str = 'work',
+                 min_score: float = FUZZY_MIN_SCORE):
+        self.list_items = list_items
+        self.num_key = num_key
+        self.title_key = title_key
+        self.min_score = min_score
+        self._titles = [normalize_title(item.get(title_key)) for item in list_items]
+
+    def _take(self, index: Dict[str, deque], key: str, used: List[bool]) -> Optional[int]:
+        """key의 아직 사용하지 않은 첫 목록 위치 (사용한 위치는 큐에서 제거)"""
+        queue = index.get(key)
+        while queue:
+            pos = queue.popleft()
+            if not used[pos]:
+                return pos
+        return None
+
+    def reconcile(self, hopyos: List[Dict], num_key: str = 'num', title_key: str = 'work') -> Dict:
+        """산출근거 호표 목록과 대사
+
+        목록 항목 하나는 호표 하나에만 매칭 (번호 -> 작업명 -> 유사 작업명 순으로 단계마다 남은 호표만 매칭)
+        반환: {'assignments': 호표별 {'list_index', 'status', 'score'}, 'missing': 목록 위치,
+              'extra': 호표 위치, 'counts': 분류별 개수}
+        """
+        by_num = _index(self.list_items, lambda item: str(item.get(self.num_key) or ''))
+        by_title = _index(self.list_items, lambda item: normalize_title(item.get(self.title_key)))
+
+        used = [False] * len(self.list_items)
+        assignments = [{'list_index': None, 'status': None, 'score': None} for _ in hopyos]
+        titles = [normalize_title(hopyo.get(title_key)) for hopyo in hopyos]
+
+        # 1단계: 호표 번호
+        for idx, hopyo in enumerate(hopyos):
+            num = str(hopyo.get(num_key) or '')
+            pos = self._take(by_num, num, used) if num else None
+            if pos is None:
+                continue
+            used[pos] = True
+            same_title = bool(titles[idx]) and titles[idx] == self._titles[pos]
+            assignments[idx] = {'list_index': pos, 'status': MATCHED if same_title else NUMBER_ONLY,
+                                'score': 1.0 if same_title else None}
+
+        # 2단계: 번호로 못 찾은 호표는 정규화 작업명
+        for idx, title in enumerate(titles):
+            if assignments[idx]['list_index'] is not None or not title:
+                continue
+            pos = self._take(by_title, title, used)
+            if pos is None:
+                continue
+            used[pos] = True
+            assignments[idx] = {'list_index': pos, 'status': TITLE_ONLY, 'score': 1.0}
+
+        # 3단계: 남은 호표는 유사 작업명 (단위 표기 제거 후 bigram 후보 중 사용하지 않은 최고 유사도)
+        remaining = [idx for idx, a in enumerate(assignments) if a['list_index'] is None and titles[idx]]
+        if remaining and not all(used):
+            matcher = TitleMatcher(item.get(self.title_key) for item in self.list_items)
+            for idx in remaining:
+                query = strip_unit_suffix(str(hopyos[idx].get(title_key)))
+                for pos, score in matcher.candidates(query, min_score=self.min_score):
+                    if not used[pos]:
+                        used[pos] = True
+                        assignments[idx] = {'list_index': pos, 'status': FUZZY, 'score': score}
+                        break
+
+        missing = [pos for pos, is_used in enumerate(used) if not is_used]
+        extra = [idx for idx, a in enumerate(assignments) if a['list_index'] is None]
+        counts = {MATCHED: 0, NUMBER_ONLY: 0, TITLE_ONLY: 0, FUZZY: 0}
+        for a in assignments:
+            if a['status']:
+                counts[a['status']] += 1
+        counts[MISSING] = len(missing)
+        counts[EXTRA] = len(extra)
+        return {
+            'assignments': assignments,
+            'missing': missing,
+            'extra': extra,
+            'counts': counts
+        }
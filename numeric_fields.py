@@ -0,0 +1,84 @@
+"""
+수량 / 금액 필드 숫자 변환
+추출 단계에서 수량, 합계, 재료비, 노무비, 경비를 한 번만 숫자로 바꿔 두고
+합계/검증/내보내기는 숫자를 바로 사용 (단계마다 re.match(r'^[\d.,]+$') / float(v)로 문자열을 다시 파싱하지 않음)
+셀 원본이 숫자(int/float)면 그대로, 숫자 문자열('1,234', '0.035')이면 적힌 자릿수 그대로 Decimal
+"""
+import math
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from records import Record
+
+# 숫자로 저장하는 필드 (일위대가/산출근거: 한글 키, 단가산출: 영문 키)
+NUMERIC_FIELDS = ('수량', '합계', '재료비', '노무비', '경비')
+COST_FIELDS = ('total', 'material', 'labor', 'expense')
+
+# 원래 표시 문자열을 함께 저장할 때 키 (예: '수량_text')
+DISPLAY_SUFFIX = '_text'
+
+# 숫자 문자열 (천 단위 쉼표 허용)
+_NUMBER = re.compile(r'^[+-]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d*)?$|^[+-]?\.\d+$')
+
+Number = Union[int, float, Decimal]
+
+
+def parse_number(value) -> Optional[Number]:
+    """셀 값 -> int / float / Decimal (숫자가 아니면 None)"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, Decimal)):
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, np.number):
+        return parse_number(value.item())
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if not _NUMBER.match(text):
+        return None
+    try:
+        return Decimal(text.replace(',', ''))
+    except InvalidOperation:
+        return None
+
+
+def typed_value(value, text: Optional[str] = None):
+    """수량/금액 셀 -> 숫자 (숫자가 아니면 표시 문자열 그대로, 빈 셀은 '')"""
+    number = parse_number(value)
+    if number is not None:
+        return number
+    if text is None:
+        text = str(value).strip() if value is not None else ''
+    return text or ''
+
+
+def number_array(values: Iterable) -> np.ndarray:
+    """값 목록 -> float64 배열 (숫자가 아니거나 빈 값은 NaN, 합계/비교용)"""
+    values = list(values)
+    numbers = np.full(len(values), np.nan, dtype=np.float64)
+    for i, value in enumerate(values):
+        number = parse_number(value)
+        if number is not None:
+            numbers[i] = float(number)
+    return numbers
+
+
+def is_filled(value) -> bool:
+    """필드 값이 채워졌는지 (숫자 0도 채워진 값)"""
+    return value is not None and value != ''
+
+
+def json_default(obj):
+    """json.dump default (Decimal -> int/float, numpy 스칼라 -> 파이썬 값, 레코드 -> dict)"""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
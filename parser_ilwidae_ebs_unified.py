@@ -7,6 +7,10 @@ import re
 import sys
 import io
 from ilwidae_base_parser import IlwidaeBaseParser
+from hopyo_grammar import match_hopyo
+from numeric_fields import typed_value
+from records import Hopyo, IlwidaeTitle
+from workbook_reader import read_sheet
 
 # UTF-8 인코딩 설정
 try:
@@ -23,7 +27,7 @@ class IlwidaeEbsParser(IlwidaeBaseParser):
     def read_list_info(self):
         """일위대가목록 읽기"""
         try:
-            df = pd.read_excel(self.file_path, sheet_name='일위대가목록', header=None, engine='xlrd')
+            df = read_sheet(self.file_path, '일위대가목록')
             
             hopyo_info = []
             for i in range(len(df)):
@@ -32,10 +36,10 @@ class IlwidaeEbsParser(IlwidaeBaseParser):
                     if pd.notna(cell):
                         cell_str = str(cell).strip()
                         # #N 형식의 일위대가 항목 찾기
-                        match = re.match(r'^#(\d+)\s+(.+)', cell_str)
+                        match = match_hopyo(cell_str, ('hash',))
                         if match:
-                            num = match.group(1)
-                            work = match.group(2)
+                            num = match.num
+                            work = match.body
                             
                             # 규격, 단위 정보 수집
                             spec = df.iloc[i, j+1] if j+1 < len(df.columns) else ''
@@ -64,7 +68,7 @@ class IlwidaeEbsParser(IlwidaeBaseParser):
         
         # 엑셀 파일 읽기
         try:
-            self.df = pd.read_excel(self.file_path, sheet_name=self.sheet_name, header=None, engine='xlrd')
+            self.df = read_sheet(self.file_path, self.sheet_name, usecols=self.SCAN_COLUMNS)
             print(f"\n시트 '{self.sheet_name}' 로드 완료. 크기: {self.df.shape}")
         except Exception as e:
             print(f"파일 읽기 오류: {str(e)}")
@@ -91,7 +95,7 @@ class IlwidaeEbsParser(IlwidaeBaseParser):
             print(f"컬럼 매핑: {self.column_map}")
         
         # 호표 패턴: #N 작업명 (일위대가용)
-        hopyo_pattern = r'^#(\d+)\s+(.+)'
+        hopyo_styles = ('hash',)
         
         # 호표 찾기
         start_row = header_row + 1 if header_row else 0
@@ -99,42 +103,37 @@ class IlwidaeEbsParser(IlwidaeBaseParser):
             cell = self.df.iloc[i, sangcul_col]
             if pd.notna(cell):
                 cell_str = str(cell).strip()
-                match = re.match(hopyo_pattern, cell_str)
+                match = match_hopyo(cell_str, hopyo_styles)
                 if match:
-                    hopyo_num = match.group(1)
-                    work_name = match.group(2).strip()
+                    hopyo_num = match.num
+                    work_name = match.body.strip()
                     
-                    hopyo_list.append({
-                        'row': i,
-                        'num': hopyo_num,
-                        'work': work_name,
-                        'full_text': cell_str
-                    })
+                    hopyo_list.append(Hopyo(
+                        row=i,
+                        num=hopyo_num,
+                        work=work_name,
+                        full_text=cell_str
+                    ))
         
         return hopyo_list
     
     def parse_ilwidae_title(self, row_idx, df):
         """일위대가 타이틀 파싱 (ebs 특화)"""
-        title_data = {
-            "품명": "",
-            "규격": "",
-            "단위": "",
-            "수량": ""
-        }
+        title_data = IlwidaeTitle()
         
         # 호표 행에서 작업명 추출
         cell = df.iloc[row_idx, 0]  # 첫 번째 컬럼 (산출근거)
         if pd.notna(cell):
             # #N 패턴 제거하고 작업명만 추출
             work_name = re.sub(r'^#\d+\s+', '', str(cell).strip())
-            title_data["품명"] = work_name
+            title_data.품명 = work_name
         
         # 목록 정보에서 규격, 단위 가져오기
         if self.list_info:
             for item in self.list_info:
                 if item['work'] == work_name or work_name in item['work']:
-                    title_data["규격"] = item.get('spec', '')
-                    title_data["단위"] = item.get('unit', '')
+                    title_data.규격 = item.get('spec', '')
+                    title_data.단위 = item.get('unit', '')
                     break
         
         # 같은 행 또는 다음 행에서 추가 정보 찾기
@@ -143,11 +142,11 @@ class IlwidaeEbsParser(IlwidaeBaseParser):
             if pd.notna(cell):
                 value = str(cell).strip()
                 # 단위 패턴 체크
-                if not title_data["단위"] and value in ['M3', 'M2', 'M', 'KG', 'TON', '개', '대', 'L', 'EA']:
-                    title_data["단위"] = value
+                if not title_data.단위 and value in ['M3', 'M2', 'M', 'KG', 'TON', '개', '대', 'L', 'EA']:
+                    title_data.단위 = value
                 # 숫자 패턴 체크 (수량)
-                elif not title_data["수량"] and re.match(r'^\d+\.?\d*$', value):
-                    title_data["수량"] = value
+                elif title_data.수량 == "" and re.match(r'^\d+\.?\d*$', value):
+                    title_data.수량 = typed_value(cell, value)
         
         return title_data
 
@@ -1,14 +1,17 @@
 """
 stmate.xlsx 일위대가_산근 시트 통합 파서
 통합 JSON 구조: 품명, 규격, 단위, 수량 4개 컬럼으로 표준화
-xlwings 사용 (특수 속성 처리)
+시트 XML 직접 파싱 (openpyxl 비호환 속성 처리)
 """
 import pandas as pd
 import re
 import sys
 import io
-import xlwings as xw
 from ilwidae_base_parser import IlwidaeBaseParser
+from hopyo_grammar import match_hopyo
+from numeric_fields import typed_value
+from records import Hopyo, IlwidaeTitle
+from workbook_reader import read_sheet
 
 # UTF-8 인코딩 설정
 try:
@@ -21,37 +24,29 @@ class IlwidaeStmateSanggunParser(IlwidaeBaseParser):
     
     def __init__(self):
         super().__init__('stmate.xlsx', '일위대가_산근')
-        self.app = None
-        self.wb = None
-        self.ws = None
         
     def read_list_info(self):
-        """일위대가목록 읽기 (xlwings 사용)"""
+        """일위대가목록 읽기 (read_sheet 공유 세션, 산근 시트와 같은 워크북 한 번만 로드)"""
         try:
-            if not self.app:
-                self.app = xw.App(visible=False)
-                self.wb = self.app.books.open(self.file_path)
-            
-            ws = self.wb.sheets['일위대가목록']
+            df = read_sheet(self.file_path, '일위대가목록')
             
             hopyo_info = []
-            used_range = ws.used_range
             
-            if used_range:
-                for row_idx in range(3, used_range.last_cell.row + 1):  # 3행부터 시작
+            if len(df):
+                for row_idx in range(2, len(df)):  # 3행부터 시작
                     try:
-                        cell_value = ws.range(row_idx, 1).value
+                        cell_value = df.cell(row_idx, 0)
                         if cell_value:
                             cell_str = str(cell_value).strip()
                             # #N 형식 찾기
-                            match = re.match(r'^#(\d+)\s+(.+)', cell_str)
+                            match = match_hopyo(cell_str, ('hash',))
                             if match:
-                                num = match.group(1)
-                                work = match.group(2)
+                                num = match.num
+                                work = match.body
                                 
                                 # 규격, 단위 정보
-                                spec = ws.range(row_idx, 2).value or ''
-                                unit = ws.range(row_idx, 4).value or ''
+                                spec = df.cell(row_idx, 1) or ''
+                                unit = df.cell(row_idx, 3) or ''
                                 
                                 hopyo_info.append({
                                     'num': num,
@@ -76,27 +71,11 @@ class IlwidaeStmateSanggunParser(IlwidaeBaseParser):
         hopyo_list = []
         
         try:
-            # xlwings로 엑셀 파일 읽기
-            if not self.app:
-                self.app = xw.App(visible=False)
-                self.wb = self.app.books.open(self.file_path)
-            
-            self.ws = self.wb.sheets[self.sheet_name]
-            used_range = self.ws.used_range
+            # 시트 읽기 (xlwings 없이 시트 XML 직접 파싱)
+            self.df = read_sheet(self.file_path, self.sheet_name, usecols=self.SCAN_COLUMNS)
             
-            if used_range:
-                print(f"\n시트 '{self.sheet_name}' 로드 완료. 크기: {used_range.last_cell.row} x {used_range.last_cell.column}")
-                
-                # DataFrame으로 변환 (컬럼 감지용)
-                data = []
-                for row_idx in range(1, min(used_range.last_cell.row + 1, 1000)):
-                    row_data = []
-                    for col_idx in range(1, min(used_range.last_cell.column + 1, 20)):
-                        cell_value = self.ws.range(row_idx, col_idx).value
-                        row_data.append(cell_value)
-                    data.append(row_data)
-                
-                self.df = pd.DataFrame(data)
+            if len(self.df):
+                print(f"\n시트 '{self.sheet_name}' 로드 완료. 크기: {self.df.shape}")
                 
                 # 컬럼 감지
                 self.detect_columns(self.df)
@@ -106,32 +85,25 @@ class IlwidaeStmateSanggunParser(IlwidaeBaseParser):
                 return []
             
             # 호표 패턴: #N 작업명
-            hopyo_pattern = r'^#(\d+)\s+(.+)'
+            hopyo_styles = ('hash',)
             
             # 호표 찾기
-            for row_idx in range(1, used_range.last_cell.row + 1):
-                try:
-                    cell_value = self.ws.range(row_idx, 1).value
-                    if cell_value:
-                        cell_str = str(cell_value).strip()
-                        match = re.match(hopyo_pattern, cell_str)
-                        if match:
-                            hopyo_num = match.group(1)
-                            work_name = match.group(2).strip()
-                            
-                            hopyo_list.append({
-                                'row': row_idx - 1,  # DataFrame 인덱스로 변환
-                                'num': hopyo_num,
-                                'work': work_name,
-                                'full_text': cell_str
-                            })
-                except:
-                    continue
+            for row_idx in range(len(self.df)):
+                cell_value = self.df.cell(row_idx, 0)
+                if cell_value:
+                    cell_str = str(cell_value).strip()
+                    match = match_hopyo(cell_str, hopyo_styles)
+                    if match:
+                        hopyo_num = match.num
+                        work_name = match.body.strip()
+                        
+                        hopyo_list.append(Hopyo(
+                            row=row_idx,
+                            num=hopyo_num,
+                            work=work_name,
+                            full_text=cell_str
+                        ))
             
-        except ImportError:
-            print("xlwings가 설치되지 않았습니다. stmate 파일은 xlwings가 필요합니다.")
-            print("설치: pip install xlwings")
-            return []
         except Exception as e:
             print(f"파일 읽기 오류: {str(e)}")
             return []
@@ -140,26 +112,21 @@ class IlwidaeStmateSanggunParser(IlwidaeBaseParser):
     
     def parse_ilwidae_title(self, row_idx, df):
         """일위대가 타이틀 파싱 (stmate 산근 특화)"""
-        title_data = {
-            "품명": "",
-            "규격": "",
-            "단위": "",
-            "수량": ""
-        }
+        title_data = IlwidaeTitle()
         
         # 호표 행에서 작업명 추출
         cell = df.iloc[row_idx, 0]
         if pd.notna(cell):
             # #N 패턴 제거하고 작업명만 추출
             work_name = re.sub(r'^#\d+\s+', '', str(cell).strip())
-            title_data["품명"] = work_name
+            title_data.품명 = work_name
         
         # 목록 정보에서 규격, 단위 가져오기
         if self.list_info:
             for item in self.list_info:
                 if item['work'] == work_name or work_name in item['work']:
-                    title_data["규격"] = item.get('spec', '')
-                    title_data["단위"] = item.get('unit', '')
+                    title_data.규격 = item.get('spec', '')
+                    title_data.단위 = item.get('unit', '')
                     break
         
         # 같은 행 또는 다음 행에서 추가 정보 찾기
@@ -168,23 +135,13 @@ class IlwidaeStmateSanggunParser(IlwidaeBaseParser):
             if pd.notna(cell):
                 value = str(cell).strip()
                 # 단위 패턴 체크
-                if not title_data["단위"] and value in ['M3', 'M2', 'M', 'KG', 'TON', '개', '대', 'L', 'EA']:
-                    title_data["단위"] = value
+                if not title_data.단위 and value in ['M3', 'M2', 'M', 'KG', 'TON', '개', '대', 'L', 'EA']:
+                    title_data.단위 = value
                 # 숫자 패턴 체크 (수량)
-                elif not title_data["수량"] and re.match(r'^\d+\.?\d*$', value):
-                    title_data["수량"] = value
+                elif title_data.수량 == "" and re.match(r'^\d+\.?\d*$', value):
+                    title_data.수량 = typed_value(cell, value)
         
         return title_data
-    
-    def __del__(self):
-        """소멸자: xlwings 리소스 정리"""
-        try:
-            if self.wb:
-                self.wb.close()
-            if self.app:
-                self.app.quit()
-        except:
-            pass
 
 def main():
     """메인 실행 함수"""
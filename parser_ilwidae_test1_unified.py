@@ -7,6 +7,10 @@ import re
 import sys
 import io
 from ilwidae_base_parser import IlwidaeBaseParser
+from hopyo_grammar import match_hopyo
+from numeric_fields import typed_value
+from records import Hopyo, IlwidaeTitle
+from workbook_reader import read_sheet
 
 # UTF-8 인코딩 설정
 try:
@@ -23,7 +27,7 @@ class IlwidaeTest1Parser(IlwidaeBaseParser):
     def read_list_info(self):
         """일위대가목록표 읽기"""
         try:
-            df = pd.read_excel(self.file_path, sheet_name='일위대가목록표', header=None)
+            df = read_sheet(self.file_path, '일위대가목록표')
             
             hopyo_info = []
             for i in range(len(df)):
@@ -33,9 +37,9 @@ class IlwidaeTest1Parser(IlwidaeBaseParser):
                     if pd.notna(cell):
                         cell_str = str(cell).strip()
                         # 제N호표 형식
-                        match = re.match(r'제\s*(\d+)\s*호표', cell_str)
+                        match = match_hopyo(cell_str, ('je',))
                         if match:
-                            num = match.group(1)
+                            num = match.num
                             
                             # 작업명 찾기 (다음 컬럼 또는 다음 행)
                             work = ''
@@ -79,7 +83,7 @@ class IlwidaeTest1Parser(IlwidaeBaseParser):
         
         # 엑셀 파일 읽기
         try:
-            self.df = pd.read_excel(self.file_path, sheet_name=self.sheet_name, header=None)
+            self.df = read_sheet(self.file_path, self.sheet_name, usecols=self.SCAN_COLUMNS)
             print(f"\n시트 '{self.sheet_name}' 로드 완료. 크기: {self.df.shape}")
         except Exception as e:
             print(f"파일 읽기 오류: {str(e)}")
@@ -90,7 +94,7 @@ class IlwidaeTest1Parser(IlwidaeBaseParser):
         print(f"컬럼 매핑: {self.column_map}")
         
         # 호표 패턴: 제N호표
-        hopyo_pattern = r'제\s*(\d+)\s*호표'
+        hopyo_styles = ('je',)
         
         # 호표 찾기
         for i in range(len(self.df)):
@@ -98,9 +102,9 @@ class IlwidaeTest1Parser(IlwidaeBaseParser):
                 cell = self.df.iloc[i, j]
                 if pd.notna(cell):
                     cell_str = str(cell).strip()
-                    match = re.match(hopyo_pattern, cell_str)
+                    match = match_hopyo(cell_str, hopyo_styles)
                     if match:
-                        hopyo_num = match.group(1)
+                        hopyo_num = match.num
                         
                         # 작업명 찾기
                         work_name = ''
@@ -113,24 +117,19 @@ class IlwidaeTest1Parser(IlwidaeBaseParser):
                                     work_name = next_str
                                     break
                         
-                        hopyo_list.append({
-                            'row': i,
-                            'num': hopyo_num,
-                            'work': work_name,
-                            'full_text': cell_str
-                        })
+                        hopyo_list.append(Hopyo(
+                            row=i,
+                            num=hopyo_num,
+                            work=work_name,
+                            full_text=cell_str
+                        ))
                         break  # 한 행에서 호표 찾으면 다음 행으로
         
         return hopyo_list
     
     def parse_ilwidae_title(self, row_idx, df):
         """일위대가 타이틀 파싱 (test1 특화)"""
-        title_data = {
-            "품명": "",
-            "규격": "",
-            "단위": "",
-            "수량": ""
-        }
+        title_data = IlwidaeTitle()
         
         # 호표 행에서 작업명 추출
         for j in range(min(10, len(df.columns))):
@@ -140,21 +139,21 @@ class IlwidaeTest1Parser(IlwidaeBaseParser):
                 # 제N호표 다음 내용이 작업명
                 if '호표' in cell_str:
                     continue
-                elif cell_str and not cell_str.isdigit() and not title_data["품명"]:
-                    title_data["품명"] = cell_str
+                elif cell_str and not cell_str.isdigit() and not title_data.품명:
+                    title_data.품명 = cell_str
                 elif cell_str in ['M3', 'M2', 'M', 'KG', 'TON', '개', '대', 'L', 'EA', 'M³', 'M²']:
-                    title_data["단위"] = cell_str
-                elif re.match(r'^\d+\.?\d*$', cell_str) and not title_data["수량"]:
-                    title_data["수량"] = cell_str
+                    title_data.단위 = cell_str
+                elif re.match(r'^\d+\.?\d*$', cell_str) and title_data.수량 == "":
+                    title_data.수량 = typed_value(cell, cell_str)
         
         # 목록 정보에서 보완
         if self.list_info:
             for item in self.list_info:
-                if item['work'] and (item['work'] == title_data["품명"] or title_data["품명"] in item['work']):
-                    if not title_data["규격"] and item.get('spec'):
-                        title_data["규격"] = item['spec']
-                    if not title_data["단위"] and item.get('unit'):
-                        title_data["단위"] = item['unit']
+                if item['work'] and (item['work'] == title_data.품명 or title_data.품명 in item['work']):
+                    if not title_data.규격 and item.get('spec'):
+                        title_data.규격 = item['spec']
+                    if not title_data.단위 and item.get('unit'):
+                        title_data.단위 = item['unit']
                     break
         
         return title_data
@@ -7,6 +7,7 @@ import json
 import re
 import sys
 import io
+from hopyo_grammar import match_hopyo
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -36,10 +37,10 @@ def read_sangcul_list(file_path):
                 if pd.notna(cell):
                     cell_str = str(cell).strip()
                     # (산근 N) 패턴 찾기
-                    match = re.search(r'\(\s*산근\s*(\d+)\s*\)', cell_str)
+                    match = match_hopyo(cell_str, ('paren',))
                     if match:
-                        num = match.group(1)
-                        work = cell_str[:match.start()].strip()
+                        num = match.num
+                        work = match.title
                         
                         if work:
                             hopyo_info.append({
@@ -100,7 +101,7 @@ def parse_construction_sangcul():
         print(f"\n시트 '{sheet_name}' 로드 완료. 크기: {df.shape}")
         
         # 호표 패턴: 작업명 (산근 N)
-        hopyo_pattern = r'(.+)\(\s*산근\s*(\d+)\s*\)'
+        hopyo_styles = ('paren',)
         
         # 호표 찾기
         hopyo_list = []
@@ -109,10 +110,10 @@ def parse_construction_sangcul():
                 cell = df.iloc[i, j]
                 if pd.notna(cell):
                     cell_str = str(cell).strip()
-                    match = re.search(hopyo_pattern, cell_str)
+                    match = match_hopyo(cell_str, hopyo_styles)
                     if match:
-                        work_name = match.group(1).strip()
-                        hopyo_num = match.group(2)
+                        work_name = match.title
+                        hopyo_num = match.num
                         
                         hopyo_list.append({
                             'row': i,
@@ -7,6 +7,8 @@ import json
 import re
 import sys
 import io
+from hopyo_grammar import match_hopyo
+from workbook_reader import read_sheet
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -14,7 +16,7 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 def read_sangcul_list(file_path):
     """일위대가목록 읽기"""
     try:
-        df = pd.read_excel(file_path, sheet_name='일위대가목록', header=None, engine='xlrd')
+        df = read_sheet(file_path, '일위대가목록')
         
         hopyo_info = []
         for i in range(len(df)):
@@ -22,10 +24,10 @@ def read_sangcul_list(file_path):
                 cell = df.iloc[i, j]
                 if pd.notna(cell):
                     cell_str = str(cell).strip()
-                    match = re.match(r'^#(\d+)\s+(.+)', cell_str)
+                    match = match_hopyo(cell_str, ('hash',))
                     if match:
-                        num = match.group(1)
-                        work = match.group(2)
+                        num = match.num
+                        work = match.body
                         spec = df.iloc[i, j+1] if j+1 < len(df.columns) else ''
                         unit = df.iloc[i, j+2] if j+2 < len(df.columns) else ''
                         
@@ -83,7 +85,7 @@ def parse_ebs_sangcul():
         list_info = read_sangcul_list(file_path)
         
         # 엑셀 파일 읽기
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine='xlrd')
+        df = read_sheet(file_path, sheet_name)
         print(f"\n시트 '{sheet_name}' 로드 완료. 크기: {df.shape}")
         
         # 헤더 찾기
@@ -101,7 +103,7 @@ def parse_ebs_sangcul():
                 break
         
         # 호표 패턴: #N 작업명
-        hopyo_pattern = r'^#(\d+)\s+(.+)'
+        hopyo_styles = ('hash',)
         
         # 호표 찾기
         hopyo_list = []
@@ -109,10 +111,10 @@ def parse_ebs_sangcul():
             cell = df.iloc[i, sangcul_col]
             if pd.notna(cell):
                 cell_str = str(cell).strip()
-                match = re.match(hopyo_pattern, cell_str)
+                match = match_hopyo(cell_str, hopyo_styles)
                 if match:
-                    hopyo_num = match.group(1)
-                    work_name = match.group(2).strip()
+                    hopyo_num = match.num
+                    work_name = match.body.strip()
                     
                     hopyo_list.append({
                         'row': i,
@@ -7,6 +7,7 @@ import json
 import re
 import sys
 import io
+from hopyo_grammar import match_hopyo
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -89,7 +90,7 @@ def parse_est_sangcul():
         print(f"\n시트 '{sheet_name}' 로드 완료. 크기: {df.shape}")
         
         # 호표 패턴: 1. 작업명
-        hopyo_pattern = r'^(\d+)\.\s*(.+)'
+        hopyo_styles = ('dot',)
         
         # 호표 찾기 (col 1부터 검사)
         hopyo_list = []
@@ -97,10 +98,10 @@ def parse_est_sangcul():
             cell = df.iloc[i, 1]  # est는 1열부터 시작
             if pd.notna(cell):
                 cell_str = str(cell).strip()
-                match = re.match(hopyo_pattern, cell_str)
+                match = match_hopyo(cell_str, hopyo_styles)
                 if match:
-                    hopyo_num = match.group(1)
-                    work_name = match.group(2).strip()
+                    hopyo_num = match.num
+                    work_name = match.title
                     
                     # 연속된 번호인지 확인
                     if len(hopyo_list) == 0 or int(hopyo_num) == len(hopyo_list) + 1:
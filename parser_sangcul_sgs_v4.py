@@ -7,6 +7,8 @@ import json
 import re
 import sys
 import io
+from hopyo_grammar import match_hopyo
+from workbook_reader import read_sheet
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -14,7 +16,7 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 def read_sangcul_list(file_path):
     """단가산출 목록 읽기"""
     try:
-        df = pd.read_excel(file_path, sheet_name='단가산출 목록', header=None, engine='xlrd')
+        df = read_sheet(file_path, '단가산출 목록')
         
         hopyo_info = []
         header_found = False
@@ -84,11 +86,11 @@ def parse_sgs_sangcul():
         list_info = read_sangcul_list(file_path)
         
         # 엑셀 파일 읽기
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine='xlrd')
+        df = read_sheet(file_path, sheet_name)
         print(f"\n시트 '{sheet_name}' 로드 완료. 크기: {df.shape}")
         
         # 호표 패턴: 산근 N 호표 : 작업명
-        hopyo_pattern = r'산근\s*(\d+)\s*호표\s*[：:](.+)'
+        hopyo_styles = ('sanggun',)
         
         # 호표 찾기
         hopyo_list = []
@@ -97,10 +99,10 @@ def parse_sgs_sangcul():
                 cell = df.iloc[i, j]
                 if pd.notna(cell):
                     cell_str = str(cell).strip()
-                    match = re.match(hopyo_pattern, cell_str)
+                    match = match_hopyo(cell_str, hopyo_styles)
                     if match:
-                        hopyo_num = match.group(1)
-                        work_name = match.group(2).strip()
+                        hopyo_num = match.num
+                        work_name = match.title
                         
                         hopyo_list.append({
                             'row': i,
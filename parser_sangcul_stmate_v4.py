@@ -7,33 +7,31 @@ import json
 import re
 import sys
 import io
-import xlwings as xw
+from hopyo_grammar import match_hopyo
+from workbook_reader import read_sheet
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 def read_sangcul_list(file_path):
-    """일위대가목록 읽기 (xlwings 사용)"""
+    """일위대가목록 읽기"""
     try:
-        app = xw.App(visible=False)
-        wb = app.books.open(file_path)
-        ws = wb.sheets['일위대가목록']
+        df = read_sheet(file_path, '일위대가목록')
         
         hopyo_info = []
-        used_range = ws.used_range
         
-        if used_range:
-            for row_idx in range(3, used_range.last_cell.row + 1):  # 3행부터 시작 (헤더 제외)
+        if len(df):
+            for row_idx in range(3, len(df) + 1):  # 3행부터 시작 (헤더 제외, 엑셀 행 번호)
                 try:
-                    cell_value = ws.range(row_idx, 1).value
+                    cell_value = df.cell(row_idx - 1, 0)
                     if cell_value:
                         cell_str = str(cell_value).strip()
-                        match = re.match(r'^#(\d+)\s+(.+)', cell_str)
+                        match = match_hopyo(cell_str, ('hash',))
                         if match:
-                            num = match.group(1)
-                            work = match.group(2)
-                            spec = ws.range(row_idx, 2).value or ''
-                            unit = ws.range(row_idx, 4).value or ''
+                            num = match.num
+                            work = match.body
+                            spec = df.cell(row_idx - 1, 1) or ''
+                            unit = df.cell(row_idx - 1, 3) or ''
                             
                             hopyo_info.append({
                                 'num': num,
@@ -44,9 +42,6 @@ def read_sangcul_list(file_path):
                 except:
                     continue
         
-        wb.close()
-        app.quit()
-        
         print(f"\n[일위대가목록 정보]")
         print(f"총 {len(hopyo_info)}개 호표 발견")
         
@@ -56,8 +51,8 @@ def read_sangcul_list(file_path):
         print(f"목록 읽기 오류: {str(e)}")
         return None
 
-def extract_all_rows_in_order_xlwings(ws, start_row, end_row):
-    """xlwings로 호표 사이의 모든 행을 순서대로 완전히 추출"""
+def extract_all_rows_in_order(df, start_row, end_row):
+    """호표 사이의 모든 행을 순서대로 완전히 추출 (start_row/end_row는 엑셀 행 번호)"""
     all_rows = []
     
     for row_idx in range(start_row, end_row):
@@ -69,16 +64,13 @@ def extract_all_rows_in_order_xlwings(ws, start_row, end_row):
         }
         
         # 처음 20컬럼 검사
-        for col_idx in range(1, 21):
-            try:
-                cell_value = ws.range(row_idx, col_idx).value
-                if cell_value is not None:
-                    content = str(cell_value).strip()
-                    if content:  # 빈 문자열이 아니면 저장
-                        row_data['columns'][f'col_{col_idx-1}'] = content
-                        row_data['has_content'] = True
-            except:
-                continue
+        for col_idx in range(20):
+            cell_value = df.cell(row_idx - 1, col_idx)
+            if cell_value is not None:
+                content = str(cell_value).strip()
+                if content:  # 빈 문자열이 아니면 저장
+                    row_data['columns'][f'col_{col_idx}'] = content
+                    row_data['has_content'] = True
         
         # 빈 행이어도 순서 유지를 위해 모두 저장
         all_rows.append(row_data)
@@ -95,34 +87,32 @@ def parse_stmate_sangcul():
         # 목록 정보 읽기
         list_info = read_sangcul_list(file_path)
         
-        # xlwings로 엑셀 파일 읽기
-        app = xw.App(visible=False)
-        wb = app.books.open(file_path)
-        ws = wb.sheets[sheet_name]
+        # 시트 읽기 (xlwings 없이 시트 XML 직접 파싱 가능)
+        # extract_all_rows_in_order가 보는 앞 20개 컬럼만 읽기
+        df = read_sheet(file_path, sheet_name, usecols=range(20))
+        # 서식만 있는 끝 행을 제외한 마지막 내용 행 (엑셀 행 번호)
+        last_row = df.last_row + 1
         
-        used_range = ws.used_range
-        if used_range:
-            print(f"\n시트 '{sheet_name}' 로드 완료. 크기: {used_range.last_cell.row} x {used_range.last_cell.column}")
+        if last_row:
+            print(f"\n시트 '{sheet_name}' 로드 완료. 크기: {last_row} x {df.width}")
         else:
             print(f"\n시트 '{sheet_name}'에 데이터가 없습니다.")
-            wb.close()
-            app.quit()
             return None
         
         # 호표 패턴: #N 작업명
-        hopyo_pattern = r'^#(\d+)\s+(.+)'
+        hopyo_styles = ('hash',)
         
         # 호표 찾기
         hopyo_list = []
-        for row_idx in range(1, used_range.last_cell.row + 1):
+        for row_idx in range(1, last_row + 1):
             try:
-                cell_value = ws.range(row_idx, 1).value
+                cell_value = df.cell(row_idx - 1, 0)
                 if cell_value:
                     cell_str = str(cell_value).strip()
-                    match = re.match(hopyo_pattern, cell_str)
+                    match = match_hopyo(cell_str, hopyo_styles)
                     if match:
-                        hopyo_num = match.group(1)
-                        work_name = match.group(2).strip()
+                        hopyo_num = match.num
+                        work_name = match.body.strip()
                         
                         hopyo_list.append({
                             'row': row_idx,
@@ -161,10 +151,10 @@ def parse_stmate_sangcul():
             
             # 호표 범위 설정
             start_row = hopyo['row']
-            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else used_range.last_cell.row + 1
+            end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else last_row + 1
             
             # 호표 사이의 모든 행을 순서대로 완전히 추출
-            all_rows_data = extract_all_rows_in_order_xlwings(ws, start_row, end_row)
+            all_rows_data = extract_all_rows_in_order(df, start_row, end_row)
             
             # 내용이 있는 행만 계산 (통계용)
             content_rows = [row for row in all_rows_data if row['has_content']]
@@ -192,9 +182,6 @@ def parse_stmate_sangcul():
                 else:
                     print(f"    행{row_data['row_number']}: (빈행)")
         
-        wb.close()
-        app.quit()
-        
         # JSON 파일로 저장
         output_file = 'stmate_sangcul_parsed_v4.json'
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -205,9 +192,6 @@ def parse_stmate_sangcul():
         
         return result
         
-    except ImportError:
-        print("xlwings가 설치되지 않았습니다. stmate 파일은 xlwings가 필요합니다.")
-        return None
     except Exception as e:
         print(f"오류 발생: {str(e)}")
         import traceback
@@ -7,6 +7,7 @@ import json
 import re
 import sys
 import io
+from hopyo_grammar import match_hopyo
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -31,9 +32,9 @@ def read_sangcul_list(file_path):
             cell = df.iloc[i, 0] if 0 < len(df.columns) else None
             if pd.notna(cell):
                 cell_str = str(cell).strip()
-                match = re.match(r'제(\d+)호표', cell_str)
+                match = match_hopyo(cell_str, ('je',))
                 if match:
-                    hopyo_num = match.group(1)
+                    hopyo_num = match.num
                     work_name = df.iloc[i, 1] if 1 < len(df.columns) else ''
                     spec = df.iloc[i, 2] if 2 < len(df.columns) else ''
                     
@@ -107,7 +108,7 @@ def parse_test1_sangcul():
                 break
         
         # 호표 패턴: 숫자.작업명 형식
-        hopyo_pattern = r'^(\d+)\.\s*(.+)'
+        hopyo_styles = ('dot',)
         
         # 모든 호표 찾기
         hopyo_list = []
@@ -115,10 +116,10 @@ def parse_test1_sangcul():
             cell = df.iloc[i, sangcul_col]
             if pd.notna(cell):
                 cell_str = str(cell).strip()
-                match = re.match(hopyo_pattern, cell_str)
+                match = match_hopyo(cell_str, hopyo_styles)
                 if match:
-                    hopyo_num = match.group(1)
-                    work_name = match.group(2).strip()
+                    hopyo_num = match.num
+                    work_name = match.title
                     
                     if len(hopyo_list) == 0 or int(hopyo_num) == len(hopyo_list) + 1:
                         hopyo_list.append({
@@ -5,6 +5,7 @@ import sys
 import io
 from typing import Dict, List, Any
 import re
+from workbook_reader import read_sheet
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -29,7 +30,7 @@ def parse_sgs():
     print(f"{'='*60}")
     
     # 엑셀 읽기 (xls 파일이므로 xlrd 엔진 사용)
-    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine='xlrd')
+    df = read_sheet(file_path, sheet_name)
     
     # 헤더 찾기 - sgs는 2행에 헤더가 있음
     header_row = 2  # 고정값
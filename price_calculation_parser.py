@@ -7,7 +7,10 @@ import json
 import os
 import re
 from typing import Dict, List, Optional, Tuple
-from openpyxl import load_workbook
+from block_index import MAX_BLOCK_ROWS, BlockIndex
+from hopyo_grammar import match_hopyo
+from numeric_fields import is_filled, json_default, typed_value
+from workbook_reader import SheetGrid, close_session, read_sheet
 
 class PriceCalculationParser:
     """단가산출 통합 파서"""
@@ -21,7 +24,7 @@ class PriceCalculationParser:
         print("test1.xlsx 단가산출 파싱")
         print("="*70)
         
-        df = pd.read_excel('test1.xlsx', sheet_name='단가산출_산근', header=None)
+        df = read_sheet('test1.xlsx', '단가산출_산근')
         print(f"시트 크기: {df.shape}")
         
         # 단가산출 항목 찾기 (숫자.제목 패턴)
@@ -33,10 +36,10 @@ class PriceCalculationParser:
                 cell_str = str(cell).strip()
                 
                 # 숫자.제목 패턴 찾기 (예: "1.아스팔트포장깨기")
-                match = re.match(r'^(\d+)\.(.+)', cell_str)
+                match = match_hopyo(cell_str, ('dot',))
                 if match:
-                    item_no = match.group(1)
-                    item_name = match.group(2).strip()
+                    item_no = match.num
+                    item_name = match.title
                     
                     # 단위 정보 추출 [㎥], [㎡] 등
                     unit_match = re.search(r'\[([^\]]+)\]', item_name)
@@ -70,7 +73,7 @@ class PriceCalculationParser:
         print("est.xlsx 단가산출 파싱")
         print("="*70)
         
-        df = pd.read_excel('est.xlsx', sheet_name='단가산출', header=None)
+        df = read_sheet('est.xlsx', '단가산출')
         print(f"시트 크기: {df.shape}")
         
         # 단가산출 항목 찾기
@@ -83,10 +86,10 @@ class PriceCalculationParser:
                     cell_str = str(cell).strip()
                     
                     # 숫자.제목 패턴 찾기
-                    match = re.match(r'^(\d+)\.(.+)', cell_str)
+                    match = match_hopyo(cell_str, ('dot',))
                     if match:
-                        item_no = match.group(1)
-                        item_name = match.group(2).strip()
+                        item_no = match.num
+                        item_name = match.title
                         
                         # 합계, 재료비, 노무비, 경비 추출 (같은 행의 다른 컬럼들)
                         total = ''
@@ -97,22 +100,22 @@ class PriceCalculationParser:
                         if len(df.columns) > 2:
                             total_cell = df.iloc[i, 2]  # 합계
                             if pd.notna(total_cell):
-                                total = str(total_cell).strip()
+                                total = typed_value(total_cell)
                         
                         if len(df.columns) > 3:
                             labor_cell = df.iloc[i, 3]  # 노무비
                             if pd.notna(labor_cell):
-                                labor = str(labor_cell).strip()
+                                labor = typed_value(labor_cell)
                         
                         if len(df.columns) > 4:
                             material_cell = df.iloc[i, 4]  # 재료비
                             if pd.notna(material_cell):
-                                material = str(material_cell).strip()
+                                material = typed_value(material_cell)
                         
                         if len(df.columns) > 5:
                             expense_cell = df.iloc[i, 5]  # 경비
                             if pd.notna(expense_cell):
-                                expense = str(expense_cell).strip()
+                                expense = typed_value(expense_cell)
                         
                         price_items.append({
                             'row': i,
@@ -142,7 +145,7 @@ class PriceCalculationParser:
         print("sgs.xls 단가산출 파싱")
         print("="*70)
         
-        df = pd.read_excel('sgs.xls', sheet_name='단가산출', header=None, engine='xlrd')
+        df = read_sheet('sgs.xls', '단가산출')
         print(f"시트 크기: {df.shape}")
         
         # 단가산출 항목 찾기 (산근 N 호표 패턴)
@@ -154,10 +157,10 @@ class PriceCalculationParser:
                 cell_str = str(cell).strip()
                 
                 # "산근 N 호표" 패턴 찾기
-                match = re.search(r'산근\s*(\d+)\s*호표\s*[：:]\s*(.+)', cell_str)
+                match = match_hopyo(cell_str, ('sanggun',), search=True)
                 if match:
-                    item_no = match.group(1)
-                    item_name = match.group(2).strip()
+                    item_no = match.num
+                    item_name = match.title
                     
                     price_items.append({
                         'row': i,
@@ -183,7 +186,7 @@ class PriceCalculationParser:
         print("건축구조내역.xlsx 중기단가산출서 파싱")
         print("="*70)
         
-        df = pd.read_excel('건축구조내역.xlsx', sheet_name='중기단가산출서', header=None)
+        df = read_sheet('건축구조내역.xlsx', '중기단가산출서')
         print(f"시트 크기: {df.shape}")
         
         # 단가산출 항목 찾기 (헤더 행 3 이후, 품목명이 있는 행)
@@ -207,25 +210,26 @@ class PriceCalculationParser:
                     if len(df.columns) > 1:
                         material_cell = df.iloc[i, 1]
                         if pd.notna(material_cell):
-                            material = str(material_cell).strip()
+                            material = typed_value(material_cell)
                     
                     if len(df.columns) > 2:
                         labor_cell = df.iloc[i, 2]
                         if pd.notna(labor_cell):
-                            labor = str(labor_cell).strip()
+                            labor = typed_value(labor_cell)
                     
                     if len(df.columns) > 3:
                         expense_cell = df.iloc[i, 3]
                         if pd.notna(expense_cell):
-                            expense = str(expense_cell).strip()
+                            expense = typed_value(expense_cell)
                     
                     if len(df.columns) > 4:
                         total_cell = df.iloc[i, 4]
                         if pd.notna(total_cell):
-                            total = str(total_cell).strip()
+                            total = typed_value(total_cell)
                     
                     # 유효한 데이터가 있는 경우만 추가
-                    if any([material, labor, expense, total]) and any(val != '0' for val in [material, labor, expense, total]):
+                    costs = [material, labor, expense, total]
+                    if any(is_filled(val) for val in costs) and any(val != 0 for val in costs):
                         price_items.append({
                             'row': i,
                             'no': str(item_no),
@@ -254,15 +258,8 @@ class PriceCalculationParser:
         print("stmate.xlsx 일위대가_산근 단가산출 파싱")
         print("="*70)
         
-        # repaired 파일 사용
-        wb = load_workbook('stmate_repaired.xlsx', read_only=True, data_only=True)
-        ws = wb['일위대가_산근']
-        
-        # DataFrame으로 변환
-        data = []
-        for row in ws.iter_rows(values_only=True):
-            data.append(list(row))
-        df = pd.DataFrame(data)
+        # 원본 파일 직접 사용 (parse_stmate와 같은 세션 공유)
+        df = read_sheet('stmate.xlsx', '일위대가_산근')
         
         print(f"시트 크기: {df.shape}")
         
@@ -275,18 +272,18 @@ class PriceCalculationParser:
                 cell_str = str(cell).strip()
                 
                 # #N 패턴 찾기 (예: "#1 폐기물 상차 | 굴삭기 1.0㎥|㎥")
-                match = re.match(r'^#(\d+)\s+(.+?)(?:\s*\|\s*([^|]+)\s*\|\s*([^|]+))?$', cell_str)
+                match = match_hopyo(cell_str, ('hash',))
                 if match:
-                    item_no = match.group(1)
-                    item_name = match.group(2).strip()
-                    spec = match.group(3).strip() if match.group(3) else ''
-                    unit = match.group(4).strip() if match.group(4) else ''
+                    item_no = match.num
+                    item_name = match.title
+                    spec = match.spec
+                    unit = match.unit
                     
                     # 같은 행의 합계, 재료비, 노무비, 경비 추출
-                    total = str(df.iloc[i, 1]).strip() if len(df.columns) > 1 and pd.notna(df.iloc[i, 1]) else ''
-                    material = str(df.iloc[i, 2]).strip() if len(df.columns) > 2 and pd.notna(df.iloc[i, 2]) else ''
-                    labor = str(df.iloc[i, 3]).strip() if len(df.columns) > 3 and pd.notna(df.iloc[i, 3]) else ''
-                    expense = str(df.iloc[i, 4]).strip() if len(df.columns) > 4 and pd.notna(df.iloc[i, 4]) else ''
+                    total = typed_value(df.iloc[i, 1]) if len(df.columns) > 1 and pd.notna(df.iloc[i, 1]) else ''
+                    material = typed_value(df.iloc[i, 2]) if len(df.columns) > 2 and pd.notna(df.iloc[i, 2]) else ''
+                    labor = typed_value(df.iloc[i, 3]) if len(df.columns) > 3 and pd.notna(df.iloc[i, 3]) else ''
+                    expense = typed_value(df.iloc[i, 4]) if len(df.columns) > 4 and pd.notna(df.iloc[i, 4]) else ''
                     
                     price_items.append({
                         'row': i,
@@ -301,7 +298,6 @@ class PriceCalculationParser:
                     })
                     print(f"  발견: #{item_no} {item_name} | {spec} | {unit}")
         
-        wb.close()
         print(f"단가산출 항목 발견: {len(price_items)}개")
         
         # JSON 결과 생성
@@ -313,7 +309,7 @@ class PriceCalculationParser:
         return result
     
     def _create_price_result(self, file_name: str, sheet_name: str, price_items: List, 
-                           df: pd.DataFrame, file_type: str) -> Dict:
+                           df: SheetGrid, file_type: str) -> Dict:
         """단가산출 JSON 결과 생성"""
         result = {
             'file': file_name,
@@ -323,21 +319,20 @@ class PriceCalculationParser:
             'price_data': []
         }
         
+        # 항목 시작 행 -> 다음 항목 시작 행 (마지막 항목은 마지막 내용 행까지)
+        blocks = BlockIndex((item['row'] for item in price_items), sheet_end=df.last_row + 1,
+                            max_rows=MAX_BLOCK_ROWS)
+        blocks.report_truncation(result)
+        
         for item in price_items:
             # 상세 계산 과정 추출 (해당 항목 이후의 행들)
             start_row = item['row']
-            end_row = start_row + 50  # 최대 50행까지 확인
+            end_row = blocks.end_of(start_row)
             
             calculation_details = []
             
-            # 다음 항목 시작점 찾기
-            for next_item in price_items:
-                if next_item['row'] > start_row:
-                    end_row = min(end_row, next_item['row'])
-                    break
-            
             # 계산 과정 추출
-            for row_idx in range(start_row + 1, min(end_row, len(df))):
+            for row_idx in range(start_row + 1, end_row):
                 detail_row = self._extract_calculation_detail(df, row_idx, file_type)
                 if detail_row:
                     calculation_details.append(detail_row)
@@ -385,7 +380,7 @@ class PriceCalculationParser:
         
         return result
     
-    def _extract_calculation_detail(self, df: pd.DataFrame, row_idx: int, file_type: str) -> Optional[Dict]:
+    def _extract_calculation_detail(self, df: SheetGrid, row_idx: int, file_type: str) -> Optional[Dict]:
         """계산 상세 내용 추출"""
         if row_idx >= len(df):
             return None
@@ -414,8 +409,8 @@ class PriceCalculationParser:
                     if col_idx < len(df.columns):
                         cell = df.iloc[row_idx, col_idx]
                         if pd.notna(cell):
-                            value = str(cell).strip()
-                            if value and value != '0':
+                            value = typed_value(cell)
+                            if is_filled(value) and value != 0:
                                 detail[field_name] = value
         
         return detail
@@ -423,7 +418,7 @@ class PriceCalculationParser:
     def _save_result(self, result: Dict, output_file: str):
         """결과 저장"""
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+            json.dump(result, f, ensure_ascii=False, indent=2, default=json_default)
         
         # 통계 출력
         total_details = sum(len(item['calculation_details']) for item in result['price_data'])
@@ -438,22 +433,27 @@ class PriceCalculationParser:
         # test1.xlsx
         if os.path.exists('test1.xlsx'):
             results.append(self.parse_test1_price())
+            close_session('test1.xlsx')
         
         # est.xlsx
         if os.path.exists('est.xlsx'):
             results.append(self.parse_est_price())
+            close_session('est.xlsx')
         
         # sgs.xls
         if os.path.exists('sgs.xls'):
             results.append(self.parse_sgs_price())
+            close_session('sgs.xls')
         
         # 건축구조내역.xlsx
         if os.path.exists('건축구조내역.xlsx'):
             results.append(self.parse_construction1_price())
+            close_session('건축구조내역.xlsx')
         
-        # stmate.xlsx (repaired)
-        if os.path.exists('stmate_repaired.xlsx'):
+        # stmate.xlsx
+        if os.path.exists('stmate.xlsx'):
             results.append(self.parse_stmate_price())
+            close_session('stmate.xlsx')
         
         return results
 
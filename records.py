@@ -0,0 +1,148 @@
+"""
+일위대가 / 산출근거 레코드 (__slots__ 고정 필드 객체)
+항목마다 키 6개짜리 dict(raw 행은 col_N 키 dict)를 만드는 대신 고정 필드 객체로 보관해
+워크북 여러 개를 한 번에 메모리에 둘 때 항목당 메모리를 줄이고, JSON 저장 시점에만 dict로 변환
+(json.dump(..., default=numeric_fields.json_default)가 to_dict 호출)
+산출근거의 단위 / 규격 / 짧은 품명은 문자열 사전(string_table) 코드로 보관
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from string_table import get_table
+
+
+class _Omit:
+    """to_dict에서 생략할 필드 값 (예: 비고가 없는 양식의 타이틀)"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'OMIT'
+
+
+OMIT = _Omit()
+
+
+class Record:
+    """레코드 공통: to_dict, 기존 dict 방식 읽기(record['품명'], record.get(...)) 호환
+
+    FIELDS: 출력 필드 순서 (기본은 __slots__, 사전 코드 필드는 프로퍼티 이름)
+    """
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict:
+        """필드 순서대로 dict (OMIT 필드 제외, 사전 코드는 문자열로)"""
+        return {name: getattr(self, name) for name in self.FIELDS
+                if getattr(self, name) is not OMIT}
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS or getattr(self, key) is OMIT:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS and getattr(self, key) is not OMIT
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self else default
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _encoded(field: str) -> property:
+    """문자열 사전 코드로 보관하는 필드 (슬롯 '_필드'에 코드, 읽을 때 문자열)"""
+    slot = '_' + field
+
+    def fget(self):
+        return get_table().decode(getattr(self, slot))
+
+    def fset(self, value):
+        setattr(self, slot, get_table().encode(field, value))
+
+    return property(fget, fset, doc=f"{field} (문자열 사전 코드)")
+
+
+class Hopyo(Record):
+    """호표 탐색 결과 (행, 번호, 작업명 + 양식별 규격/단위/수량, 목록 유사 매칭 정보)"""
+    __slots__ = ('row', 'num', 'work', 'clean_work', 'spec', 'unit', 'quantity', 'full_text', 'list_match')
+    FIELDS = __slots__
+
+    def __init__(self, row: int, num: str, work: str, clean_work: str = '', spec: str = '',
+                 unit: str = '', quantity='', full_text: str = '', list_match=OMIT):
+        self.row = row
+        self.num = num
+        self.work = work
+        self.clean_work = clean_work
+        self.spec = spec
+        self.unit = unit
+        self.quantity = quantity
+        self.full_text = full_text
+        self.list_match = list_match
+
+
+class IlwidaeTitle(Record):
+    """일위대가 타이틀 (비고는 양식에 있을 때만 출력)"""
+    __slots__ = ('품명', '규격', '단위', '수량', '비고')
+    FIELDS = __slots__
+
+    def __init__(self, 품명: str = '', 규격: str = '', 단위: str = '', 수량='', 비고=OMIT):
+        self.품명 = 품명
+        self.규격 = 규격
+        self.단위 = 단위
+        self.수량 = 수량
+        self.비고 = 비고
+
+
+class SangulItem(Record):
+    """산출근거 항목 (품명/규격/단위는 문자열 사전 코드, 수량_text는 표시 문자열을 함께 저장할 때만 출력)"""
+    __slots__ = ('row_number', '_품명', '_규격', '_단위', '수량', '비고', '수량_text')
+    FIELDS = ('row_number', '품명', '규격', '단위', '수량', '비고', '수량_text')
+
+    품명 = _encoded('품명')
+    규격 = _encoded('규격')
+    단위 = _encoded('단위')
+
+    def __init__(self, row_number: int, 품명: str = '', 규격: str = '', 단위: str = '',
+                 수량='', 비고='', 수량_text=OMIT):
+        self.row_number = row_number
+        self.품명 = 품명
+        self.규격 = 규격
+        self.단위 = 단위
+        self.수량 = 수량
+        self.비고 = 비고
+        self.수량_text = 수량_text
+
+
+class RawRow(Record):
+    """raw 데이터 행 (값이 있는 셀만 (열, 문자열) 튜플로 보관, 출력은 기존 col_N 형식)"""
+    __slots__ = ('row_number', 'cells')
+    FIELDS = __slots__
+
+    def __init__(self, row_number: int, cells: Iterable[Tuple[int, str]] = ()):
+        self.row_number = row_number
+        self.cells = tuple(cells)
+
+    @property
+    def has_content(self) -> bool:
+        return bool(self.cells)
+
+    def cell(self, col_idx: int) -> Optional[str]:
+        for col, value in self.cells:
+            if col == col_idx:
+                return value
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            'row_number': self.row_number,
+            'columns': {f'col_{col}': value for col, value in self.cells},
+            'has_content': self.has_content
+        }
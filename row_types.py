@@ -0,0 +1,91 @@
+"""
+행 유형 분류 (시트당 한 번)
+모든 행을 int8 코드(빈 행 / 호표 / 컬럼 헤더 / 항목 / 합계·소계 / 구분선 / 주석)로 분류하여
+추출, 검증, 통계 단계가 같은 배열을 읽음 (단계마다 '합계', '호표', '----' 등을 다시 판단하지 않음)
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from workbook_reader import SheetGrid
+
+# 행 유형 코드
+BLANK = 0       # 내용 없음
+HOPYO = 1       # 호표 행 (품명에 '호표' 포함 또는 호표 탐색으로 찾은 행)
+HEADER = 2      # 컬럼 헤더 (품명, 공종 등)
+ITEM = 3        # 산출근거 항목
+SUBTOTAL = 4    # 합계, 소계, 계, 재료비, 노무비, 경비
+SEPARATOR = 5   # ----, ==== 구분선
+NOTE = 6        # 품명 없이 다른 컬럼만 있거나 품명이 숫자뿐인 행
+
+ROW_TYPE_NAMES = {
+    BLANK: '빈 행',
+    HOPYO: '호표',
+    HEADER: '헤더',
+    ITEM: '항목',
+    SUBTOTAL: '합계/소계',
+    SEPARATOR: '구분선',
+    NOTE: '주석'
+}
+
+HEADER_NAMES = ('품명', '공종', '품목', '명칭', '자재명', '산출근거', '산출내역')
+SUBTOTAL_NAMES = ('계', '재료비', '노무비', '경비')
+
+
+def _column(df, col_idx: int) -> pd.Series:
+    """SheetGrid / DataFrame의 한 컬럼 (범위 밖이면 전부 None)"""
+    if isinstance(df, SheetGrid):
+        if col_idx >= df.width:
+            return pd.Series([None] * len(df), dtype=object)
+        return pd.Series([row[col_idx] for row in df.rows], dtype=object)
+    if col_idx >= len(df.columns):
+        return pd.Series([None] * len(df), dtype=object)
+    return pd.Series(df.iloc[:, col_idx].tolist(), dtype=object)
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """셀 값 -> 앞뒤 공백 제거한 문자열 (빈 셀은 '')"""
+    return values.where(values.notna(), '').astype(str).str.strip()
+
+
+def classify_rows(df, name_col: int, content_cols: Optional[Iterable[int]] = None,
+                  hopyo_rows: Iterable[int] = ()) -> np.ndarray:
+    """모든 행의 유형 코드 배열 (int8, 길이 = 행 수)
+
+    name_col: 품명(산출근거) 컬럼, 유형 판단 기준
+    content_cols: 빈 행 판단에 쓸 컬럼 (None = 전체, name_col은 항상 포함)
+    hopyo_rows: 호표 탐색으로 이미 찾은 행 (호표 셀이 품명 컬럼이 아닌 경우)
+    """
+    n = len(df)
+    width = len(df.columns)
+    cols = set(range(width) if content_cols is None else content_cols)
+    cols.add(name_col)
+
+    has_content = np.zeros(n, dtype=bool)
+    for col_idx in sorted(c for c in cols if 0 <= c < width):
+        has_content |= (_text(_column(df, col_idx)) != '').to_numpy()
+
+    name = _text(_column(df, name_col))
+    compact = name.str.replace(r'\s+', '', regex=True)
+
+    types = np.where(has_content, ITEM, BLANK).astype(np.int8)
+    # 뒤에 적용한 유형이 우선
+    masks = (
+        (NOTE, has_content & ((name == '') | name.str.fullmatch(r'[\d.,]+')).to_numpy()),
+        (HEADER, compact.isin(HEADER_NAMES).to_numpy()),
+        (SEPARATOR, ((name != '') & name.str.fullmatch(r'[-=_─━\s]+')).to_numpy()),
+        (SUBTOTAL, (compact.str.contains('합계|소계') | compact.isin(SUBTOTAL_NAMES)).to_numpy()),
+        (HOPYO, name.str.contains('호표').to_numpy()),
+    )
+    for code, mask in masks:
+        types[mask] = code
+    rows = [r for r in hopyo_rows if 0 <= r < n]
+    types[rows] = HOPYO
+    return types
+
+
+def count_row_types(types: np.ndarray) -> Dict[str, int]:
+    """유형별 행 수 (통계/검증 출력용)"""
+    counts = np.bincount(types, minlength=len(ROW_TYPE_NAMES))
+    return {ROW_TYPE_NAMES[code]: int(counts[code]) for code in ROW_TYPE_NAMES}
@@ -0,0 +1,203 @@
+"""
+디코딩된 시트 그리드 디스크 캐시
+키: (파일 내용 SHA-256, 시트 이름, 리더 버전) -> 파일이 바뀌지 않았으면 엑셀 디코딩 없이 재사용
+형식: 값 테이블(타입 + 숫자 + 문자열 오프셋/UTF-8 블롭) + 셀별 int32 참조 배열, mmap으로 읽음
+캐시 전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (mtime 기준 LRU)
+"""
+import hashlib
+import mmap
+import os
+import struct
+from datetime import date, datetime, time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+CACHE_DIR = os.path.join('.parser_cache', 'grids')
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+ENABLED = os.environ.get('SHEET_CACHE', '1') != '0'
+
+_MAGIC = b'SGRD'
+_FORMAT_VERSION = 2
+# magic, 형식 버전, 행 수, 열 수, 선언 행 수, 선언 열 수 (0 = 알 수 없음), 값 개수, 문자열 블롭 길이
+_HEADER = struct.Struct('<4sIIIIIIQ')
+
+# 값 타입 코드
+_T_STR = 0
+_T_INT = 1
+_T_FLOAT = 2
+_T_BOOL = 3
+_T_DATETIME = 4
+_T_DATE = 5
+_T_TIME = 6
+
+
+def _cache_path(digest: str, sheet_name: str, reader_version: int, usecols=None) -> str:
+    cols = '' if usecols is None else ','.join(map(str, sorted(usecols)))
+    key = f"{digest}\0{sheet_name}\0{reader_version}\0{cols}".encode('utf-8')
+    return os.path.join(CACHE_DIR, hashlib.sha256(key).hexdigest() + '.grid')
+
+
+def _encode_value(value):
+    """(타입 코드, 64비트 정수 슬롯, 문자열) - 지원하지 않는 타입이면 None"""
+    if isinstance(value, bool):
+        return _T_BOOL, int(value), ''
+    if isinstance(value, int):
+        if -(1 << 63) <= value < (1 << 63):
+            return _T_INT, value, ''
+        return None
+    if isinstance(value, float):
+        return _T_FLOAT, struct.unpack('<q', struct.pack('<d', value))[0], ''
+    if isinstance(value, str):
+        return _T_STR, 0, value
+    if isinstance(value, datetime):
+        return _T_DATETIME, 0, value.isoformat()
+    if isinstance(value, date):
+        return _T_DATE, 0, value.isoformat()
+    if isinstance(value, time):
+        return _T_TIME, 0, value.isoformat()
+    return None
+
+
+def _decode_values(types, slots, offsets, blob: bytes) -> List:
+    floats = slots.view('<f8')
+    values = [None]
+    for index, value_type in enumerate(types.tolist()):
+        if value_type == _T_INT:
+            values.append(int(slots[index]))
+        elif value_type == _T_FLOAT:
+            values.append(float(floats[index]))
+        elif value_type == _T_BOOL:
+            values.append(bool(slots[index]))
+        else:
+            text = blob[offsets[index]:offsets[index + 1]].decode('utf-8')
+            if value_type == _T_DATETIME:
+                values.append(datetime.fromisoformat(text))
+            elif value_type == _T_DATE:
+                values.append(date.fromisoformat(text))
+            elif value_type == _T_TIME:
+                values.append(time.fromisoformat(text))
+            else:
+                values.append(text)
+    return values
+
+
+def load(digest: str, sheet_name: str, reader_version: int,
+         usecols=None) -> Optional[Tuple[List[tuple], Optional[tuple]]]:
+    """캐시된 (행 튜플, 선언 범위) 반환 (없거나 손상되었으면 None, usecols는 컬럼 선별 읽기 결과 구분용)"""
+    if not ENABLED:
+        return None
+    path = _cache_path(digest, sheet_name, reader_version, usecols)
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                (magic, version, nrows, width, declared_rows, declared_cols,
+                 nvalues, blob_len) = _HEADER.unpack_from(mm, 0)
+                if magic != _MAGIC or version != _FORMAT_VERSION:
+                    return None
+                pos = _HEADER.size
+                refs = np.frombuffer(mm, dtype='<i4', count=nrows * width, offset=pos)
+                pos += refs.nbytes
+                slots = np.frombuffer(mm, dtype='<i8', count=nvalues, offset=pos)
+                pos += slots.nbytes
+                offsets = np.frombuffer(mm, dtype='<i8', count=nvalues + 1, offset=pos)
+                pos += offsets.nbytes
+                types = np.frombuffer(mm, dtype='u1', count=nvalues, offset=pos)
+                pos += types.nbytes
+                blob = mm[pos:pos + blob_len]
+                values = np.empty(nvalues + 1, dtype=object)
+                values[:] = _decode_values(types, slots, offsets, blob)
+                grid = values[refs.reshape(nrows, width)]
+                rows = [tuple(row) for row in grid.tolist()]
+                # mmap 해제 전에 버퍼 참조 정리
+                del refs, slots, offsets, types
+    except (OSError, ValueError, BufferError, IndexError):
+        return None
+    try:
+        # LRU 기준 갱신
+        os.utime(path)
+    except OSError:
+        pass
+    declared_shape = (declared_rows, declared_cols) if declared_rows else None
+    return rows, declared_shape
+
+
+def store(digest: str, sheet_name: str, reader_version: int, rows: List[tuple], width: int,
+          usecols=None, declared_shape: Optional[tuple] = None):
+    """행 튜플을 캐시에 저장 (지원하지 않는 값 타입이 있으면 저장 안 함)"""
+    if not ENABLED:
+        return
+    value_index = {}
+    types = []
+    slots = []
+    texts = []
+    refs = np.zeros((len(rows), width), dtype='<i4')
+    for row_idx, row in enumerate(rows):
+        for col_idx, value in enumerate(row):
+            if value is None:
+                continue
+            key = (type(value), value)
+            ref = value_index.get(key)
+            if ref is None:
+                encoded = _encode_value(value)
+                if encoded is None:
+                    return
+                types.append(encoded[0])
+                slots.append(encoded[1])
+                texts.append(encoded[2].encode('utf-8'))
+                ref = value_index[key] = len(types)
+            refs[row_idx, col_idx] = ref
+
+    offsets = np.zeros(len(texts) + 1, dtype='<i8')
+    if texts:
+        np.cumsum([len(t) for t in texts], out=offsets[1:])
+    blob = b''.join(texts)
+
+    path = _cache_path(digest, sheet_name, reader_version, usecols)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            declared_rows, declared_cols = declared_shape or (0, 0)
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(rows), width,
+                                 declared_rows, declared_cols, len(types), len(blob)))
+            f.write(refs.tobytes())
+            f.write(np.array(slots, dtype='<i8').tobytes())
+            f.write(offsets.tobytes())
+            f.write(np.array(types, dtype='u1').tobytes())
+            f.write(blob)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"시트 캐시 저장 실패: {e}")
+        return
+    evict()
+
+
+def evict(max_bytes: int = None):
+    """캐시 크기 상한 유지 (mtime이 오래된 파일부터 삭제)"""
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    try:
+        entries = []
+        for entry in os.scandir(CACHE_DIR):
+            if entry.is_file() and entry.name.endswith('.grid'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def clear():
+    """캐시 전체 삭제"""
+    evict(0)
@@ -5,6 +5,7 @@ import io
 import re
 import os
 import subprocess
+from format_detector import detect_format
 
 # UTF-8 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -14,56 +15,25 @@ def detect_file_type(file_path):
     
     print(f"\n파일 구조 감지 중: {file_path}")
     
-    # 엑셀 파일 열기
-    if file_path.endswith('.xls'):
-        xls = pd.ExcelFile(file_path, engine='xlrd')
-    else:
-        xls = pd.ExcelFile(file_path)
-    
-    # 일위대가 시트 찾기
-    target_sheet = None
-    for sheet in xls.sheet_names:
-        if '일위대가' in sheet and '목록' not in sheet and '총괄' not in sheet:
-            target_sheet = sheet
-            break
-    
-    if not target_sheet:
-        for sheet in xls.sheet_names:
-            if '산근' in sheet:
-                target_sheet = sheet
-                break
-    
+    # 대상 시트 앞부분만 읽어 감지 (호표와 헤더가 확인되면 즉시 중단)
+    detection = detect_format(file_path)
+    target_sheet = detection['sheet']
     if not target_sheet:
         return None, None
     
     print(f"대상 시트: {target_sheet}")
     
-    # 시트 읽기
-    if file_path.endswith('.xls'):
-        df = pd.read_excel(file_path, sheet_name=target_sheet, header=None, engine='xlrd')
-    else:
-        df = pd.read_excel(file_path, sheet_name=target_sheet, header=None)
-    
-    # 호표 패턴으로 타입 결정
-    for i in range(min(30, len(df))):
-        for j in range(min(5, len(df.columns))):
-            cell = df.iloc[i, j]
-            if pd.notna(cell) and '호표' in str(cell):
-                cell_str = str(cell)
-                
-                # 패턴별 분류
-                if '：' in cell_str or ':' in cell_str:
-                    print("감지된 타입: SGS 형식 (콜론 구분)")
-                    return 'sgs', target_sheet
-                elif '(' in cell_str and ')' in cell_str and '호표' in cell_str:
-                    print("감지된 타입: 건축구조 형식 (괄호 구분)")
-                    return 'construction', target_sheet
-                elif j == 1 and '제' in cell_str:
-                    print("감지된 타입: EST 형식 (1열 호표)")
-                    return 'est', target_sheet
-                elif j == 0 and '제' in cell_str:
-                    print("감지된 타입: TEST1 형식 (0열 호표)")
-                    return 'test1', target_sheet
+    labels = {
+        'sgs': "SGS 형식 (콜론 구분)",
+        'construction': "건축구조 형식 (괄호 구분)",
+        'est': "EST 형식 (1열 호표)",
+        'test1': "TEST1 형식 (0열 호표)"
+    }
+    file_type = detection['type']
+    if file_type:
+        print(f"감지된 타입: {labels[file_type]} "
+              f"(신뢰도 {detection['confidence']:.2f}, {detection['rows_scanned']}행 확인)")
+        return file_type, target_sheet
     
     return None, None
 
@@ -6,6 +6,7 @@ import os
 import sys
 import subprocess
 import pandas as pd
+from workbook_reader import probe_workbook
 
 def detect_file_type(file_path):
     """파일 타입과 적절한 파서 결정"""
@@ -29,12 +30,8 @@ def detect_file_type(file_path):
     
     # 파일명으로 판단 안되면 시트 구조로 판단
     try:
-        if file_path.endswith('.xls'):
-            xls = pd.ExcelFile(file_path, engine='xlrd')
-        else:
-            xls = pd.ExcelFile(file_path)
-        
-        sheets = xls.sheet_names
+        # 워크북 메타데이터만 읽기
+        sheets = probe_workbook(file_path)['sheet_names']
         
         # 시트 이름으로 판단 (v4 파서 우선 사용)
         if '단가산출_산근' in sheets:
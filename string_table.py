@@ -0,0 +1,93 @@
+"""
+반복 문자열 사전 (단위 / 규격 / 자주 나오는 품명)
+'인', 'M3', '㎡', 'TON', '%', 'HR', '식' 같은 값이 산출근거마다 따로 문자열로 생기지 않도록
+사전 하나에 한 번만 저장하고 레코드에는 정수 코드만 보관 (records.SangulItem)
+JSON 저장 시점에 코드를 문자열로 되돌리고, 필드별 카디널리티(종류 수 / 사용 수) 통계를 제공
+
+사전은 프로세스가 끝날 때까지 유지 (만든 레코드가 코드로 사전을 참조하므로 실행마다 비우지 않음)
+여러 파일을 연달아 파싱해도 커지지 않도록 필드마다 길이 상한 안의 짧은 값만 넣고, 긴 값은 문자열 그대로 보관
+사용 수 통계만 파싱 실행 단위 (실행 진입점에서 reset_stats)
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Union
+
+# 사전에 넣는 필드와 값 길이 상한 (상한보다 긴 값은 문자열 그대로)
+# 단위는 'M3', 'TON' 등 짧은 값, 규격은 'D13', 'SD400', 'H=1.5m' 같은 공통 규격, 품명은 '보통인부', '잡재료' 등 공통 품명
+ENCODED_FIELDS = {
+    '단위': 10,
+    '규격': 20,
+    '품명': 20
+}
+
+STATS_TOP = 5
+
+
+class StringTable:
+    """문자열 <-> 정수 코드 (필드끼리 코드 공유, 통계는 필드별)"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.usage: Dict[str, Counter] = {field: Counter() for field in ENCODED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def encode(self, field: str, value) -> Union[int, str, None]:
+        """값 -> 코드 (빈 값, 상한보다 긴 값은 그대로, 문자열이 아닌 값은 문자열로 바꿔 저장)"""
+        if value is None or value == '' or field not in ENCODED_FIELDS:
+            return value
+        if not isinstance(value, str):
+            value = str(value)
+        max_len = ENCODED_FIELDS[field]
+        if len(value) > max_len:
+            return value
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self.codes[value] = code
+        self.usage[field][code] += 1
+        return code
+
+    def reset_stats(self):
+        """사용 수 통계 초기화 (새 파싱 실행 시작, 코드/문자열은 유지)"""
+        self.usage = {field: Counter() for field in ENCODED_FIELDS}
+
+    def decode(self, value):
+        """코드 -> 문자열 (코드가 아니면 그대로)"""
+        if type(value) is int:
+            return self.strings[value]
+        return value
+
+    def stats(self, top: int = STATS_TOP) -> Dict[str, Dict]:
+        """필드별 {'distinct': 종류 수, 'total': 사용 수, 'top': [(값, 수), ...]}"""
+        return {
+            field: {
+                'distinct': len(usage),
+                'total': sum(usage.values()),
+                'top': [(self.strings[code], count) for code, count in usage.most_common(top)]
+            }
+            for field, usage in self.usage.items()
+        }
+
+    def print_stats(self):
+        """통계 출력"""
+        used = set().union(*self.usage.values())
+        print(f"\n[문자열 사전] {len(used)}종")
+        for field, stat in self.stats().items():
+            if not stat['total']:
+                continue
+            top = ', '.join(f"{value}({count})" for value, count in stat['top'])
+            print(f"  {field}: {stat['distinct']}종 / {stat['total']}개 - {top}")
+
+
+_table: Optional[StringTable] = None
+
+
+def get_table() -> StringTable:
+    """프로세스 공용 문자열 사전"""
+    global _table
+    if _table is None:
+        _table = StringTable()
+    return _table
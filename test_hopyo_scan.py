@@ -0,0 +1,43 @@
+"""
+호표 탐색 테스트 (비고 열의 호표 참조는 호표가 아님)
+"""
+from hopyo_scan import scan_hopyo_cells
+from unified_ilwidae_parser import UnifiedIlwidaeParser
+from workbook_reader import SheetGrid
+
+# 품명, 규격, 단위, 수량, 재료비/노무비/경비/합계 단가·금액 8열, 비고 (비고는 12번째 열)
+HEADER = ('품명', '규격', '단위', '수량', '재료비', None, '노무비', None, '경비', None, '합계', None, '비고')
+
+
+def _row(*cells, remark=None):
+    row = list(cells) + [None] * (len(HEADER) - 1 - len(cells))
+    return tuple(row) + (remark,)
+
+
+def _grid() -> SheetGrid:
+    return SheetGrid([
+        HEADER,
+        _row('제1호표：철근가공'),
+        _row('철근공', None, '인', 0.5, remark='제2호표 참조'),
+        _row('보통인부', None, '인', 1.0),
+        _row('제2호표：거푸집'),
+        _row('형틀목공', None, '인', 0.3),
+    ])
+
+
+def test_remark_reference_is_not_hopyo():
+    """비고 열의 '제2호표 참조'는 호표 셀로 잡지 않음"""
+    hits = scan_hopyo_cells(_grid(), ('je',))
+    assert hits['row'].tolist() == [1, 4]
+
+
+def test_find_hopyos_skips_remark_reference():
+    """통합 파서 호표 탐색: 참조 행이 2호표를 가로채지 않음"""
+    hopyos = UnifiedIlwidaeParser().find_hopyos(_grid(), ('je',))
+    assert [(h['row'], h['num'], h['work']) for h in hopyos] == [(1, '1', '철근가공'), (4, '2', '거푸집')]
+
+
+if __name__ == "__main__":
+    test_remark_reference_is_not_hopyo()
+    test_find_hopyos_skips_remark_reference()
+    print("✅ 호표 탐색 테스트 통과")
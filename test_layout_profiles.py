@@ -0,0 +1,50 @@
+"""
+레이아웃 프로파일 테스트 (제목 행 수가 다른 같은 양식)
+"""
+import json
+
+from layout_profiles import VERSION_TAG, ProfileStore, layout_fingerprint
+from workbook_reader import SheetGrid
+
+HEADER = ('품명', '규격', '단위', '수량', '비고')
+COLUMNS = {'품명': 0, '규격': 1, '단위': 2, '수량': 3}
+
+
+def _sheet(title_rows: int) -> SheetGrid:
+    rows = [('일위대가표', None, None, None, None)] * title_rows
+    return SheetGrid(rows + [HEADER, ('제1호표：철근가공', None, None, None, None)])
+
+
+def test_header_row_follows_title_rows(tmp_path):
+    """제목 행이 하나 더 있는 시트는 같은 지문을 쓰고 헤더 행도 한 행 아래"""
+    store = ProfileStore(str(tmp_path / 'profiles.json'))
+    a, b = _sheet(1), _sheet(2)
+    fp_a, fp_b = layout_fingerprint(a, '일위대가'), layout_fingerprint(b, '일위대가')
+    assert fp_a.key == fp_b.key
+
+    store.learn(fp_a, '일위대가', 1, COLUMNS)
+    assert store.get(fp_b)['header_row'] == 2
+    assert store.get(fp_a)['header_row'] == 1
+
+
+def test_other_version_profiles_dropped(tmp_path):
+    """다른 버전으로 학습한 프로파일은 읽지 않음"""
+    path = tmp_path / 'profiles.json'
+    fp = layout_fingerprint(_sheet(1), '일위대가')
+    old = {f"default:{fp.key}": {'sheet': '일위대가', 'header_row': 1, 'columns': COLUMNS}}
+    path.write_text(json.dumps(old, ensure_ascii=False), encoding='utf-8')
+
+    store = ProfileStore(str(path))
+    assert store.get(fp) is None
+    store.learn(fp, '일위대가', 1, COLUMNS)
+    assert list(store.profiles) == [f"default:{VERSION_TAG}:{fp.key}"]
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_header_row_follows_title_rows(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_other_version_profiles_dropped(pathlib.Path(tmp))
+    print("✅ 레이아웃 프로파일 테스트 통과")
@@ -0,0 +1,29 @@
+"""
+목록 대사 테스트 (단위 표기 제거, 유사 작업명 매칭)
+"""
+from list_reconciler import TitleMatcher, strip_unit_suffix
+
+
+def test_strip_unit_suffix():
+    """정해진 단위의 ' ~ 당'만 제거 (위치 무관), 다른 '당'은 그대로"""
+    assert strip_unit_suffix('탄성포장 철거 ㎡ 당') == '탄성포장 철거'
+    assert strip_unit_suffix('거푸집 설치 ㎡ 당 (합판)') == '거푸집 설치 (합판)'
+    assert strip_unit_suffix('보도블럭 포장 M 당') == '보도블럭 포장'
+    assert strip_unit_suffix('맨홀 설치 개소 당') == '맨홀 설치'
+    assert strip_unit_suffix('전기 배선 할당') == '전기 배선 할당'
+    assert strip_unit_suffix('콘크리트 타설 1회당') == '콘크리트 타설 1회당'
+
+
+def test_best_skips_used_titles():
+    """이미 쓴 목록 작업명은 유사 매칭에서 제외 (목록 항목 하나 = 호표 하나)"""
+    matcher = TitleMatcher(['탄성포장 철거', '탄성포장 설치'])
+    pos, score = matcher.best('탄성포장철거')
+    assert pos == 0 and score == 1.0
+    assert matcher.best('탄성포장철거', used={0}) is None
+    assert matcher.best('탄성포장 설치공', used={0})[0] == 1
+
+
+if __name__ == "__main__":
+    test_strip_unit_suffix()
+    test_best_skips_used_titles()
+    print("✅ 목록 대사 테스트 통과")
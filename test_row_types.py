@@ -0,0 +1,24 @@
+"""
+행 유형 분류 테스트 (합계/소계 행 판정)
+"""
+from row_types import HOPYO, ITEM, SUBTOTAL, classify_rows
+from workbook_reader import SheetGrid
+
+
+def test_spaced_subtotal():
+    """'소 계', '합 계'처럼 띄어 쓴 합계 행도 SUBTOTAL"""
+    df = SheetGrid([
+        ('제1호표 철근가공', None, None),
+        ('보통인부', '인', 1.5),
+        ('소 계', None, 100),
+        ('합  계', None, 200),
+        ('전체 합계', None, 300),
+        ('계', None, 400),
+    ])
+    types = classify_rows(df, 0, [0, 1, 2])
+    assert types.tolist() == [HOPYO, ITEM, SUBTOTAL, SUBTOTAL, SUBTOTAL, SUBTOTAL]
+
+
+if __name__ == "__main__":
+    test_spaced_subtotal()
+    print("✅ 행 유형 분류 테스트 통과")
@@ -3,106 +3,80 @@
 모든 엑셀 파일 타입에 대응하는 개선된 파서
 """
 import pandas as pd
+import numpy as np
 import json
 import os
 import re
 from typing import Dict, List, Tuple, Optional
+from collections import Counter
+from block_extract import column_text, extract_items
+from block_index import BlockIndex
+from format_detector import find_target_sheet
+from header_detector import detect_header, infer_columns_from_data
+from hopyo_scan import scan_hopyo_cells
+from layout_profiles import get_store, layout_fingerprint
+from numeric_fields import is_filled, json_default
+from records import OMIT
+from string_table import get_table
+from workbook_reader import SheetGrid, probe_workbook, read_sheet
 
 class UnifiedIlwidaeParser:
     """통합 일위대가 파서 클래스"""
     
+    # 레이아웃 프로파일 구분 (헤더 감지 + 데이터 패턴 추정 결과)
+    PROFILE_SCOPE = 'unified_ilwidae'
+    
     def __init__(self):
         # result 폴더 생성
         os.makedirs('result', exist_ok=True)
         
+        # 마지막 헤더 감지 결과 (행/역할별 점수, 확인용)
+        self.header_detection = None
+        
         # 파일별 설정
         self.file_configs = {
             'test1.xlsx': {
                 'sheet': '일위대가_산근',
-                'pattern': r'제\s*(\d+)\s*호표',
+                'styles': ('je',),
                 'header_row': 3,
                 'col_mapping': {'품명': 1, '규격': 2, '단위': 3, '수량': 4}
             },
             'est.xlsx': {
                 'sheet': '일위대가',
-                'pattern': r'제\s*(\d+)\s*호표',
+                'styles': ('je',),
                 'header_row': 3,
                 'col_mapping': None  # 자동 감지
             },
             'sgs.xls': {
                 'sheet': '일위대가',
-                'pattern': r'제\s*(\d+)\s*호표',
+                'styles': ('je',),
                 'header_row': 3,
                 'col_mapping': None  # 자동 감지
             },
             '건축구조내역.xlsx': {
                 'sheet': '일위대가',
-                'pattern': r'[A-Z]-(\d+)',  # M-101 패턴
+                'styles': ('code',),  # M-101 패턴
                 'header_row': 2,
                 'col_mapping': None  # 자동 감지
             },
             '건축구조내역2.xlsx': {
                 'sheet': '일위대가', 
-                'pattern': r'[A-Z]-(\d+)',  # M-101 패턴
+                'styles': ('code',),  # M-101 패턴
                 'header_row': 2,
                 'col_mapping': None  # 자동 감지
             }
         }
     
-    def detect_columns(self, df: pd.DataFrame, start_row: int = 0) -> Dict:
-        """컬럼 위치 자동 감지"""
-        column_info = {
-            '품명': None,
-            '규격': None,
-            '단위': None,
-            '수량': None
-        }
-        
-        # 헤더 행 찾기
-        for row_idx in range(start_row, min(start_row + 10, len(df))):
-            row_data = []
-            for col_idx in range(min(15, len(df.columns))):
-                cell = df.iloc[row_idx, col_idx]
-                if pd.notna(cell):
-                    row_data.append(str(cell).strip())
-            
-            # 헤더 키워드 찾기
-            row_text = ' '.join(row_data).lower()
-            if '품' in row_text and ('명' in row_text or '종' in row_text):
-                # 헤더 행 발견
-                for col_idx, value in enumerate(row_data):
-                    value_lower = value.lower()
-                    if '품' in value_lower or '공종' in value_lower:
-                        column_info['품명'] = col_idx
-                    elif '규' in value_lower or '격' in value_lower:
-                        column_info['규격'] = col_idx
-                    elif '단' in value_lower and '위' in value_lower:
-                        column_info['단위'] = col_idx
-                    elif '수' in value_lower and '량' in value_lower:
-                        column_info['수량'] = col_idx
-                break
+    def detect_columns(self, df: SheetGrid, start_row: int = 0) -> Dict:
+        """컬럼 위치 자동 감지 (헤더 행 점수 행렬, 헤더가 없으면 데이터 패턴으로 추정)"""
+        # 헤더 행 찾기 (start_row부터 10행, 열 폭은 밀도 프로파일)
+        detection = detect_header(df, start_row, start_row + 10)
+        self.header_detection = detection
+        column_info = dict(detection['columns'])
         
         # 헤더를 못 찾았으면 데이터 패턴으로 추정
         if column_info['품명'] is None:
-            for col_idx in range(min(10, len(df.columns))):
-                col_values = []
-                for row_idx in range(start_row + 5, min(start_row + 15, len(df))):
-                    cell = df.iloc[row_idx, col_idx]
-                    if pd.notna(cell):
-                        col_values.append(str(cell).strip())
-                
-                if col_values:
-                    # 한글이 많으면 품명
-                    if column_info['품명'] is None and any(re.match(r'^[가-힣]+', v) for v in col_values):
-                        column_info['품명'] = col_idx
-                    # 단위 키워드
-                    elif any(v in ['인', '%', 'M3', 'M2', 'M', 'KG', 'TON', '개', '대', 'HR', '조', 'm3', 'L', '식'] for v in col_values):
-                        column_info['단위'] = col_idx
-                    # 작은 숫자는 수량
-                    elif column_info['수량'] is None:
-                        nums = [float(v) for v in col_values if re.match(r'^\d+\.?\d*$', v)]
-                        if nums and all(n < 1000 for n in nums):
-                            column_info['수량'] = col_idx
+            column_info = infer_columns_from_data(df, start_row, column_info)
         
         # 규격은 품명과 단위 사이로 추정
         if column_info['품명'] is not None and column_info['단위'] is not None:
@@ -111,122 +85,118 @@ class UnifiedIlwidaeParser:
         
         return column_info
     
-    def find_hopyos(self, df: pd.DataFrame, pattern: str) -> List[Dict]:
+    def find_hopyos(self, df: SheetGrid, styles: Tuple[str, ...]) -> List[Dict]:
         """호표 찾기"""
         hopyo_list = []
         seen_nums = set()
         
-        for i in range(len(df)):
-            for j in range(min(10, len(df.columns))):
-                cell = df.iloc[i, j]
-                if pd.notna(cell):
-                    cell_str = str(cell).strip()
-                    
-                    # 패턴 매칭
-                    match = re.search(pattern, cell_str)
-                    if match:
-                        hopyo_num = match.group(1)
-                        
-                        # 중복 체크
-                        if hopyo_num in seen_nums:
-                            continue
-                        
-                        # 작업명 찾기
-                        work_name = ''
-                        
-                        # 같은 셀에 작업명이 있는 경우 (제1호표：작업명)
-                        if '：' in cell_str or ':' in cell_str:
-                            parts = re.split('[：:]', cell_str)
-                            if len(parts) > 1:
-                                work_name = parts[1].strip()
-                        
-                        # 다음 컬럼에서 작업명 찾기
-                        if not work_name:
-                            for k in range(j+1, min(j+5, len(df.columns))):
-                                next_cell = df.iloc[i, k]
-                                if pd.notna(next_cell):
-                                    next_str = str(next_cell).strip()
-                                    if next_str and not re.match(r'^[\d.,]+$', next_str):
-                                        work_name = next_str
-                                        break
-                        
-                        # 작업명이 없으면 다음 행에서 찾기
-                        if not work_name and i + 1 < len(df):
-                            for k in range(min(5, len(df.columns))):
-                                next_cell = df.iloc[i + 1, k]
-                                if pd.notna(next_cell):
-                                    next_str = str(next_cell).strip()
-                                    if next_str and not re.match(r'^[\d.,]+$', next_str) and '합계' not in next_str:
-                                        work_name = next_str
-                                        break
-                        
-                        if work_name:
-                            seen_nums.add(hopyo_num)
-                            hopyo_list.append({
-                                'row': i,
-                                'num': hopyo_num,
-                                'work': work_name
-                            })
+        # 앞 10열을 한 번에 탐색 (이미 나온 번호는 같은 행 다음 셀로 넘어감)
+        text = df.text
+        done_row = -1
+        for hit in scan_hopyo_cells(df, styles, max_cols=10, anchored=False):
+            # M-101 형식은 숫자 부분이 호표 번호
+            i, j, hopyo_num = int(hit['row']), int(hit['col']), hit['num'].split('-')[-1]
+            if i == done_row or hopyo_num in seen_nums:
+                continue
+            done_row = i
+            
+            # 같은 셀에 작업명이 있는 경우 (제1호표：작업명, M-101은 다음 컬럼에서)
+            work_name = hit['title'] if hit['style'] == 'je' else ''
+            
+            # 다음 컬럼에서 작업명 찾기
+            if not work_name:
+                for k in range(j+1, min(j+5, len(df.columns))):
+                    next_str = text[i, k]
+                    if next_str and not re.match(r'^[\d.,]+$', next_str):
+                        work_name = next_str
                         break
+            
+            # 작업명이 없으면 다음 행에서 찾기
+            if not work_name and i + 1 < len(df):
+                for k in range(min(5, len(df.columns))):
+                    next_str = text[i + 1, k]
+                    if next_str and not re.match(r'^[\d.,]+$', next_str) and '합계' not in next_str:
+                        work_name = next_str
+                        break
+            
+            if work_name:
+                seen_nums.add(hopyo_num)
+                hopyo_list.append({
+                    'row': i,
+                    'num': hopyo_num,
+                    'work': work_name
+                })
         
         return hopyo_list
     
-    def extract_sangul_items(self, df: pd.DataFrame, start_row: int, end_row: int, 
-                            column_info: Dict) -> List[Dict]:
-        """산출근거 항목 추출"""
-        items = []
+    def sangul_rows(self, df: SheetGrid, column_info: Dict) -> np.ndarray:
+        """산출근거 행 마스크 (시트 전체, 품명이 있는 행만 - 합계, 계 등은 제외)"""
+        names = column_text(df, column_info['품명'])
+        return ((names != '') & ~names.str.contains('합계', regex=False) & (names != '계')).to_numpy()
+    
+    def extract_sangul_items(self, df: SheetGrid, start_row: int, end_row: int, 
+                            column_info: Dict, item_rows: Optional[np.ndarray] = None) -> List[Dict]:
+        """산출근거 항목 추출 (정규화 그리드에서 블록 x 매핑 컬럼을 한 번에 잘라 사용, 수량은 숫자)
         
-        for row_idx in range(start_row + 1, min(end_row, len(df))):
-            row_data = {
-                'row_number': row_idx,
-                '품명': '',
-                '규격': '',
-                '단위': '',
-                '수량': ''
-            }
-            
-            # 각 컬럼에서 데이터 추출
-            has_content = False
-            
-            # 품명
-            if column_info['품명'] is not None:
-                cell = df.iloc[row_idx, column_info['품명']]
-                if pd.notna(cell):
-                    value = str(cell).strip()
-                    # 합계, 계 등은 제외
-                    if value and '합계' not in value and '계' != value:
-                        row_data['품명'] = value
-                        has_content = True
-            
-            # 규격
-            if column_info['규격'] is not None:
-                cell = df.iloc[row_idx, column_info['규격']]
-                if pd.notna(cell):
-                    value = str(cell).strip()
-                    if value:
-                        row_data['규격'] = value
-            
-            # 단위
-            if column_info['단위'] is not None:
-                cell = df.iloc[row_idx, column_info['단위']]
-                if pd.notna(cell):
-                    value = str(cell).strip()
-                    if value:
-                        row_data['단위'] = value
-            
-            # 수량
-            if column_info['수량'] is not None:
-                cell = df.iloc[row_idx, column_info['수량']]
-                if pd.notna(cell):
-                    value = str(cell).strip()
-                    if value:
-                        row_data['수량'] = value
-            
-            if has_content:
-                items.append(row_data)
+        item_rows: sangul_rows 마스크 (시트당 한 번 계산해 넘김, 없으면 여기서 계산)
+        합계/계 행은 레코드를 만들기 전에 걸러 문자열 사전 사용 수에 들어가지 않음
+        """
+        if item_rows is None:
+            item_rows = self.sangul_rows(df, column_info)
+        
+        fields = {field: column_info[field] for field in ('품명', '규격', '단위', '수량')}
+        items = extract_items(df, start_row + 1, end_row, fields, item_rows)
+        for row_data in items:
+            row_data.비고 = OMIT
         
         return items
     
+    def resolve_columns(self, df: SheetGrid, file_path: str, config: Dict) -> Dict:
+        """컬럼 매핑 (같은 레이아웃 지문의 프로파일이 있으면 감지 생략, 없으면 감지 후 학습)"""
+        store = get_store()
+        fingerprint = layout_fingerprint(df, config['sheet'])
+        profile = store.get(fingerprint, self.PROFILE_SCOPE)
+        if profile is not None:
+            print(f"레이아웃 프로파일 사용: {fingerprint} ({profile['learned_from']})")
+            return dict(profile['columns'])
+        
+        column_info = self.detect_columns(df, config['header_row'])
+        store.learn(fingerprint, config['sheet'], config['header_row'], column_info,
+                    config['styles'], file_path, self.PROFILE_SCOPE)
+        return column_info
+    
+    def config_from_layout(self, df: SheetGrid, file_path: str, sheet: str) -> Optional[Dict]:
+        """설정에 없는 파일의 설정 (프로파일 재사용, 처음 보는 양식이면 헤더/호표 형식 감지 후 학습)"""
+        store = get_store()
+        fingerprint = layout_fingerprint(df, sheet)
+        profile = store.get(fingerprint, self.PROFILE_SCOPE)
+        if profile is not None and profile['hopyo_styles']:
+            print(f"레이아웃 프로파일 사용: {fingerprint} ({profile['learned_from']})")
+            return {
+                'sheet': sheet,
+                'styles': tuple(profile['hopyo_styles']),
+                'header_row': profile['header_row'],
+                'col_mapping': dict(profile['columns'])
+            }
+        
+        # 호표 형식: 앞 10열에서 가장 많이 나온 형식
+        hits = scan_hopyo_cells(df, None, max_cols=10, anchored=False)
+        if not len(hits):
+            return None
+        style = Counter(hits['style']).most_common(1)[0][0]
+        
+        detection = detect_header(df, 0, 30)
+        header_row = detection['header_row'] or 0
+        column_info = self.detect_columns(df, header_row)
+        store.learn(fingerprint, sheet, header_row, column_info, (style,), file_path, self.PROFILE_SCOPE)
+        print(f"레이아웃 자동 감지: 호표 형식 {style}, 헤더 행 {header_row}")
+        return {
+            'sheet': sheet,
+            'styles': (style,),
+            'header_row': header_row,
+            'col_mapping': column_info
+        }
+    
     def parse_file(self, file_path: str) -> Optional[Dict]:
         """파일 파싱"""
         if not os.path.exists(file_path):
@@ -234,7 +204,8 @@ class UnifiedIlwidaeParser:
             return None
         
         config = self.file_configs.get(file_path)
-        if not config:
+        sheet = config['sheet'] if config else find_target_sheet(probe_workbook(file_path)['sheet_names'])
+        if not sheet:
             print(f"설정 없음: {file_path}")
             return None
         
@@ -243,41 +214,47 @@ class UnifiedIlwidaeParser:
         print('='*70)
         
         try:
-            # 파일 읽기
-            if file_path.endswith('.xls'):
-                df = pd.read_excel(file_path, sheet_name=config['sheet'], header=None, engine='xlrd')
-            else:
-                df = pd.read_excel(file_path, sheet_name=config['sheet'], header=None)
+            # 파일 읽기 (행 튜플 그리드)
+            df = read_sheet(file_path, sheet)
             
             print(f"시트 크기: {df.shape}")
             
+            # 설정이 없는 파일은 같은 양식의 프로파일 또는 자동 감지로 설정 구성
+            if not config:
+                config = self.config_from_layout(df, file_path, sheet)
+                if not config:
+                    print(f"설정 없음: {file_path}")
+                    return None
+            
             # 컬럼 정보 가져오기
             if config['col_mapping']:
                 column_info = config['col_mapping']
             else:
-                column_info = self.detect_columns(df, config['header_row'])
+                column_info = self.resolve_columns(df, file_path, config)
             
             print(f"컬럼 매핑: {column_info}")
             
             # 호표 찾기
-            hopyo_list = self.find_hopyos(df, config['pattern'])
+            hopyo_list = self.find_hopyos(df, config['styles'])
             print(f"호표 발견: {len(hopyo_list)}개")
             
             # 결과 구성
             result = {
                 'file': file_path,
-                'sheet': config['sheet'],
+                'sheet': sheet,
                 'total_ilwidae_count': len(hopyo_list),
                 'ilwidae_data': []
             }
             
-            # 각 호표 처리
+            # 각 호표 처리 (블록 끝 = 다음 호표 시작 행, 마지막은 시트 끝)
+            blocks = BlockIndex((hopyo['row'] for hopyo in hopyo_list), sheet_end=df.last_row + 1)
+            item_rows = self.sangul_rows(df, column_info)
             for idx, hopyo in enumerate(hopyo_list):
                 start_row = hopyo['row']
-                end_row = hopyo_list[idx + 1]['row'] if idx + 1 < len(hopyo_list) else len(df)
+                end_row = blocks.end_of(start_row)
                 
                 # 산출근거 추출
-                sangul_items = self.extract_sangul_items(df, start_row, end_row, column_info)
+                sangul_items = self.extract_sangul_items(df, start_row, end_row, column_info, item_rows)
                 
                 ilwidae_item = {
                     'ilwidae_no': hopyo['num'],
@@ -303,7 +280,7 @@ class UnifiedIlwidaeParser:
             # 저장
             output_file = f"result/{file_path.replace('.', '_')}_ilwidae_unified.json"
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+                json.dump(result, f, ensure_ascii=False, indent=2, default=json_default)
             
             print(f"\n✅ 저장 완료: {output_file}")
             
@@ -332,6 +309,7 @@ def main():
     ]
     
     results = []
+    get_table().reset_stats()
     for file_path in files:
         result = parser.parse_file(file_path)
         if result:
@@ -356,7 +334,7 @@ def main():
             for sangul in item['산출근거']:
                 total_items += 1
                 for field in filled_counts.keys():
-                    if sangul.get(field, ''):
+                    if is_filled(sangul.get(field)):
                         filled_counts[field] += 1
         
         if total_items > 0:
@@ -364,6 +342,9 @@ def main():
             for field, count in filled_counts.items():
                 percentage = count / total_items * 100
                 print(f"    {field}: {percentage:.1f}%")
+    
+    # 단위/규격/품명 카디널리티
+    get_table().print_stats()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,6 +4,7 @@
 import json
 import os
 import pandas as pd
+from numeric_fields import is_filled
 
 def validate_json_file(json_path):
     """JSON 파일 검증"""
@@ -30,7 +31,7 @@ def validate_json_file(json_path):
             stats['sangul_count'] += 1
             for field in ['품명', '규격', '단위', '수량']:
                 stats['field_stats'][field]['total'] += 1
-                if sangul.get(field, ''):
+                if is_filled(sangul.get(field)):
                     stats['field_stats'][field]['filled'] += 1
         
         # 샘플 수집
@@ -5,6 +5,7 @@ test1.xlsx 일위대가 추출 검증 스크립트
 import pandas as pd
 import json
 import re
+from numeric_fields import is_filled
 
 def read_excel_data():
     """엑셀 파일 직접 읽기"""
@@ -221,7 +222,7 @@ def check_data_completeness(df, json_data):
         for sangul in item['산출근거']:
             total_sangul += 1
             for field in empty_counts.keys():
-                if not sangul.get(field, ''):
+                if not is_filled(sangul.get(field)):
                     empty_counts[field] += 1
     
     print(f"총 산출근거 항목 수: {total_sangul}")
@@ -232,20 +233,21 @@ def check_data_completeness(df, json_data):
         else:
             print(f"  ✅ {field}: {count}개 비어있음 ({percentage:.1f}%)")
     
-    # 데이터 타입 확인
+    # 데이터 타입 확인 (추출 단계에서 숫자로 저장, 문자열로 남은 수량은 숫자가 아닌 값)
     print("\n[수량 필드 데이터 타입 검사]")
     numeric_count = 0
     non_numeric_count = 0
     
     for item in json_data['ilwidae_data']:
         for sangul in item['산출근거']:
-            if sangul.get('수량'):
-                try:
-                    float(sangul['수량'])
-                    numeric_count += 1
-                except:
-                    non_numeric_count += 1
-                    print(f"  ⚠️  숫자가 아닌 수량: {sangul['수량']} (행 {sangul['row_number']+1})")
+            quantity = sangul.get('수량')
+            if not is_filled(quantity):
+                continue
+            if isinstance(quantity, (int, float)) and not isinstance(quantity, bool):
+                numeric_count += 1
+            else:
+                non_numeric_count += 1
+                print(f"  ⚠️  숫자가 아닌 수량: {quantity} (행 {sangul['row_number']+1})")
     
     print(f"  숫자형 수량: {numeric_count}개")
     print(f"  비숫자형 수량: {non_numeric_count}개")
@@ -0,0 +1,878 @@
+"""
+엑셀 워크북 공용 리더
+파일을 한 번만 열고 시트별로 한 번만 디코딩하여 모든 파서가 같은 데이터를 공유
+xlsx는 openpyxl read-only 스트리밍, xls는 xlrd(on_demand)로 행 튜플을 바로 읽음 (DataFrame 미생성)
+openpyxl이 열지 못하는 xlsx는 메모리에서 복구(xlsx_repair)하여 다시 열고, 그래도 안 되면
+시트 XML을 직접 파싱하는 리더로 대체
+"""
+import hashlib
+import io
+import itertools
+import os
+import re
+import struct
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from density_profile import DensityProfile
+from numeric_fields import number_array
+
+# 디코딩 규칙(값 변환, 행 정리)이 바뀌면 올려서 디스크 캐시 무효화
+READER_VERSION = 1
+
+
+def _convert_value(value):
+    """셀 값 정규화 (pandas read_excel과 동일하게 빈 문자열은 None, 정수 float는 int)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value if value else None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+_NBSP_RUN = re.compile('[\u00a0\u202f\u2007]+')
+
+
+def normalize_text(value) -> Optional[str]:
+    """셀 값 -> 비교/출력용 문자열 (앞뒤 공백 제거, 전각 콜론 '：' -> ':', 줄바꿈 없는 공백 -> 공백 하나, 빈 값은 None)"""
+    if value is None:
+        return None
+    text = str(value)
+    if '\u00a0' in text or '\u202f' in text or '\u2007' in text:
+        text = _NBSP_RUN.sub(' ', text)
+    text = text.replace('：', ':').strip()
+    return text or None
+
+
+class _GridIndexer:
+    """df.iloc[i, j] / df.iloc[i] 호환 인덱서"""
+    __slots__ = ('_rows',)
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row_idx, col_idx = key
+            return self._rows[row_idx][col_idx]
+        return self._rows[key]
+
+
+class SheetGrid:
+    """디코딩된 시트 (행 튜플 리스트)
+
+    파서가 사용하던 DataFrame 인터페이스(len, shape, columns, iloc)를 그대로 지원하므로
+    기존 df.iloc[i, j] 코드는 수정 없이 동작하고, 빈 셀은 NaN 대신 None
+    """
+
+    def __init__(self, rows: List[tuple], sheet_name: str = '', width: Optional[int] = None,
+                 usecols: Optional[frozenset] = None, declared_shape: Optional[tuple] = None):
+        self.sheet_name = sheet_name
+        # 읽은 컬럼 (None = 전체), 나머지 컬럼 값은 None
+        self.usecols = usecols
+        # 파일에 선언된 범위 (행 수, 열 수), 알 수 없으면 None
+        self.declared_shape = declared_shape
+        if width is None:
+            width = max((len(row) for row in rows), default=0)
+        blank = (None,) * width
+        self.rows = [row if len(row) == width else (row + blank[len(row):] if row else blank)
+                     for row in rows]
+        self.width = width
+        self.iloc = _GridIndexer(self.rows)
+        self._density = None
+        self._array = None
+        self._text = None
+        self._numbers = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.rows), self.width)
+
+    @property
+    def columns(self) -> range:
+        return range(self.width)
+
+    @property
+    def last_row(self) -> int:
+        """마지막 내용 행 인덱스 (0부터, 빈 시트는 -1)"""
+        return len(self.rows) - 1
+
+    @property
+    def last_col(self) -> int:
+        """마지막 내용 열 인덱스 (0부터, 빈 시트는 -1)"""
+        return self.width - 1
+
+    @property
+    def trimmed_rows(self) -> int:
+        """선언 범위 중 내용 없이 잘라낸 행 수"""
+        if not self.declared_shape:
+            return 0
+        return max(self.declared_shape[0] - len(self.rows), 0)
+
+    @property
+    def text(self) -> np.ndarray:
+        """정규화한 문자열 그리드 (행 x 열 object 배열, 빈 셀은 None, 읽기 전용)
+
+        처음 사용할 때 모든 셀을 한 번만 변환 (normalize_text), 이후 단계는 셀마다 str().strip() 하지 않음
+        들여쓰기 등 원문 공백이 필요하면 rows / iloc (원본 값)을 사용
+        """
+        if self._text is None:
+            raw = self.to_array()
+            text = np.full(raw.shape, None, dtype=object)
+            present = pd.notna(raw)
+            if present.any():
+                text[present] = [normalize_text(value) for value in raw[present]]
+            text.flags.writeable = False
+            self._text = text
+        return self._text
+
+    @property
+    def numbers(self) -> np.ndarray:
+        """숫자 그리드 (행 x 열 float64, 숫자가 아니거나 빈 셀은 NaN, 읽기 전용)
+
+        숫자 셀과 숫자 문자열('1,234')을 처음 사용할 때 한 번만 변환 (수량/금액 판정, 합계용)
+        """
+        if self._numbers is None:
+            raw = self.to_array()
+            numbers = np.full(raw.shape, np.nan, dtype=np.float64)
+            present = pd.notna(raw)
+            if present.any():
+                numbers[present] = number_array(raw[present])
+            numbers.flags.writeable = False
+            self._numbers = numbers
+        return self._numbers
+
+    @property
+    def density(self) -> DensityProfile:
+        """내용 밀도 프로파일 (처음 사용할 때 그리드 전체를 한 번 세어 둠)"""
+        if self._density is None:
+            self._density = DensityProfile.from_block(self.to_array())
+        return self._density
+
+    def iter_rows(self) -> Iterator[tuple]:
+        return iter(self.rows)
+
+    def to_array(self, max_cols: Optional[int] = None) -> np.ndarray:
+        """앞쪽 max_cols열을 (행 x 열) object 배열로 반환 (벡터화 연산용)
+
+        전체 배열은 처음 호출할 때 한 번만 만들고 이후에는 읽기 전용 뷰를 반환
+        """
+        if self._array is None:
+            block = np.empty((len(self.rows), self.width), dtype=object)
+            if self.width:
+                block[:] = self.rows
+            block.flags.writeable = False
+            self._array = block
+        if max_cols is None or max_cols >= self.width:
+            return self._array
+        return self._array[:, :max_cols]
+
+    def cell(self, row_idx: int, col_idx: int):
+        """범위 밖이면 None"""
+        if 0 <= row_idx < len(self.rows) and 0 <= col_idx < self.width:
+            return self.rows[row_idx][col_idx]
+        return None
+
+    def covers(self, usecols: Optional[frozenset]) -> bool:
+        """요청한 컬럼을 모두 읽은 그리드인지"""
+        return self.usecols is None or (usecols is not None and usecols <= self.usecols)
+
+
+# 읽지 않은 컬럼에 값이 있음을 표시 (행/열 범위 계산용, 그리드에는 None으로 저장)
+_SKIPPED = object()
+
+
+def needed_columns(column_info: Dict, *extra) -> List[int]:
+    """레이아웃의 컬럼 매핑 + 추가 범위에서 읽어야 할 컬럼 목록 (음수 = 없음)"""
+    cols = {c for c in column_info.values() if c is not None and c >= 0}
+    for cols_range in extra:
+        cols.update(cols_range)
+    return sorted(cols)
+
+
+def _build_rows(raw_rows, usecols: Optional[frozenset] = None):
+    """행 튜플 생성 (행 끝의 빈 셀과 시트 끝의 빈 행 제거)
+
+    빈 행은 내용 있는 행이 나올 때까지 개수만 세므로, 서식 때문에 65536/1048576행까지
+    선언된 시트도 마지막 내용 행 이후의 빈 행은 만들지 않음
+    usecols가 주어지면 해당 컬럼만 변환하고 나머지는 None으로 두지만,
+    행 수와 열 수는 전체 컬럼 기준으로 계산하여 전체 읽기와 같은 크기를 유지
+    반환: (행 튜플 리스트, 열 수)
+    """
+    rows = []
+    width = 0
+    pending_blank = 0
+    for raw in raw_rows:
+        if usecols is None:
+            row = [_convert_value(v) for v in raw]
+            extent = len(row)
+            while extent and row[extent - 1] is None:
+                extent -= 1
+            del row[extent:]
+        else:
+            row = []
+            extent = 0
+            for col_idx, v in enumerate(raw):
+                if col_idx in usecols:
+                    v = _convert_value(v)
+                    if v is not None:
+                        extent = col_idx + 1
+                else:
+                    if v is not None and v != '':
+                        extent = col_idx + 1
+                    v = None
+                row.append(v)
+            while row and row[-1] is None:
+                row.pop()
+        if not extent:
+            pending_blank += 1
+            continue
+        if pending_blank:
+            rows.extend([()] * pending_blank)
+            pending_blank = 0
+        rows.append(tuple(row))
+        if extent > width:
+            width = extent
+    return rows, width
+
+
+def _parse_dimension(ref: Optional[str]) -> Optional[tuple]:
+    """'A1:X65536' -> (65536, 24) (선언된 행 수, 열 수)"""
+    if not ref:
+        return None
+    last = ref.split(':')[-1]
+    digits = ''.join(ch for ch in last if ch.isdigit())
+    if not digits:
+        return None
+    return int(digits), _col_index(last) + 1
+
+
+class _OpenpyxlBackend:
+    """xlsx 스트리밍 리더 (openpyxl read_only + data_only)"""
+
+    def __init__(self, source):
+        from openpyxl import load_workbook
+        self._wb = load_workbook(source, read_only=True, data_only=True)
+        # 시트별 선언 범위 (dimension 태그 기준)
+        self.declared = {}
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._wb.sheetnames)
+
+    def iter_rows(self, sheet_name: str, usecols: Optional[frozenset] = None) -> Iterator[tuple]:
+        # openpyxl은 셀 단위로 이미 변환하므로 컬럼 선별은 _build_rows에서 처리
+        ws = self._wb[sheet_name]
+        if ws.max_row and ws.max_column:
+            self.declared[sheet_name] = (ws.max_row, ws.max_column)
+        # 잘못 기록된 dimension 정보 무시
+        ws.reset_dimensions()
+        return ws.iter_rows(values_only=True)
+
+    def close(self):
+        self._wb.close()
+
+
+class _XlrdBackend:
+    """xls 리더 (xlrd 직접 사용, on_demand로 필요한 시트만 디코딩)"""
+
+    def __init__(self, file_path: str):
+        import xlrd
+        self._xlrd = xlrd
+        self._book = xlrd.open_workbook(file_path, on_demand=True)
+        # 시트별 선언 범위 (BIFF 행/열 수)
+        self.declared = {}
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._book.sheet_names())
+
+    def _convert_cell(self, cell_type: int, value):
+        """BIFF 셀 값 변환 (pandas xlrd 엔진과 동일한 규칙)"""
+        xlrd = self._xlrd
+        if cell_type in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+            return None
+        if cell_type == xlrd.XL_CELL_NUMBER:
+            return int(value) if value.is_integer() else value
+        if cell_type == xlrd.XL_CELL_BOOLEAN:
+            return bool(value)
+        if cell_type == xlrd.XL_CELL_DATE:
+            try:
+                return xlrd.xldate.xldate_as_datetime(value, self._book.datemode)
+            except (ValueError, OverflowError):
+                return value
+        return value if value != '' else None
+
+    def iter_rows(self, sheet_name: str, usecols: Optional[frozenset] = None) -> Iterator[tuple]:
+        sheet = self._book.sheet_by_name(sheet_name)
+        convert = self._convert_cell
+        empty_types = (self._xlrd.XL_CELL_EMPTY, self._xlrd.XL_CELL_BLANK)
+        self.declared[sheet_name] = (sheet.nrows, sheet.ncols)
+        try:
+            for row_idx in range(sheet.nrows):
+                types = sheet.row_types(row_idx)
+                if usecols is None:
+                    values = sheet.row_values(row_idx)
+                    yield tuple(convert(t, v) for t, v in zip(types, values))
+                else:
+                    # 필요한 컬럼만 값 변환, 나머지는 존재 여부만 표시
+                    yield tuple(
+                        convert(t, sheet.cell_value(row_idx, col_idx)) if col_idx in usecols
+                        else (None if t in empty_types else _SKIPPED)
+                        for col_idx, t in enumerate(types))
+        finally:
+            self._book.unload_sheet(sheet_name)
+
+    def sheet_states(self) -> List[str]:
+        """BOUNDSHEET 레코드의 표시 상태"""
+        states = {0: 'visible', 1: 'hidden', 2: 'veryHidden'}
+        visibility = getattr(self._book, '_sheet_visibility', None) or []
+        return [states.get(v, 'visible') for v in visibility] or ['visible'] * self._book.nsheets
+
+    def read_dimension(self, sheet_index: int) -> Optional[tuple]:
+        """시트 서브스트림의 DIMENSIONS 레코드만 읽기 (시트 디코딩 없음)"""
+        book = self._book
+        try:
+            mem = book.mem
+            pos = book._sh_abs_posn[sheet_index]
+        except (AttributeError, IndexError):
+            return None
+        biff8 = book.biff_version >= 80
+        while pos + 4 <= len(mem):
+            code, length = struct.unpack_from('<HH', mem, pos)
+            pos += 4
+            if code == 0x0200:  # DIMENSIONS
+                if biff8 and length >= 14:
+                    _, last_row, _, last_col = struct.unpack_from('<IIHH', mem, pos)
+                elif length >= 10:
+                    _, last_row, _, last_col = struct.unpack_from('<HHHH', mem, pos)
+                else:
+                    return None
+                return last_row, last_col
+            if code == 0x000A:  # EOF
+                break
+            pos += length
+        return None
+
+    def close(self):
+        self._book.release_resources()
+
+
+def _local(tag: str) -> str:
+    """네임스페이스 제거 (transitional/strict OOXML 모두 허용)"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _col_index(cell_ref: str) -> int:
+    """'AB12' -> 27 (0부터 시작)"""
+    index = 0
+    for ch in cell_ref:
+        if 'A' <= ch <= 'Z':
+            index = index * 26 + (ord(ch) - 64)
+        elif 'a' <= ch <= 'z':
+            index = index * 26 + (ord(ch) - 96)
+        else:
+            break
+    return index - 1
+
+
+# 날짜로 해석할 기본 number format id
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+
+
+class _XmlBackend:
+    """xlsx 시트 XML 직접 스트리밍 리더 (zipfile + iterparse)
+
+    openpyxl이 거부하는 파일(stmate.xlsx 등)도 읽을 수 있도록 스타일/정의된 이름/알 수 없는
+    속성은 무시하고 셀 값만 읽음. Excel/xlwings 없이 Linux에서 동작
+    """
+
+    def __init__(self, file_path):
+        import zipfile
+        self._zip = zipfile.ZipFile(file_path)
+        self._names = set(self._zip.namelist())
+        self._sheet_paths = {}
+        self._sheet_states = {}
+        # 시트별 선언 범위 (dimension 태그 기준)
+        self.declared = {}
+        self._date1904 = False
+        self._shared_strings = None
+        self._date_styles = None
+        self._read_workbook()
+
+    def _iterparse(self, part: str, events=('end',)):
+        from xml.etree.ElementTree import iterparse
+        with self._zip.open(part) as fp:
+            for event, elem in iterparse(fp, events=events):
+                yield event, elem
+
+    def _read_workbook(self):
+        """xl/workbook.xml + rels에서 시트 이름과 경로 읽기"""
+        rels = {}
+        rels_part = 'xl/_rels/workbook.xml.rels'
+        if rels_part in self._names:
+            for _, elem in self._iterparse(rels_part):
+                if _local(elem.tag) == 'Relationship':
+                    target = elem.get('Target', '')
+                    if target.startswith('/'):
+                        target = target[1:]
+                    elif not target.startswith('xl/'):
+                        target = 'xl/' + target
+                    rels[elem.get('Id')] = target
+        for _, elem in self._iterparse('xl/workbook.xml'):
+            tag = _local(elem.tag)
+            if tag == 'workbookPr':
+                self._date1904 = elem.get('date1904') in ('1', 'true')
+            elif tag == 'sheet':
+                rel_id = next((v for k, v in elem.attrib.items() if _local(k) == 'id'), None)
+                path = rels.get(rel_id)
+                if path is None:
+                    # rels가 깨진 경우 sheetN.xml 규칙으로 추정
+                    path = f"xl/worksheets/sheet{len(self._sheet_paths) + 1}.xml"
+                name = elem.get('name')
+                self._sheet_paths[name] = path
+                self._sheet_states[name] = elem.get('state', 'visible')
+
+    def _load_shared_strings(self) -> List[str]:
+        if self._shared_strings is None:
+            strings = []
+            part = 'xl/sharedStrings.xml'
+            if part in self._names:
+                for _, elem in self._iterparse(part):
+                    if _local(elem.tag) == 'si':
+                        # 윗주(rPh) 텍스트는 제외
+                        texts = []
+                        for child in elem:
+                            child_tag = _local(child.tag)
+                            if child_tag == 't':
+                                texts.append(child.text or '')
+                            elif child_tag == 'r':
+                                texts.extend(t.text or '' for t in child if _local(t.tag) == 't')
+                        strings.append(''.join(texts))
+                        elem.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    def _load_date_styles(self) -> set:
+        """날짜 서식 스타일 인덱스 (styles.xml이 깨져 있으면 빈 집합)"""
+        if self._date_styles is None:
+            date_styles = set()
+            part = 'xl/styles.xml'
+            try:
+                if part in self._names:
+                    custom_dates = set()
+                    in_cell_xfs = False
+                    xf_index = 0
+                    for event, elem in self._iterparse(part, events=('start', 'end')):
+                        tag = _local(elem.tag)
+                        if event == 'start':
+                            if tag == 'cellXfs':
+                                in_cell_xfs = True
+                            continue
+                        if tag == 'numFmt':
+                            code = (elem.get('formatCode') or '').lower()
+                            code = code.split(';')[0]
+                            for quoted in code.split('"')[1::2]:
+                                code = code.replace(quoted, '')
+                            if any(ch in code for ch in 'dmyh') and 'general' not in code:
+                                custom_dates.add(int(elem.get('numFmtId', -1)))
+                        elif tag == 'xf' and in_cell_xfs:
+                            fmt_id = int(elem.get('numFmtId', 0) or 0)
+                            if fmt_id in _BUILTIN_DATE_FORMATS or fmt_id in custom_dates:
+                                date_styles.add(xf_index)
+                            xf_index += 1
+                        elif tag == 'cellXfs':
+                            in_cell_xfs = False
+            except Exception:
+                date_styles = set()
+            self._date_styles = date_styles
+        return self._date_styles
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheet_paths)
+
+    def sheet_state(self, sheet_name: str) -> str:
+        return self._sheet_states.get(sheet_name, 'visible')
+
+    def read_dimension(self, sheet_name: str) -> Optional[tuple]:
+        """시트 XML 앞부분의 <dimension>만 읽기 (sheetData 시작 전에 중단)"""
+        part = self._sheet_paths.get(sheet_name)
+        if part not in self._names:
+            return None
+        for _, elem in self._iterparse(part, events=('start',)):
+            tag = _local(elem.tag)
+            if tag == 'dimension':
+                return _parse_dimension(elem.get('ref'))
+            if tag == 'sheetData':
+                break
+        return None
+
+    def _serial_to_datetime(self, value: float):
+        from datetime import datetime, timedelta
+        if self._date1904:
+            return datetime(1904, 1, 1) + timedelta(days=value)
+        # 1900 윤년 버그 보정
+        if value < 60:
+            value += 1
+        return datetime(1899, 12, 30) + timedelta(days=value)
+
+    def _convert_cell(self, cell_type: Optional[str], text: Optional[str], style: Optional[str]):
+        if cell_type == 's':
+            return self._load_shared_strings()[int(text)] if text is not None else None
+        if cell_type in ('str', 'inlineStr'):
+            return text
+        if cell_type == 'b':
+            return text not in (None, '0', 'false')
+        if cell_type == 'e' or text is None or text == '':
+            return None
+        try:
+            number = float(text)
+        except ValueError:
+            return text
+        if style is not None and int(style) in self._load_date_styles():
+            try:
+                return self._serial_to_datetime(number)
+            except OverflowError:
+                pass
+        return number
+
+    def iter_rows(self, sheet_name: str, usecols: Optional[frozenset] = None) -> Iterator[tuple]:
+        part = self._sheet_paths[sheet_name]
+        next_row = 1
+        cells = {}
+        col_pos = 0
+        cell_type = style = value_text = None
+        inline_texts = []
+        for event, elem in self._iterparse(part, events=('start', 'end')):
+            tag = _local(elem.tag)
+            if event == 'start':
+                if tag == 'row':
+                    cells = {}
+                    col_pos = 0
+                elif tag == 'c':
+                    ref = elem.get('r')
+                    if ref:
+                        col_pos = _col_index(ref)
+                    cell_type = elem.get('t')
+                    style = elem.get('s')
+                    value_text = None
+                    inline_texts = []
+                continue
+            if tag == 'v':
+                value_text = elem.text
+            elif tag == 'dimension':
+                dimension = _parse_dimension(elem.get('ref'))
+                if dimension:
+                    self.declared[sheet_name] = dimension
+            elif tag == 't' and cell_type == 'inlineStr':
+                inline_texts.append(elem.text or '')
+            elif tag == 'c':
+                if cell_type == 'inlineStr':
+                    value_text = ''.join(inline_texts)
+                if usecols is None or col_pos in usecols:
+                    value = self._convert_cell(cell_type, value_text, style)
+                elif value_text and cell_type != 'e':
+                    # 읽지 않는 컬럼은 공유 문자열 조회/숫자 변환 생략
+                    value = _SKIPPED
+                else:
+                    value = None
+                if value is not None:
+                    cells[col_pos] = value
+                col_pos += 1
+                elem.clear()
+            elif tag == 'row':
+                row_num = int(elem.get('r', next_row))
+                # 기록되지 않은 행은 빈 행으로 채움
+                while next_row < row_num:
+                    yield ()
+                    next_row += 1
+                width = max(cells) + 1 if cells else 0
+                yield tuple(cells.get(i) for i in range(width))
+                next_row = row_num + 1
+                elem.clear()
+
+    def close(self):
+        self._zip.close()
+
+
+class WorkbookSession:
+    """워크북 세션 - 파일 1회 열기, 시트 1회 디코딩"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file_name = os.path.basename(file_path)
+        self._backend = None
+        self._sheets = {}
+        self._digest = None
+        self._repaired = False
+
+    @property
+    def is_xls(self) -> bool:
+        return self.file_path.lower().endswith('.xls')
+
+    def _open(self):
+        """워크북 열기 (최초 1회)"""
+        if self._backend is None:
+            if self.is_xls:
+                self._backend = _XlrdBackend(self.file_path)
+            else:
+                self._open_xlsx()
+        return self._backend
+
+    def _open_xlsx(self):
+        """원본 -> 메모리 복구본 -> XML 리더 순으로 시도 (판정은 내용 해시별로 기록)"""
+        import xlsx_repair
+        data = _read_bytes(self.file_path)
+        self._digest = file_sha256(self.file_path)
+        decision = xlsx_repair.get_decision(self._digest)
+        if decision == xlsx_repair.DECISION_XML:
+            self._backend = _XmlBackend(io.BytesIO(data))
+            return
+        if decision != xlsx_repair.DECISION_REPAIR:
+            try:
+                self._backend = _OpenpyxlBackend(io.BytesIO(data))
+                xlsx_repair.record_decision(self._digest, xlsx_repair.DECISION_OK)
+                return
+            except Exception as e:
+                print(f"openpyxl 읽기 실패 ({e}), 메모리 복구 시도: {self.file_name}")
+        try:
+            self._backend = _OpenpyxlBackend(xlsx_repair.repair_xlsx(data))
+            self._repaired = True
+            xlsx_repair.record_decision(self._digest, xlsx_repair.DECISION_REPAIR)
+            print(f"메모리 복구본 사용: {self.file_name}")
+        except Exception as e:
+            self._fallback_to_xml(e)
+
+    def _fallback_to_xml(self, error: Exception):
+        """복구로도 openpyxl이 읽지 못하는 파일은 시트 XML을 직접 읽음"""
+        import xlsx_repair
+        print(f"openpyxl 읽기 실패 ({error}), XML 리더 사용: {self.file_name}")
+        if self._backend is not None:
+            self._backend.close()
+        self._backend = _XmlBackend(self.file_path)
+        xlsx_repair.record_decision(self._digest or file_sha256(self.file_path),
+                                    xlsx_repair.DECISION_XML)
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """시트 이름 목록 (워크북 메타데이터만 읽는 probe 사용)"""
+        return probe_workbook(self.file_path)['sheet_names']
+
+    def iter_rows(self, sheet_name: str) -> Iterator[tuple]:
+        """행 튜플 스트리밍 (이미 디코딩된 시트는 캐시에서)"""
+        grid = self._sheets.get((sheet_name, None))
+        if grid is None:
+            grid = self._load_cached(sheet_name, None)
+        if grid is not None:
+            return grid.iter_rows()
+        return self._open().iter_rows(sheet_name)
+
+    def iter_head(self, sheet_name: str, max_rows: int,
+                  max_cols: Optional[int] = None) -> Iterator[tuple]:
+        """앞쪽 max_rows행만 변환하여 스트리밍 (소비를 멈추면 파일 읽기도 멈춤)"""
+        cols = None if max_cols is None else frozenset(range(max_cols))
+        grid = self._find_grid(sheet_name, cols)
+        if grid is None:
+            grid = self._load_cached(sheet_name, None)
+        rows = grid.iter_rows() if grid is not None else self._open().iter_rows(sheet_name)
+        for row in itertools.islice(rows, max_rows):
+            if max_cols is not None:
+                row = row[:max_cols]
+            yield tuple(_convert_value(v) for v in row)
+
+    def _find_grid(self, sheet_name: str, usecols: Optional[frozenset]) -> Optional[SheetGrid]:
+        """요청 컬럼을 포함하는 디코딩된 그리드 (전체 읽기 우선)"""
+        grid = self._sheets.get((sheet_name, None))
+        if grid is not None:
+            return grid
+        for (name, _), grid in self._sheets.items():
+            if name == sheet_name and grid.covers(usecols):
+                return grid
+        return None
+
+    def _load_cached(self, sheet_name: str, usecols: Optional[frozenset]) -> Optional[SheetGrid]:
+        """디스크 캐시에서 시트 읽기 (워크북을 열지 않음)
+
+        컬럼 선별 읽기가 캐시에 없으면 같은 시트의 전체 읽기 캐시를 사용
+        (메모리의 _find_grid와 같은 규칙 - 전체 그리드는 모든 컬럼 요청을 포함, 중복 그리드를 만들지 않음)
+        """
+        import sheet_cache
+        digest = file_sha256(self.file_path)
+        cached = sheet_cache.load(digest, sheet_name, READER_VERSION, usecols)
+        if cached is None and usecols is not None:
+            cached = sheet_cache.load(digest, sheet_name, READER_VERSION, None)
+            usecols = None
+        if cached is None:
+            return None
+        rows, declared_shape = cached
+        grid = SheetGrid(rows, sheet_name, usecols=usecols, declared_shape=declared_shape)
+        self._sheets[(sheet_name, usecols)] = grid
+        return grid
+
+    def get_sheet(self, sheet_name: str, usecols=None) -> SheetGrid:
+        """시트 데이터 반환 (이미 디코딩된 시트는 재사용, 변경 없는 파일은 디스크 캐시 사용)
+
+        usecols: 읽을 컬럼 인덱스 (None = 전체). 나머지 컬럼은 디코딩하지 않고 None으로 두며
+        컬럼 인덱스와 시트 크기는 원본 그대로 유지
+        """
+        usecols = None if usecols is None else frozenset(usecols)
+        grid = self._find_grid(sheet_name, usecols)
+        if grid is None:
+            grid = self._load_cached(sheet_name, usecols)
+        if grid is None:
+            import sheet_cache
+            try:
+                rows, width = _build_rows(self._open().iter_rows(sheet_name, usecols), usecols)
+            except Exception as e:
+                if not isinstance(self._backend, _OpenpyxlBackend):
+                    raise
+                self._fallback_to_xml(e)
+                rows, width = _build_rows(self._backend.iter_rows(sheet_name, usecols), usecols)
+            declared_shape = getattr(self._backend, 'declared', {}).get(sheet_name)
+            grid = SheetGrid(rows, sheet_name, width, usecols, declared_shape)
+            if grid.trimmed_rows:
+                print(f"시트 '{sheet_name}' 선언 범위 {declared_shape[0]}행 중 "
+                      f"내용 있는 {len(grid)}행만 사용: {self.file_name}")
+            sheet_cache.store(file_sha256(self.file_path), sheet_name, READER_VERSION,
+                              grid.rows, grid.width, usecols, declared_shape)
+            self._sheets[(sheet_name, usecols)] = grid
+        return grid
+
+    def close(self):
+        """워크북 닫기 및 시트 캐시 해제"""
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+        self._sheets.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# 프로세스 내 세션 공유 (일위대가, 단가산출, 목록 파서가 같은 세션 사용)
+_sessions: Dict[tuple, WorkbookSession] = {}
+
+
+def _session_key(file_path: str) -> tuple:
+    """파일 경로 + 수정시각 + 크기 (파일이 바뀌면 새 세션)"""
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+_digests: Dict[tuple, str] = {}
+
+
+def _read_bytes(file_path: str) -> bytes:
+    """파일 내용 읽기 (해시를 같이 기록하여 재계산 방지)"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    _digests[_session_key(file_path)] = hashlib.sha256(data).hexdigest()
+    return data
+
+
+def file_sha256(file_path: str) -> str:
+    """파일 내용 SHA-256 (경로 + 수정시각 + 크기별로 메모)"""
+    key = _session_key(file_path)
+    digest = _digests.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        digest = _digests[key] = sha.hexdigest()
+    return digest
+
+
+# 내용 해시별 probe 결과
+_probes: Dict[str, Dict] = {}
+
+
+def probe_workbook(file_path: str) -> Dict:
+    """워크북 메타데이터만 읽기 (시트 이름, 표시 상태, 선언 범위)
+
+    xlsx는 xl/workbook.xml과 각 시트 XML의 <dimension>까지만, xls는 BOUNDSHEET와
+    DIMENSIONS 레코드만 읽으므로 시트 크기와 무관하게 수 ms 안에 끝남
+    반환: {'file', 'format', 'sheet_names', 'sheets': [{'name', 'state', 'dimension'}]}
+    """
+    digest = file_sha256(file_path)
+    info = _probes.get(digest)
+    if info is None:
+        sheets = []
+        if file_path.lower().endswith('.xls'):
+            backend = _XlrdBackend(file_path)
+            try:
+                for index, (name, state) in enumerate(zip(backend.sheet_names, backend.sheet_states())):
+                    sheets.append({'name': name, 'state': state,
+                                   'dimension': backend.read_dimension(index)})
+            finally:
+                backend.close()
+            file_format = 'xls'
+        else:
+            backend = _XmlBackend(file_path)
+            try:
+                for name in backend.sheet_names:
+                    sheets.append({'name': name, 'state': backend.sheet_state(name),
+                                   'dimension': backend.read_dimension(name)})
+            finally:
+                backend.close()
+            file_format = 'xlsx'
+        info = {
+            'format': file_format,
+            'sheet_names': [sheet['name'] for sheet in sheets],
+            'sheets': sheets
+        }
+        _probes[digest] = info
+    return dict(info, file=file_path, sheet_names=list(info['sheet_names']))
+
+
+def get_session(file_path: str) -> WorkbookSession:
+    """파일별 공유 세션 반환"""
+    key = _session_key(file_path)
+    session = _sessions.get(key)
+    if session is None:
+        # 같은 경로의 이전 버전 세션 정리
+        for old_key in [k for k in _sessions if k[0] == key[0]]:
+            _sessions.pop(old_key).close()
+        session = WorkbookSession(file_path)
+        _sessions[key] = session
+    return session
+
+
+def close_session(file_path: str):
+    """파일 하나의 공유 세션 닫기 (배치에서 파일 파싱이 끝날 때마다 디코딩된 그리드 해제)"""
+    path = _session_key(file_path)[0]
+    for key in [k for k in _sessions if k[0] == path]:
+        _sessions.pop(key).close()
+
+
+def close_sessions():
+    """모든 공유 세션 닫기"""
+    for session in _sessions.values():
+        session.close()
+    _sessions.clear()
+
+
+def read_head(file_path: str, sheet_name: str, max_rows: int,
+              max_cols: Optional[int] = None) -> SheetGrid:
+    """시트 앞부분(max_rows행)만 읽기 (분석/감지용, 시트 크기와 무관)"""
+    rows, width = _build_rows(get_session(file_path).iter_head(sheet_name, max_rows, max_cols))
+    return SheetGrid(rows, sheet_name, width)
+
+
+def read_sheet(file_path: str, sheet_name: str, usecols=None) -> SheetGrid:
+    """공유 세션을 통해 시트 읽기 (pd.read_excel(..., header=None) 대체)
+
+    usecols: 레이아웃이 실제로 보는 컬럼 인덱스 (숨은 계산 컬럼 등은 디코딩 생략)
+    """
+    return get_session(file_path).get_sheet(sheet_name, usecols)
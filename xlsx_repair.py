@@ -0,0 +1,182 @@
+"""
+xlsx 패키지 메모리 내 복구
+openpyxl이 거부하는 파일(stmate.xlsx 등)의 문제 파트(스타일, 정의된 이름, 사용자 지정 속성,
+잘못된 속성)를 메모리에서 다시 써서 BytesIO로 반환 (임시 파일, 수동 복구 파일 불필요)
+복구 필요 여부는 파일 내용 해시별로 기록하여 같은 파일은 다시 검사하지 않음
+"""
+import io
+import json
+import os
+import zipfile
+from typing import Dict, Optional
+from xml.etree import ElementTree as ET
+
+# 복구 판정 결과
+DECISION_OK = 'ok'          # 원본 그대로 openpyxl 사용
+DECISION_REPAIR = 'repair'  # 메모리 복구 후 openpyxl 사용
+DECISION_XML = 'xml'        # 복구로도 안 되면 XML 리더 사용
+
+CACHE_DIR = '.parser_cache'
+DECISION_FILE = os.path.join(CACHE_DIR, 'xlsx_repair.json')
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_CUSTOM_PROPS_PART = 'docProps/custom.xml'
+
+_decisions: Optional[Dict[str, str]] = None
+
+
+def _load_decisions() -> Dict[str, str]:
+    global _decisions
+    if _decisions is None:
+        try:
+            with open(DECISION_FILE, 'r', encoding='utf-8') as f:
+                _decisions = json.load(f)
+        except (OSError, ValueError):
+            _decisions = {}
+    return _decisions
+
+
+def get_decision(digest: str) -> Optional[str]:
+    """내용 해시별 복구 판정 조회 (없으면 None)"""
+    return _load_decisions().get(digest)
+
+
+def record_decision(digest: str, decision: str):
+    """복구 판정 기록 (프로세스 내 + 디스크)"""
+    decisions = _load_decisions()
+    if decisions.get(digest) == decision:
+        return
+    decisions[digest] = decision
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(DECISION_FILE, 'w', encoding='utf-8') as f:
+            json.dump(decisions, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"복구 판정 저장 실패: {e}")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _qn(tag: str) -> str:
+    return f"{{{_MAIN_NS}}}{tag}"
+
+
+def _to_bytes(root: ET.Element) -> bytes:
+    ET.register_namespace('', _MAIN_NS)
+    ET.register_namespace('r', _REL_NS)
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+def _repair_workbook(data: bytes) -> bytes:
+    """workbook.xml에서 시트 목록과 date1904만 남김 (정의된 이름, 뷰, 계산 설정 등 제거)"""
+    root = ET.fromstring(data)
+    new_root = ET.Element(_qn('workbook'))
+    for child in root:
+        tag = _local(child.tag)
+        if tag == 'workbookPr':
+            pr = ET.SubElement(new_root, _qn('workbookPr'))
+            if child.get('date1904') in ('1', 'true'):
+                pr.set('date1904', '1')
+        elif tag == 'sheets':
+            sheets = ET.SubElement(new_root, _qn('sheets'))
+            for index, sheet in enumerate(child, start=1):
+                if _local(sheet.tag) != 'sheet':
+                    continue
+                rel_id = next((v for k, v in sheet.attrib.items() if _local(k) == 'id'), None)
+                new_sheet = ET.SubElement(sheets, _qn('sheet'))
+                new_sheet.set('name', sheet.get('name') or f'Sheet{index}')
+                sheet_id = sheet.get('sheetId', '')
+                new_sheet.set('sheetId', sheet_id if sheet_id.isdigit() else str(index))
+                if sheet.get('state') in ('visible', 'hidden', 'veryHidden'):
+                    new_sheet.set('state', sheet.get('state'))
+                if rel_id:
+                    new_sheet.set(f'{{{_REL_NS}}}id', rel_id)
+    return _to_bytes(new_root)
+
+
+def _styles_valid(data: bytes) -> bool:
+    """openpyxl 스타일시트 파서로 읽히는지 확인"""
+    try:
+        from openpyxl.styles.stylesheet import Stylesheet
+        Stylesheet.from_tree(ET.fromstring(data))
+        return True
+    except Exception:
+        return False
+
+
+def _repair_styles(data: bytes) -> bytes:
+    """최소 스타일시트로 재작성 (셀 스타일 인덱스별 숫자 서식만 유지하여 날짜 판별 보존)"""
+    num_fmts = []
+    xf_fmt_ids = []
+    try:
+        root = ET.fromstring(data)
+        for elem in root.iter():
+            tag = _local(elem.tag)
+            if tag == 'numFmt' and (elem.get('numFmtId') or '').isdigit() and elem.get('formatCode'):
+                num_fmts.append((elem.get('numFmtId'), elem.get('formatCode')))
+        for cell_xfs in (e for e in root if _local(e.tag) == 'cellXfs'):
+            for xf in cell_xfs:
+                fmt_id = xf.get('numFmtId') or '0'
+                xf_fmt_ids.append(fmt_id if fmt_id.isdigit() else '0')
+    except ET.ParseError:
+        pass
+    if not xf_fmt_ids:
+        xf_fmt_ids = ['0']
+
+    root = ET.Element(_qn('styleSheet'))
+    if num_fmts:
+        fmts = ET.SubElement(root, _qn('numFmts'), count=str(len(num_fmts)))
+        for fmt_id, code in num_fmts:
+            ET.SubElement(fmts, _qn('numFmt'), numFmtId=fmt_id, formatCode=code)
+    ET.SubElement(ET.SubElement(root, _qn('fonts'), count='1'), _qn('font'))
+    fill = ET.SubElement(ET.SubElement(root, _qn('fills'), count='1'), _qn('fill'))
+    ET.SubElement(fill, _qn('patternFill'), patternType='none')
+    ET.SubElement(ET.SubElement(root, _qn('borders'), count='1'), _qn('border'))
+    style_xfs = ET.SubElement(root, _qn('cellStyleXfs'), count='1')
+    ET.SubElement(style_xfs, _qn('xf'), numFmtId='0', fontId='0', fillId='0', borderId='0')
+    cell_xfs = ET.SubElement(root, _qn('cellXfs'), count=str(len(xf_fmt_ids)))
+    for fmt_id in xf_fmt_ids:
+        ET.SubElement(cell_xfs, _qn('xf'), numFmtId=fmt_id, fontId='0', fillId='0',
+                      borderId='0', xfId='0')
+    cell_styles = ET.SubElement(root, _qn('cellStyles'), count='1')
+    ET.SubElement(cell_styles, _qn('cellStyle'), name='Normal', xfId='0', builtinId='0')
+    return _to_bytes(root)
+
+
+def _drop_custom_props(data: bytes) -> bytes:
+    """[Content_Types].xml, _rels/.rels에서 사용자 지정 속성 참조 제거"""
+    root = ET.fromstring(data)
+    for child in list(root):
+        target = child.get('PartName') or child.get('Target') or ''
+        if target.lstrip('/') == _CUSTOM_PROPS_PART:
+            root.remove(child)
+    # 패키지 파트는 기본 네임스페이스가 달라 그대로 직렬화
+    ET.register_namespace('', root.tag[1:].split('}')[0])
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+def repair_xlsx(data: bytes) -> io.BytesIO:
+    """xlsx 바이트를 메모리에서 복구하여 BytesIO로 반환"""
+    repaired = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, \
+            zipfile.ZipFile(repaired, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            name = info.filename
+            if name == _CUSTOM_PROPS_PART:
+                continue
+            part = src.read(name)
+            try:
+                if name == 'xl/workbook.xml':
+                    part = _repair_workbook(part)
+                elif name == 'xl/styles.xml' and not _styles_valid(part):
+                    part = _repair_styles(part)
+                elif name in ('[Content_Types].xml', '_rels/.rels'):
+                    part = _drop_custom_props(part)
+            except ET.ParseError as e:
+                print(f"복구 불가 파트 유지: {name} ({e})")
+            dst.writestr(info, part)
+    repaired.seek(0)
+    return repaired